@@ -0,0 +1,339 @@
+import asyncio
+from typing import Dict, List
+import psycopg2
+import Solution
+from Utility.AsyncDBConnector import AsyncDBConnector
+from Utility.ReturnValue import ReturnValue
+from Utility.Exceptions import DatabaseException
+from Utility.LRUCache import LRUCache
+from Business.Match import Match
+from Business.Player import Player
+from Business.Stadium import Stadium
+
+'''
+    asyncio mirror of Solution.py, every function returns what its Solution.py counterpart returns.
+    Statements run on pooled asynchronous connections (see Utility/AsyncDBConnector.py) with the query
+    templates Solution.py registers, so many calls share a handful of connections on one event loop.
+'''
+
+# Return value of each database error, for adding a row and for linking two existing rows
+ADD_ERRORS = {DatabaseException.ConnectionInvalid: ReturnValue.ERROR,
+              DatabaseException.NOT_NULL_VIOLATION: ReturnValue.BAD_PARAMS,
+              DatabaseException.CHECK_VIOLATION: ReturnValue.BAD_PARAMS,
+              DatabaseException.UNIQUE_VIOLATION: ReturnValue.ALREADY_EXISTS,
+              DatabaseException.FOREIGN_KEY_VIOLATION: ReturnValue.BAD_PARAMS,
+              DatabaseException.database_ini_ERROR: ReturnValue.ERROR,
+              DatabaseException.UNKNOWN_ERROR: ReturnValue.ERROR}
+LINK_ERRORS = dict(ADD_ERRORS)
+LINK_ERRORS[DatabaseException.FOREIGN_KEY_VIOLATION] = ReturnValue.NOT_EXISTS
+DELETE_ERRORS = {error: ReturnValue.ERROR for error in ADD_ERRORS}
+DELETE_ERRORS[DatabaseException.FOREIGN_KEY_VIOLATION] = ReturnValue.NOT_EXISTS
+# anything else the database raises
+OTHER_ERRORS = (DatabaseException, psycopg2.Error)
+
+
+async def write(name: str, params: tuple, errors: dict, deleting: bool = False,
+                adding: bool = False) -> ReturnValue:
+    """
+    Executes a write template
+    :param name: template registered in Solution.py
+    :param params: tuple
+    :param errors: Return value of each database error
+    :param deleting: when set, NOT_EXISTS is returned if no row was effected
+    :param adding: when set, ALREADY_EXISTS is returned if no row was effected (the add_* templates skip duplicates)
+    :return: Return value assoicated with the result of the action
+    """
+    try:
+        async with AsyncDBConnector() as conn:
+            rows_effected, _ = await conn.executePrepared(name, params)
+    except tuple(errors) as e:
+        return errors[type(e)]
+    except OTHER_ERRORS:
+        return ReturnValue.ERROR
+    if deleting and rows_effected == 0:
+        return ReturnValue.NOT_EXISTS
+    if adding and rows_effected == 0:
+        return ReturnValue.ALREADY_EXISTS
+    return ReturnValue.OK
+
+
+async def read(name: str, params: tuple = ()):
+    """
+    Executes a read template
+    :return: (rows effected, ResultSet), or None on a database error
+    """
+    try:
+        async with AsyncDBConnector() as conn:
+            return await conn.executePrepared(name, params)
+    except tuple(ADD_ERRORS) + OTHER_ERRORS:
+        return None
+
+
+async def readIDs(name: str, params: tuple = ()) -> List[int]:
+    query_result = await read(name, params)
+    if query_result is None:
+        return []
+    return [row[0] for row in query_result[1].rows]
+
+
+# schema management and COPY based bulk loading are not supported by asynchronous connections,
+# they run the Solution.py functions in the default executor instead
+async def runInExecutor(function, *args):
+    return await asyncio.get_running_loop().run_in_executor(None, function, *args)
+
+
+async def createTables(profile: bool = False) -> Dict[str, float]:
+    return await runInExecutor(Solution.createTables, profile)
+
+
+async def clearTables():
+    await runInExecutor(Solution.clearTables)
+
+
+async def dropTables():
+    await runInExecutor(Solution.dropTables)
+
+
+async def addTeams(teamIDs) -> List[ReturnValue]:
+    return await runInExecutor(Solution.addTeams, list(teamIDs))
+
+
+async def addMatches(matches) -> List[ReturnValue]:
+    return await runInExecutor(Solution.addMatches, list(matches))
+
+
+async def addPlayers(players) -> List[ReturnValue]:
+    return await runInExecutor(Solution.addPlayers, list(players))
+
+
+async def addStadiums(stadiums) -> List[ReturnValue]:
+    return await runInExecutor(Solution.addStadiums, list(stadiums))
+
+
+async def addTeam(teamID: int) -> ReturnValue:
+    if teamID is None:
+        # see Solution.addTeam
+        return ReturnValue.BAD_PARAMS
+    return await write("add_team", (teamID,), ADD_ERRORS, adding=True)
+
+
+# the profile functions share the write-through caches of Solution.py
+async def addProfile(cache: LRUCache, name: str, row: tuple) -> ReturnValue:
+    ret_value = await write(name, row, ADD_ERRORS, adding=True)
+    if ret_value == ReturnValue.OK:
+        cache.put(row[0], row)
+    return ret_value
+
+
+async def readProfile(cache: LRUCache, name: str, profileID: int, selectsID: bool = True):
+    """
+    :param selectsID: whether the template selects the ID along with the other fields
+    :return: the fields of the profile, the ID first, or None if it doesn't exist
+    """
+    cached = cache.get(profileID)
+    if cached is not None:
+        return cached
+    stamp = cache.stamp()
+    query_result = await read(name, (profileID,))
+    if query_result is None or query_result[0] != 1:
+        return None
+    row = tuple(query_result[1].rows[0])
+    if not selectsID:
+        row = (profileID,) + row
+    cache.put(profileID, row, stamp)
+    return row
+
+
+async def deleteProfile(cache: LRUCache, name: str, profileID: int) -> ReturnValue:
+    ret_value = await write(name, (profileID,), DELETE_ERRORS, deleting=True)
+    cache.invalidate(profileID)
+    return ret_value
+
+
+async def addMatch(match: Match) -> ReturnValue:
+    return await addProfile(Solution.MATCH_CACHE, "add_match", (match.getMatchID(), match.getCompetition(),
+                                                                match.getHomeTeamID(), match.getAwayTeamID()))
+
+
+async def getMatchProfile(matchID: int) -> Match:
+    row = await readProfile(Solution.MATCH_CACHE, "get_match_profile", matchID)
+    return Match.badMatch() if row is None else Match(*row)
+
+
+async def deleteMatch(match: Match) -> ReturnValue:
+    return await deleteProfile(Solution.MATCH_CACHE, "delete_match", match.getMatchID())
+
+
+async def addPlayer(player: Player) -> ReturnValue:
+    return await addProfile(Solution.PLAYER_CACHE, "add_player", (player.getPlayerID(), player.getTeamID(),
+                                                                  player.getAge(), player.getHeight(),
+                                                                  player.getFoot()))
+
+
+async def getPlayerProfile(playerID: int) -> Player:
+    row = await readProfile(Solution.PLAYER_CACHE, "get_player_profile", playerID, selectsID=False)
+    return Player.badPlayer() if row is None else Player(*row)
+
+
+async def deletePlayer(player: Player) -> ReturnValue:
+    return await deleteProfile(Solution.PLAYER_CACHE, "delete_player", player.getPlayerID())
+
+
+async def addStadium(stadium: Stadium) -> ReturnValue:
+    return await addProfile(Solution.STADIUM_CACHE, "add_stadium", (stadium.getStadiumID(), stadium.getCapacity(),
+                                                                    stadium.getBelongsTo()))
+
+
+async def getStadiumProfile(stadiumID: int) -> Stadium:
+    row = await readProfile(Solution.STADIUM_CACHE, "get_stadium_profile", stadiumID)
+    return Stadium.badStadium() if row is None else Stadium(*row)
+
+
+async def deleteStadium(stadium: Stadium) -> ReturnValue:
+    return await deleteProfile(Solution.STADIUM_CACHE, "delete_stadium", stadium.getStadiumID())
+
+
+async def playerScoredInMatch(match: Match, player: Player, amount: int) -> ReturnValue:
+    return await write("player_scored", (player.getPlayerID(), match.getMatchID(), amount), LINK_ERRORS)
+
+
+async def playerDidntScoreInMatch(match: Match, player: Player) -> ReturnValue:
+    return await write("player_didnt_score", (player.getPlayerID(), match.getMatchID()), DELETE_ERRORS,
+                       deleting=True)
+
+
+async def matchInStadium(match: Match, stadium: Stadium, attendance: int) -> ReturnValue:
+    return await write("match_in_stadium", (match.getMatchID(), stadium.getStadiumID(), attendance), LINK_ERRORS)
+
+
+async def matchNotInStadium(match: Match, stadium: Stadium) -> ReturnValue:
+    return await write("match_not_in_stadium", (match.getMatchID(), stadium.getStadiumID()), DELETE_ERRORS,
+                       deleting=True)
+
+
+async def registerMatch(match: Match, stadium: Stadium = None, attendance: int = None, scorers=()) -> ReturnValue:
+    adding_match = True
+    try:
+        async with AsyncDBConnector() as conn:
+            async with conn.transaction():
+                rows_effected, _ = await conn.executePrepared("add_match", (match.getMatchID(),
+                                                                            match.getCompetition(),
+                                                                            match.getHomeTeamID(),
+                                                                            match.getAwayTeamID()))
+                if rows_effected == 0:
+                    raise DatabaseException.UNIQUE_VIOLATION("UNIQUE_VIOLATION")
+                adding_match = False
+                if stadium is not None:
+                    await conn.executePrepared("match_in_stadium",
+                                               (match.getMatchID(), stadium.getStadiumID(), attendance))
+                for player, amount in scorers:
+                    await conn.executePrepared("player_scored", (player.getPlayerID(), match.getMatchID(), amount))
+    except tuple(ADD_ERRORS) as e:
+        return (ADD_ERRORS if adding_match else LINK_ERRORS)[type(e)]
+    except OTHER_ERRORS:
+        return ReturnValue.ERROR
+    Solution.MATCH_CACHE.put(match.getMatchID(), (match.getMatchID(), match.getCompetition(),
+                                                  match.getHomeTeamID(), match.getAwayTeamID()))
+    return ReturnValue.OK
+
+
+async def averageAttendanceInStadium(stadiumID: int) -> float:
+    query_result = await read("average_attendance", (stadiumID,))
+    if query_result is None:
+        return -1
+    if query_result[1].rows[0][0] is None:
+        return 0
+    return query_result[1].rows[0][0]
+
+
+async def stadiumTotalGoals(stadiumID: int) -> int:
+    query_result = await read("stadium_total_goals", (stadiumID,))
+    if query_result is None:
+        return -1
+    if query_result[0] == 0:
+        return 0
+    return query_result[1].rows[0][0]
+
+
+async def matchTotalGoals(matchID: int) -> int:
+    query_result = await read("match_total_goals", (matchID,))
+    if query_result is None:
+        return -1
+    if query_result[0] == 0:
+        return 0
+    return query_result[1].rows[0][0]
+
+
+async def playerIsWinner(playerID: int, matchID: int) -> bool:
+    query_result = await read("player_is_winner", (matchID, playerID))
+    return query_result is not None and query_result[0] == 1 and query_result[1].rows[0][0] == playerID
+
+
+async def winnersOfMatches(matchIDs) -> Dict[int, List[int]]:
+    match_ids = list(dict.fromkeys(matchIDs))
+    winners = {match_id: [] for match_id in match_ids}
+    query_result = await read("winners_of_matches", (match_ids,))
+    if query_result is not None:
+        for match_id, player_id in query_result[1].rows:
+            winners[match_id].append(player_id)
+    return winners
+
+
+async def winnersOfMatch(matchID: int) -> List[int]:
+    return (await winnersOfMatches([matchID]))[matchID]
+
+
+async def playerIsWinnerMany(pairs) -> Dict[tuple, bool]:
+    pairs = list(dict.fromkeys((player_id, match_id) for player_id, match_id in pairs))
+    winners = await winnersOfMatches(match_id for _, match_id in pairs)
+    return {(player_id, match_id): player_id in winners[match_id] for player_id, match_id in pairs}
+
+
+async def getActiveTallTeams() -> List[int]:
+    return await readIDs("active_tall_teams")
+
+
+async def getActiveTallRichTeams() -> List[int]:
+    return await readIDs("active_tall_rich_teams")
+
+
+async def popularTeams() -> List[int]:
+    return await readIDs("popular_teams")
+
+
+async def getMostAttractiveStadiums() -> List[int]:
+    return await readIDs("most_attractive_stadiums")
+
+
+async def mostGoalsForTeam(teamID: int) -> List[int]:
+    return await readIDs("most_goals_for_team", (teamID,))
+
+
+async def mostGoalsForAllTeams(limit: int = 5):
+    # asynchronous connections have no server-side cursors, the rows arrive at once and are grouped here
+    if limit < 1:
+        return
+    query_result = await read("most_goals_for_all_teams", (limit,))
+    if query_result is None:
+        return
+    teams = {}
+    for team_id, player_id in query_result[1].rows:
+        players = teams.setdefault(team_id, [])
+        if player_id is not None:
+            players.append(player_id)
+    for team_id, players in teams.items():
+        yield team_id, players
+
+
+async def getClosePlayers(playerID: int) -> List[int]:
+    return await readIDs("close_players", (playerID,))
+
+
+async def getClosePlayersMany(playerIDs) -> Dict[int, List[int]]:
+    player_ids = list(dict.fromkeys(playerIDs))
+    close_players = {player_id: [] for player_id in player_ids}
+    query_result = await read("close_players_many", (player_ids,))
+    if query_result is not None:
+        for target, close in query_result[1].rows:
+            close_players[target].append(close)
+    return close_players
@@ -0,0 +1,211 @@
+import argparse
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import time
+import tracemalloc
+from typing import List
+import Solution
+from Benchmark.League import League, generateLeague, loadLeague
+from Business.Match import Match
+from Business.Player import Player
+from Business.Stadium import Stadium
+
+
+def percentile(sortedValues: List[float], fraction: float) -> float:
+    if len(sortedValues) == 0:
+        return 0.0
+    index = min(len(sortedValues) - 1, max(0, int(round(fraction * len(sortedValues))) - 1))
+    return sortedValues[index]
+
+
+def measure(function, argsList: list) -> dict:
+    """
+    Times function over the args tuples, then counts the allocations of calls with the remaining ones under
+    tracemalloc. No args tuple is used twice, so a write case takes the same path (adding a new row, deleting
+    an existing one) in both passes instead of hitting ALREADY_EXISTS or NOT_EXISTS in the second one
+    :param function: callable to measure
+    :param argsList: list of argument tuples, one call each (the last quarter, at most 100, is kept for the
+                     allocation pass)
+    :return: latency percentiles in milliseconds, throughput and allocations per call
+    """
+    split = len(argsList) - min(100, len(argsList) // 4)
+    argsList, sample = argsList[:split], argsList[split:]
+    latencies = []
+    start = time.perf_counter()
+    for args in argsList:
+        before = time.perf_counter()
+        function(*args)
+        latencies.append(time.perf_counter() - before)
+    elapsed = time.perf_counter() - start
+    latencies.sort()
+
+    tracemalloc.start()
+    snapshot = tracemalloc.take_snapshot()
+    for args in sample:
+        function(*args)
+    stats = tracemalloc.take_snapshot().compare_to(snapshot, "filename")
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    calls = max(len(sample), 1)
+
+    return {"calls": len(argsList),
+            "mean_ms": 1000 * elapsed / max(len(argsList), 1),
+            "p50_ms": 1000 * percentile(latencies, 0.50),
+            "p95_ms": 1000 * percentile(latencies, 0.95),
+            "p99_ms": 1000 * percentile(latencies, 0.99),
+            "throughput_per_s": len(argsList) / elapsed if elapsed > 0 else 0.0,
+            "alloc_blocks_per_call": sum(max(stat.count_diff, 0) for stat in stats) / calls,
+            "alloc_bytes_per_call": sum(max(stat.size_diff, 0) for stat in stats) / calls,
+            "peak_bytes": peak}
+
+
+def cases(league: League, calls: int, seed: int) -> list:
+    """
+    The benchmarked calls of every public function of Solution.py, in the order they are run.
+    Reads come first, then the writes, which add and remove rows that are not part of the league
+    :return: list of (name, function, argsList)
+    """
+    rand = random.Random(seed)
+    team_ids = league.teams
+    player_ids = [player.getPlayerID() for player in league.players]
+    match_ids = [match.getMatchID() for match in league.matches]
+    stadium_ids = [stadium.getStadiumID() for stadium in league.stadiums]
+
+    def pick(values):
+        return [(rand.choice(values),) for _ in range(calls)]
+
+    new_teams = [max(team_ids) + 1 + i for i in range(calls + 1)]
+    new_matches = [Match(len(match_ids) + 1 + i, "Domestic", new_teams[i], new_teams[i + 1]) for i in range(calls)]
+    new_players = [Player(len(player_ids) + 1 + i, new_teams[i], 25, 180, "Left") for i in range(calls)]
+    new_stadiums = [Stadium(len(stadium_ids) + 1 + i, 30000, new_teams[i]) for i in range(calls)]
+    scored = [(match, Player(player.getPlayerID()), 1) for match, player in zip(new_matches, new_players)]
+    took_place = [(match, Stadium(stadium.getStadiumID()), 20000) for match, stadium in zip(new_matches, new_stadiums)]
+
+    return [("getMatchProfile", Solution.getMatchProfile, pick(match_ids)),
+            ("getPlayerProfile", Solution.getPlayerProfile, pick(player_ids)),
+            ("getStadiumProfile", Solution.getStadiumProfile, pick(stadium_ids)),
+            ("averageAttendanceInStadium", Solution.averageAttendanceInStadium, pick(stadium_ids)),
+            ("stadiumTotalGoals", Solution.stadiumTotalGoals, pick(stadium_ids)),
+            ("playerIsWinner", Solution.playerIsWinner,
+             [(rand.choice(player_ids), rand.choice(match_ids)) for _ in range(calls)]),
+            ("playerIsWinnerMany", Solution.playerIsWinnerMany,
+             [([(rand.choice(player_ids), rand.choice(match_ids)) for _ in range(10)],) for _ in range(calls)]),
+            ("winnersOfMatches", Solution.winnersOfMatches,
+             [([rand.choice(match_ids) for _ in range(10)],) for _ in range(calls)]),
+            ("getActiveTallTeams", Solution.getActiveTallTeams, [()] * calls),
+            ("getActiveTallRichTeams", Solution.getActiveTallRichTeams, [()] * calls),
+            ("popularTeams", Solution.popularTeams, [()] * calls),
+            ("getMostAttractiveStadiums", Solution.getMostAttractiveStadiums, [()] * calls),
+            ("mostGoalsForTeam", Solution.mostGoalsForTeam, pick(team_ids)),
+            ("mostGoalsForAllTeams", lambda: list(Solution.mostGoalsForAllTeams()), [()] * calls),
+            ("getClosePlayers", Solution.getClosePlayers, pick(player_ids)),
+            ("getClosePlayersMany", Solution.getClosePlayersMany,
+             [([rand.choice(player_ids) for _ in range(10)],) for _ in range(calls)]),
+            ("addTeam", Solution.addTeam, [(team,) for team in new_teams]),
+            ("addMatch", Solution.addMatch, [(match,) for match in new_matches]),
+            ("addPlayer", Solution.addPlayer, [(player,) for player in new_players]),
+            ("addStadium", Solution.addStadium, [(stadium,) for stadium in new_stadiums]),
+            ("matchInStadium", Solution.matchInStadium, took_place),
+            ("playerScoredInMatch", Solution.playerScoredInMatch, scored),
+            ("playerDidntScoreInMatch", Solution.playerDidntScoreInMatch, [args[:2] for args in scored]),
+            ("matchNotInStadium", Solution.matchNotInStadium, [args[:2] for args in took_place]),
+            ("deleteMatch", Solution.deleteMatch, [(match,) for match in new_matches]),
+            ("deletePlayer", Solution.deletePlayer, [(player,) for player in new_players]),
+            ("deleteStadium", Solution.deleteStadium, [(stadium,) for stadium in new_stadiums])]
+
+
+def gitCommit():
+    try:
+        return subprocess.check_output(["git", "rev-parse", "HEAD"], stderr=subprocess.DEVNULL,
+                                       cwd=os.path.dirname(os.path.abspath(__file__))).decode().strip()
+    except Exception:
+        return None
+
+
+def runBenchmark(league: League, calls=200, seed=0, only=None) -> dict:
+    """
+    Recreates the schema, loads league and measures every public function of Solution.py
+    :param league: League instance
+    :param calls: calls per function
+    :param seed: seed picking the arguments of the calls
+    :param only: names of the functions to measure, all of them when None
+    :return: report dictionary
+    """
+    Solution.dropTables()
+    Solution.createTables()
+    start = time.perf_counter()
+    if not loadLeague(league):
+        raise RuntimeError("Could not load " + str(league))
+    load_seconds = time.perf_counter() - start
+
+    results = {}
+    for name, function, argsList in cases(league, calls, seed):
+        # writes still run when filtered out, later cases depend on the rows they add
+        result = measure(function, argsList)
+        if only is None or name in only:
+            results[name] = result
+    Solution.dropTables()
+
+    return {"meta": {"commit": gitCommit(), "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+                     "python": sys.version.split()[0], "platform": platform.platform(),
+                     "league": league.settings, "rows": str(league), "calls": calls, "seed": seed,
+                     "load_seconds": load_seconds},
+            "results": results}
+
+
+def compareReports(old: dict, new: dict, metric="p50_ms") -> List[tuple]:
+    """
+    :return: (function, old value, new value, new/old ratio) for every function in both reports
+    """
+    rows = []
+    for name, result in new["results"].items():
+        if name in old["results"]:
+            before, after = old["results"][name][metric], result[metric]
+            rows.append((name, before, after, after / before if before else float("inf")))
+    return rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark every public function of Solution.py")
+    sub = parser.add_subparsers(dest="command")
+    run = sub.add_parser("run", help="generate a league, load it and time every function")
+    run.add_argument("--teams", type=int, default=20)
+    run.add_argument("--players-per-team", type=int, default=25)
+    run.add_argument("--matches", type=int, default=None)
+    run.add_argument("--stadiums", type=int, default=None)
+    run.add_argument("--goals-per-team", type=float, default=1.4)
+    run.add_argument("--seed", type=int, default=236363)
+    run.add_argument("--calls", type=int, default=200)
+    run.add_argument("--only", nargs="*", default=None)
+    run.add_argument("--out", default="benchmark.json")
+    compare = sub.add_parser("compare", help="compare two reports")
+    compare.add_argument("old")
+    compare.add_argument("new")
+    compare.add_argument("--metric", default="p50_ms")
+    args = parser.parse_args(argv)
+
+    if args.command == "run":
+        league = generateLeague(args.teams, args.players_per_team, args.matches, args.stadiums,
+                                args.goals_per_team, args.seed)
+        print("Loading " + str(league))
+        report = runBenchmark(league, args.calls, args.seed, args.only)
+        with open(args.out, "w") as out:
+            json.dump(report, out, indent=2, sort_keys=True)
+        for name, result in report["results"].items():
+            print("%-28s p50 %8.3f ms  p95 %8.3f ms  p99 %8.3f ms  %9.1f calls/s" %
+                  (name, result["p50_ms"], result["p95_ms"], result["p99_ms"], result["throughput_per_s"]))
+    elif args.command == "compare":
+        with open(args.old) as old, open(args.new) as new:
+            rows = compareReports(json.load(old), json.load(new), args.metric)
+        for name, before, after, ratio in rows:
+            print("%-28s %10.3f -> %10.3f  x%.2f" % (name, before, after, ratio))
+    else:
+        parser.print_help()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,67 @@
+import argparse
+import json
+import random
+from typing import List
+import Solution
+from Benchmark.Benchmark import gitCommit, measure
+from Benchmark.League import generateLeague, loadLeague
+
+
+def runScaling(teamCounts: List[int], matchesPerTeam=40, playersPerTeam=25, calls=200, batch=50,
+               seed=236363) -> dict:
+    """
+    Measures getClosePlayers and getClosePlayersMany on leagues of growing size.
+    Every team plays matchesPerTeam matches whatever the number of teams, so a player scores in about the same
+    number of matches at every size and only the total number of matches grows
+    :param teamCounts: number of teams of each league
+    :param matchesPerTeam: matches each team plays
+    :param playersPerTeam: number of players in each team
+    :param calls: calls per function and league
+    :param batch: players per getClosePlayersMany call
+    :param seed: seed of the leagues and of the picked players
+    :return: report dictionary, one row per league
+    """
+    rows = []
+    for teams in teamCounts:
+        league = generateLeague(teams, playersPerTeam, teams * matchesPerTeam // 2, seed=seed)
+        Solution.dropTables()
+        Solution.createTables()
+        if not loadLeague(league):
+            raise RuntimeError("Could not load " + str(league))
+
+        rand = random.Random(seed)
+        # players who scored have the costly queries, the zero goals branch is a plain index scan
+        scorers = sorted({player for player, _, _ in league.scored})
+        single = measure(Solution.getClosePlayers, [(rand.choice(scorers),) for _ in range(calls)])
+        many = measure(Solution.getClosePlayersMany,
+                       [([rand.choice(scorers) for _ in range(batch)],) for _ in range(max(calls // batch, 1))])
+        rows.append({"teams": teams, "players": len(league.players), "matches": len(league.matches),
+                     "scored": len(league.scored), "single": single, "many": many,
+                     "many_per_player_ms": many["mean_ms"] / batch})
+        print("%6d matches  %8d scored  single p50 %8.3f ms  many %8.3f ms/player" %
+              (len(league.matches), len(league.scored), single["p50_ms"], rows[-1]["many_per_player_ms"]))
+    Solution.dropTables()
+
+    return {"meta": {"commit": gitCommit(), "matchesPerTeam": matchesPerTeam, "playersPerTeam": playersPerTeam,
+                     "calls": calls, "batch": batch, "seed": seed},
+            "rows": rows}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Per query cost of getClosePlayers as the number of matches grows")
+    parser.add_argument("--teams", type=int, nargs="*", default=[10, 40, 160, 640])
+    parser.add_argument("--matches-per-team", type=int, default=40)
+    parser.add_argument("--players-per-team", type=int, default=25)
+    parser.add_argument("--calls", type=int, default=200)
+    parser.add_argument("--batch", type=int, default=50)
+    parser.add_argument("--seed", type=int, default=236363)
+    parser.add_argument("--out", default="close_players.json")
+    args = parser.parse_args(argv)
+
+    report = runScaling(args.teams, args.matches_per_team, args.players_per_team, args.calls, args.batch, args.seed)
+    with open(args.out, "w") as out:
+        json.dump(report, out, indent=2, sort_keys=True)
+
+
+if __name__ == '__main__':
+    main()
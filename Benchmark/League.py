@@ -0,0 +1,115 @@
+import math
+import random
+from typing import List
+import Solution
+import Utility.DBConnector as Connector
+from Utility.ReturnValue import ReturnValue
+from Business.Match import Match
+from Business.Player import Player
+from Business.Stadium import Stadium
+
+
+class League:
+    def __init__(self, teams: List[int], players: List[Player], matches: List[Match], stadiums: List[Stadium],
+                 tookPlace: List[tuple], scored: List[tuple], settings: dict):
+        self.teams = teams
+        self.players = players
+        self.matches = matches
+        self.stadiums = stadiums
+        self.tookPlace = tookPlace  # (Match_Id, Stadium_Id, Spectators)
+        self.scored = scored  # (Player_Id, Match_Id, Goals)
+        self.settings = settings
+
+    def __str__(self):
+        return "League(teams=" + str(len(self.teams)) + ", players=" + str(len(self.players)) + \
+               ", matches=" + str(len(self.matches)) + ", stadiums=" + str(len(self.stadiums)) + \
+               ", took_place=" + str(len(self.tookPlace)) + ", scored=" + str(len(self.scored)) + ")"
+
+
+def generateLeague(teams=20, playersPerTeam=25, matches=None, stadiums=None, goalsPerTeam=1.4,
+                   seed=236363) -> League:
+    """
+    Generates a reproducible league, the same arguments always give the same league
+    :param teams: number of teams
+    :param playersPerTeam: number of players in each team
+    :param matches: number of matches, a double round robin (every pair twice) when None
+    :param stadiums: number of stadiums, one per team when None, stadiums beyond that belong to no team
+    :param goalsPerTeam: mean of the Poisson distribution of the goals a team scores in a match
+    :param seed: seed of the random generator
+    :return: League instance
+    """
+    rand = random.Random(seed)
+    settings = {"teams": teams, "playersPerTeam": playersPerTeam, "matches": matches, "stadiums": stadiums,
+                "goalsPerTeam": goalsPerTeam, "seed": seed}
+    team_ids = list(range(1, teams + 1))
+    if stadiums is None:
+        stadiums = teams
+
+    players, squads = [], {}
+    for team in team_ids:
+        squads[team] = []
+        for _ in range(playersPerTeam):
+            player = Player(len(players) + 1, team, rand.randint(17, 38), int(rand.gauss(182, 8)),
+                            rand.choice(["Left", "Right", "Right"]))
+            players.append(player)
+            squads[team].append(player.getPlayerID())
+
+    stadium_list = [Stadium(s, rand.randint(5000, 90000), s if s <= teams else None) for s in range(1, stadiums + 1)]
+    home_stadium = {stadium.getBelongsTo(): stadium.getStadiumID() for stadium in stadium_list
+                    if stadium.getBelongsTo() is not None}
+
+    if matches is None:
+        fixtures = [(home, away) for home in team_ids for away in team_ids if home != away]
+        rand.shuffle(fixtures)
+    else:
+        fixtures = [tuple(rand.sample(team_ids, 2)) for _ in range(matches)]
+
+    match_list, took_place, scored = [], [], []
+    for home, away in fixtures:
+        match = Match(len(match_list) + 1, rand.choice(["Domestic", "International"]), home, away)
+        match_list.append(match)
+        stadium = home_stadium.get(home, rand.randint(1, stadiums)) if stadiums > 0 else None
+        if stadium is not None:
+            capacity = stadium_list[stadium - 1].getCapacity()
+            took_place.append((match.getMatchID(), stadium, rand.randint(capacity // 4, capacity)))
+        for team in (home, away):
+            goals = {}
+            for _ in range(poisson(rand, goalsPerTeam)):
+                scorer = rand.choice(squads[team])
+                goals[scorer] = goals.get(scorer, 0) + 1
+            scored += [(player, match.getMatchID(), amount) for player, amount in goals.items()]
+
+    return League(team_ids, players, match_list, stadium_list, took_place, scored, settings)
+
+
+def poisson(rand: random.Random, mean: float) -> int:
+    # Knuth's algorithm, fine for the small means of football scores
+    limit, k, p = math.exp(-mean), 0, 1.0
+    while True:
+        p *= rand.random()
+        if p <= limit:
+            return k
+        k += 1
+
+
+def loadLeague(league: League) -> bool:
+    """
+    Bulk loads a league into empty tables
+    :param league: League instance
+    :return: True if every row was added
+    """
+    results = Solution.addTeams(league.teams) + Solution.addPlayers(league.players) + \
+        Solution.addStadiums(league.stadiums) + Solution.addMatches(league.matches)
+    if any(result != ReturnValue.OK for result in results):
+        return False
+    conn = None
+    try:
+        conn = Connector.DBConnector()
+        with conn.transaction():
+            conn.copy("Took_Place", ["Match_Id", "Stadium_Id", "Spectators"], league.tookPlace)
+            conn.copy("Scored", ["Player_Id", "Match_Id", "Goals"], league.scored)
+        conn.execute("ANALYZE")
+        return True
+    finally:
+        if conn is not None:
+            conn.close()
@@ -0,0 +1,98 @@
+import argparse
+import json
+import time
+import Solution
+import Utility.DBConnector as Connector
+from Benchmark.Benchmark import gitCommit
+from Benchmark.League import League, generateLeague, loadLeague
+from psycopg2 import sql
+
+
+def clearTablesByDelete():
+    # clearTables before it used TRUNCATE, kept as the baseline
+    conn = Connector.DBConnector()
+    try:
+        _, result = conn.execute("SELECT TABLE_NAME FROM INFORMATION_SCHEMA.TABLES "
+                                 "WHERE TABLE_TYPE='BASE TABLE' AND TABLE_SCHEMA='public'")
+        for name in result.rows:
+            conn.execute(sql.SQL("DELETE FROM {} CASCADE ").format(sql.Identifier(name[0])))
+    finally:
+        conn.close()
+
+
+def dropTablesOneByOne():
+    # dropTables before it dropped every table in one statement, kept as the baseline
+    conn = Connector.DBConnector()
+    try:
+        _, result = conn.execute("SELECT TABLE_NAME FROM INFORMATION_SCHEMA.TABLES "
+                                 "WHERE TABLE_TYPE='BASE TABLE' AND TABLE_SCHEMA='public'")
+        for name in result.rows:
+            conn.execute(sql.SQL("DROP TABLE IF EXISTS {} CASCADE").format(sql.Identifier(name[0])))
+    finally:
+        conn.close()
+
+
+def timeOnLoaded(league: League, function) -> float:
+    """
+    Loads league into a fresh schema and times function on it
+    :return: seconds function took
+    """
+    Solution.dropTables()
+    Solution.createTables()
+    if not loadLeague(league):
+        raise RuntimeError("Could not load " + str(league))
+    start = time.perf_counter()
+    function()
+    return time.perf_counter() - start
+
+
+def runSchemaBenchmark(league: League, repeat=3) -> dict:
+    """
+    Times clearTables and dropTables against their one statement per table baselines on a loaded league
+    :param league: League instance, about a million rows for the numbers the backlog asked for
+    :param repeat: runs of each function, the fastest one is reported
+    :return: report dictionary
+    """
+    functions = [("clearTables", Solution.clearTables), ("clearTablesByDelete", clearTablesByDelete),
+                 ("dropTables", Solution.dropTables), ("dropTablesOneByOne", dropTablesOneByOne)]
+    results = {}
+    for name, function in functions:
+        results[name] = min(timeOnLoaded(league, function) for _ in range(repeat))
+        print("%-22s %10.3f s" % (name, results[name]))
+    Solution.dropTables()
+
+    # createTables returns {} when it fails, reported as None
+    start = time.perf_counter()
+    created = Solution.createTables()
+    results["createTables"] = time.perf_counter() - start if created else None
+    results["createTablesAgain"] = Solution.createTables().get("Schema")
+    for name in ("createTables", "createTablesAgain"):
+        if results[name] is None:
+            print("%-22s %10s" % (name, "failed"))
+        else:
+            print("%-22s %10.3f s" % (name, results[name]))
+    Solution.dropTables()
+
+    return {"meta": {"commit": gitCommit(), "rows": str(league), "league": league.settings, "repeat": repeat},
+            "results": results}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="TRUNCATE and single DROP against one statement per table")
+    parser.add_argument("--teams", type=int, default=400)
+    parser.add_argument("--players-per-team", type=int, default=25)
+    parser.add_argument("--matches", type=int, default=300000)
+    parser.add_argument("--seed", type=int, default=236363)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--out", default="schema.json")
+    args = parser.parse_args(argv)
+
+    league = generateLeague(args.teams, args.players_per_team, args.matches, seed=args.seed)
+    print("Loading " + str(league))
+    report = runSchemaBenchmark(league, args.repeat)
+    with open(args.out, "w") as out:
+        json.dump(report, out, indent=2, sort_keys=True)
+
+
+if __name__ == '__main__':
+    main()
@@ -1,173 +1,795 @@
-from typing import List
+import time
+from typing import Dict, List
 import Utility.DBConnector as Connector
 from Utility.DBConnector import ResultSet
 from Utility.ReturnValue import ReturnValue
 from Utility.Exceptions import DatabaseException
+from Utility.LRUCache import LRUCache
 from Business.Match import Match
 from Business.Player import Player
 from Business.Stadium import Stadium
+import psycopg2
 from psycopg2 import sql
 
 
-def createTables():
-    schema = "CREATE TABLE Team(" \
-             "Team_Id INTEGER UNIQUE," \
-             "CHECK(Team_Id>0))"
-    createEachTable(schema)
-
-    schema = "CREATE TABLE Match(" \
-             "Match_Id INTEGER PRIMARY KEY," \
-             "Competition VARCHAR(13) NOT NULL CHECK (Competition IN('International', 'Domestic'))," \
-             "Home_Team_Id INTEGER NOT NULL REFERENCES Team(Team_Id)" \
-             "ON DELETE CASCADE," \
-             "Away_Team_Id INTEGER NOT NULL REFERENCES Team(Team_Id)" \
-             "ON DELETE CASCADE," \
-             "CHECK(Home_Team_Id<>Away_Team_Id))"
-    createEachTable(schema)
-
-    schema = "CREATE TABLE Player(" \
-             "Player_Id INTEGER PRIMARY KEY," \
-             "Team_Id INTEGER NOT NULL REFERENCES Team(Team_Id)" \
-             "ON DELETE CASCADE," \
-             "Age INTEGER NOT NULL CHECK(Age>0)," \
-             "Height INTEGER NOT NULL CHECK(Height>0)," \
-             "Preferred_Foot VARCHAR(5) NOT NULL CHECK (Preferred_Foot IN('Left', 'Right'))," \
-             "CHECK(Player_Id>0))"
-    createEachTable(schema)
-
-    schema = "CREATE TABLE Stadium(" \
-             "Stadium_Id INTEGER PRIMARY KEY," \
-             "Capacity INTEGER NOT NULL CHECK(Capacity>0)," \
-             "Belong_to INTEGER REFERENCES Team(Team_Id)" \
-             "ON DELETE CASCADE," \
-             "UNIQUE(Belong_to), " \
-             "CHECK(Stadium_Id>0))"
-    createEachTable(schema)
-
-    schema = "CREATE TABLE Scored(" \
-             "Player_Id INTEGER REFERENCES Player " \
-             "ON DELETE CASCADE," \
-             "Match_Id INTEGER REFERENCES Match " \
-             "ON DELETE CASCADE," \
-             "Goals INTEGER NOT NULL CHECK(Goals>0)," \
-             "PRIMARY KEY(Player_Id, Match_Id))"
-    createEachTable(schema)
-
-    schema = "CREATE TABLE Took_Place(" \
-             "Match_Id INTEGER REFERENCES Match " \
-             "ON DELETE CASCADE," \
-             "Stadium_Id INTEGER REFERENCES Stadium " \
-             "ON DELETE CASCADE," \
-             "Spectators INTEGER NOT NULL CHECK(Spectators>0)," \
-             "PRIMARY KEY(Match_Id, Stadium_Id))"
-    createEachTable(schema)
-
-    schema = "CREATE OR REPLACE VIEW Goals_In_Stadium AS " \
-             "SELECT Player_Id, Stadium_Id, Goals " \
-             "FROM Took_Place LEFT OUTER JOIN Scored " \
-             "ON Took_Place.Match_Id=Scored.Match_Id"
-    createEachTable(schema)
-
-    schema = "CREATE OR REPLACE VIEW Active_Teams AS " \
-             "SELECT Home_Team_Id FROM Match " \
-             "UNION " \
-             "SELECT Away_Team_Id FROM Match"
-    createEachTable(schema)
-
-    schema = "CREATE OR REPLACE VIEW Home_Teams_Stadiums AS " \
-             "SELECT M.Home_Team_Id, T.Spectators ,T.Stadium_Id " \
-             "FROM Match M, Took_Place T " \
-             "WHERE M.Match_Id=T.Match_Id"
-    createEachTable(schema)
-
-    schema = "CREATE OR REPLACE VIEW Player_Join_Scored AS " \
-             "SELECT Team_Id, Player_Id, Match_Id, goals " \
-             "FROM Player NATURAL JOIN Scored;"
-    createEachTable(schema)
-
-    schema = "CREATE OR REPLACE VIEW Player_Left_Join_Scored AS " \
-             "SELECT Team_Id, P.Player_Id, Match_Id, COALESCE(goals, 0) " \
-             "FROM Player P LEFT OUTER JOIN Scored S " \
-             "ON P.Player_Id=S.Player_Id;"
-    createEachTable(schema)
-
-    schema = "CREATE OR REPLACE VIEW Player_Overall_Scored AS " \
-             "SELECT Player_Id, Team_Id, SUM(coalesce) " \
-             "FROM Player_Left_Join_Scored " \
-             "GROUP BY Player_Id, Team_Id;"
-    createEachTable(schema)
-
-    schema = "CREATE OR REPLACE VIEW Team_Scored_On_Match AS " \
-             "SELECT Team_Id, Match_Id, SUM(goals) " \
-             "FROM Player_Join_Scored " \
-             "GROUP BY Team_Id, Match_Id;"
-    createEachTable(schema)
-
-    schema = "CREATE OR REPLACE VIEW Goals_In_Match AS " \
-             "SELECT Match_Id, SUM(goals) " \
-             "FROM Scored GROUP BY Match_Id;"
-    createEachTable(schema)
-
-    schema = "CREATE OR REPLACE VIEW Goals_In_Match_Join_Scored AS " \
-             "SELECT * " \
-             "FROM Scored NATURAL JOIN Goals_In_Match"
-    createEachTable(schema)
-
-    schema = "CREATE OR REPLACE VIEW Active_Tall_Teams AS " \
-             "SELECT P.Team_Id " \
-             "FROM PLAYER P, ACTIVE_TEAMS T " \
-             "WHERE P.TEAM_Id=T.Home_Team_Id AND P.Height>190 " \
-             "GROUP BY P.Team_Id " \
-             "HAVING COUNT(P.Player_Id)>=2"
-    createEachTable(schema)
-
-
-
-
-def createEachTable(schema):
-    conn = None
+# query templates, each is PREPAREd once per pooled connection and executed with bound parameters
+# the add_* templates skip duplicates instead of raising, no row inserted means ALREADY_EXISTS
+Connector.DBConnector.prepare("add_team", "INSERT INTO Team(Team_Id) VALUES($1) ON CONFLICT DO NOTHING")
+Connector.DBConnector.prepare("add_match", "INSERT INTO Match(Match_Id, Competition, Home_Team_Id, Away_Team_Id) "
+                                           "VALUES($1, $2, $3, $4) ON CONFLICT DO NOTHING")
+Connector.DBConnector.prepare("get_match_profile", "SELECT * FROM Match WHERE Match_Id=$1")
+Connector.DBConnector.prepare("delete_match", "DELETE FROM Match WHERE Match_Id=$1")
+Connector.DBConnector.prepare("add_player", "INSERT INTO Player(Player_Id, Team_Id, Age, Height, Preferred_Foot) "
+                                            "VALUES($1, $2, $3, $4, $5) ON CONFLICT DO NOTHING")
+Connector.DBConnector.prepare("get_player_profile", "SELECT Team_Id, Age, Height, Preferred_Foot FROM Player "
+                                                    "WHERE Player_Id=$1")
+Connector.DBConnector.prepare("delete_player", "DELETE FROM Player WHERE Player_Id=$1")
+Connector.DBConnector.prepare("add_stadium", "INSERT INTO Stadium(Stadium_Id, Capacity, Belong_to) VALUES($1, $2, $3) "
+                                             "ON CONFLICT DO NOTHING")
+Connector.DBConnector.prepare("get_stadium_profile", "SELECT * FROM Stadium WHERE Stadium_Id=$1")
+Connector.DBConnector.prepare("delete_stadium", "DELETE FROM Stadium WHERE Stadium_Id=$1")
+Connector.DBConnector.prepare("player_scored", "INSERT INTO Scored(Player_Id, Match_Id, Goals) VALUES($1, $2, $3)")
+Connector.DBConnector.prepare("player_didnt_score", "DELETE FROM Scored WHERE Player_Id=$1 AND Match_Id=$2")
+Connector.DBConnector.prepare("match_in_stadium", "INSERT INTO Took_Place(Match_Id, Stadium_Id, Spectators) "
+                                                  "VALUES($1, $2, $3)")
+Connector.DBConnector.prepare("match_not_in_stadium", "DELETE FROM Took_Place WHERE Match_Id=$1 AND Stadium_Id=$2")
+Connector.DBConnector.prepare("average_attendance", "SELECT AVG(Spectators) FROM Took_Place WHERE Stadium_Id=$1")
+Connector.DBConnector.prepare("stadium_total_goals", "SELECT Goals FROM Stadium_Goals WHERE Stadium_Id=$1")
+Connector.DBConnector.prepare("active_tall_teams", "SELECT P.Team_Id "
+                                                   "FROM Player P, Active_Teams T "
+                                                   "WHERE P.Team_Id=T.Home_Team_Id AND P.Height>190 "
+                                                   "GROUP BY P.Team_Id "
+                                                   "HAVING COUNT(P.Player_Id)>=2 "
+                                                   "ORDER BY P.Team_Id DESC "
+                                                   "LIMIT 5")
+Connector.DBConnector.prepare("active_tall_rich_teams", "SELECT Team_Id "
+                                                        "FROM Active_Tall_Teams INNER JOIN Stadium "
+                                                        "ON Team_Id=Belong_to "
+                                                        "WHERE Capacity>55000 "
+                                                        "ORDER BY Team_Id ASC "
+                                                        "LIMIT 5")
+Connector.DBConnector.prepare("popular_teams", "SELECT Team_Id FROM Team_Popularity "
+                                               "WHERE (Attended>0 AND Min_Attendance>40000) "
+                                               "OR (Home_Matches=0 AND Away_Matches>0) "
+                                               "ORDER BY Team_Id DESC "
+                                               "LIMIT 10")
+Connector.DBConnector.prepare("most_attractive_stadiums", "SELECT Stadium_Id FROM Stadium_Goals WHERE Matches>0 "
+                                                          "ORDER BY Goals DESC, Stadium_Id ASC")
+Connector.DBConnector.prepare("player_is_winner", "SELECT S.Player_Id FROM Scored S "
+                                                  "JOIN Match_Goal_Totals T ON T.Match_Id=S.Match_Id "
+                                                  "WHERE S.Match_Id=$1 AND S.Player_Id=$2 AND 2*S.Goals>=T.Goals")
+Connector.DBConnector.prepare("match_total_goals", "SELECT Goals FROM Match_Goal_Totals WHERE Match_Id=$1")
+# the winners of many matches at once, a player wins a match by scoring at least half of its goals
+Connector.DBConnector.prepare("winners_of_matches", "SELECT S.Match_Id, S.Player_Id FROM Match_Goal_Totals T "
+                                                    "JOIN Scored S ON S.Match_Id=T.Match_Id "
+                                                    "WHERE T.Match_Id=ANY($1::INTEGER[]) AND 2*S.Goals>=T.Goals "
+                                                    "ORDER BY S.Match_Id, S.Player_Id")
+Connector.DBConnector.prepare("most_goals_for_team", "SELECT Player_Id FROM Player_Goal_Totals "
+                                                     "WHERE Team_Id=$1 "
+                                                     "ORDER BY Total DESC, Player_Id DESC "
+                                                     "LIMIT 5")
+# the top scorers of every team in one pass over Player_Goal_Totals, teams without players get one row with a
+# NULL player. Streamed through a server-side cursor, which can't EXECUTE a prepared statement, so it is kept
+# as a query with a %s placeholder for the limit and also registered as a template for AsyncSolution
+MOST_GOALS_FOR_ALL_TEAMS = "SELECT Team_Id, Player_Id FROM (" \
+                           "SELECT T.Team_Id, G.Player_Id, " \
+                           "ROW_NUMBER() OVER (PARTITION BY T.Team_Id " \
+                           "ORDER BY G.Total DESC, G.Player_Id DESC) AS Position " \
+                           "FROM Team T " \
+                           "LEFT OUTER JOIN Player_Goal_Totals G ON G.Team_Id=T.Team_Id " \
+                           "WHERE T.Team_Id IS NOT NULL) R " \
+                           "WHERE Position<=%s " \
+                           "ORDER BY Team_Id, Position"
+Connector.DBConnector.prepare("most_goals_for_all_teams", MOST_GOALS_FOR_ALL_TEAMS.replace("%s", "$1"))
+
+# close players are found through the inverted index Scored already is: the primary key lists the matches
+# of a player and Scored_Match lists the scorers of a match, so the cost follows the matches the player
+# scored in and their scorers, not the size of the league
+Connector.DBConnector.prepare("close_players", "(SELECT Player_Id FROM Player "
+                                               "WHERE Player_Id<>$1 "
+                                               "AND EXISTS(SELECT 1 FROM Player WHERE Player_Id=$1) "
+                                               "AND NOT EXISTS(SELECT 1 FROM Scored WHERE Player_Id=$1) "
+                                               "ORDER BY Player_Id ASC "
+                                               "LIMIT 10) "
+                                               "UNION ALL "
+                                               "(SELECT S.Player_Id "
+                                               "FROM Scored Mine JOIN Scored S ON S.Match_Id=Mine.Match_Id "
+                                               "WHERE Mine.Player_Id=$1 AND S.Player_Id<>$1 "
+                                               "GROUP BY S.Player_Id "
+                                               "HAVING 2*COUNT(*)>=(SELECT COUNT(*) FROM Scored "
+                                               "WHERE Player_Id=$1) "
+                                               "ORDER BY S.Player_Id ASC "
+                                               "LIMIT 10)")
+Connector.DBConnector.prepare("close_players_many", "WITH Targets AS ("
+                                                    "SELECT P.Player_Id, "
+                                                    "(SELECT COUNT(*) FROM Scored S "
+                                                    "WHERE S.Player_Id=P.Player_Id) AS Matches "
+                                                    "FROM Player P WHERE P.Player_Id=ANY($1::INTEGER[])), "
+                                                    "Close_Pairs AS ("
+                                                    "SELECT T.Player_Id AS Target, S.Player_Id AS Close_Id "
+                                                    "FROM Targets T "
+                                                    "JOIN Scored Mine ON Mine.Player_Id=T.Player_Id "
+                                                    "JOIN Scored S ON S.Match_Id=Mine.Match_Id "
+                                                    "AND S.Player_Id<>T.Player_Id "
+                                                    "GROUP BY T.Player_Id, T.Matches, S.Player_Id "
+                                                    "HAVING 2*COUNT(*)>=T.Matches "
+                                                    "UNION ALL "
+                                                    "SELECT T.Player_Id, P.Player_Id "
+                                                    "FROM Targets T, LATERAL (SELECT Player_Id FROM Player "
+                                                    "WHERE Player_Id<>T.Player_Id "
+                                                    "ORDER BY Player_Id LIMIT 10) P "
+                                                    "WHERE T.Matches=0), "
+                                                    "Ranked AS ("
+                                                    "SELECT Target, Close_Id, "
+                                                    "ROW_NUMBER() OVER (PARTITION BY Target "
+                                                    "ORDER BY Close_Id) AS Position "
+                                                    "FROM Close_Pairs) "
+                                                    "SELECT Target, Close_Id FROM Ranked WHERE Position<=10 "
+                                                    "ORDER BY Target, Close_Id")
+
+
+# the whole schema as (object, DDL) pairs in creation order, every statement can run again on an existing schema
+SCHEMA = [("Team", "CREATE TABLE IF NOT EXISTS Team("
+                   "Team_Id INTEGER UNIQUE,"
+                   "CHECK(Team_Id>0))"),
+          ("Match", "CREATE TABLE IF NOT EXISTS Match("
+                    "Match_Id INTEGER PRIMARY KEY,"
+                    "Competition VARCHAR(13) NOT NULL CHECK (Competition IN('International', 'Domestic')),"
+                    "Home_Team_Id INTEGER NOT NULL REFERENCES Team(Team_Id)"
+                    "ON DELETE CASCADE,"
+                    "Away_Team_Id INTEGER NOT NULL REFERENCES Team(Team_Id)"
+                    "ON DELETE CASCADE,"
+                    "CHECK(Home_Team_Id<>Away_Team_Id))"),
+          ("Player", "CREATE TABLE IF NOT EXISTS Player("
+                     "Player_Id INTEGER PRIMARY KEY,"
+                     "Team_Id INTEGER NOT NULL REFERENCES Team(Team_Id)"
+                     "ON DELETE CASCADE,"
+                     "Age INTEGER NOT NULL CHECK(Age>0),"
+                     "Height INTEGER NOT NULL CHECK(Height>0),"
+                     "Preferred_Foot VARCHAR(5) NOT NULL CHECK (Preferred_Foot IN('Left', 'Right')),"
+                     "CHECK(Player_Id>0))"),
+          ("Stadium", "CREATE TABLE IF NOT EXISTS Stadium("
+                      "Stadium_Id INTEGER PRIMARY KEY,"
+                      "Capacity INTEGER NOT NULL CHECK(Capacity>0),"
+                      "Belong_to INTEGER REFERENCES Team(Team_Id)"
+                      "ON DELETE CASCADE,"
+                      "UNIQUE(Belong_to), "
+                      "CHECK(Stadium_Id>0))"),
+          ("Scored", "CREATE TABLE IF NOT EXISTS Scored("
+                     "Player_Id INTEGER REFERENCES Player "
+                     "ON DELETE CASCADE,"
+                     "Match_Id INTEGER REFERENCES Match "
+                     "ON DELETE CASCADE,"
+                     "Goals INTEGER NOT NULL CHECK(Goals>0),"
+                     "PRIMARY KEY(Player_Id, Match_Id))"),
+          ("Took_Place", "CREATE TABLE IF NOT EXISTS Took_Place("
+                         "Match_Id INTEGER REFERENCES Match "
+                         "ON DELETE CASCADE,"
+                         "Stadium_Id INTEGER REFERENCES Stadium "
+                         "ON DELETE CASCADE,"
+                         "Spectators INTEGER NOT NULL CHECK(Spectators>0),"
+                         "PRIMARY KEY(Match_Id, Stadium_Id))"),
+
+          # secondary indexes for the filters and joins of the queries, and for every foreign key
+          # column that is not the leading column of a primary key (ON DELETE CASCADE scans them)
+          ("Match_Home_Team", "CREATE INDEX IF NOT EXISTS Match_Home_Team ON Match(Home_Team_Id)"),
+          ("Match_Away_Team", "CREATE INDEX IF NOT EXISTS Match_Away_Team ON Match(Away_Team_Id)"),
+          ("Player_Team", "CREATE INDEX IF NOT EXISTS Player_Team ON Player(Team_Id)"),
+          ("Player_Tall_Team", "CREATE INDEX IF NOT EXISTS Player_Tall_Team ON Player(Team_Id) WHERE Height>190"),
+          ("Scored_Match", "CREATE INDEX IF NOT EXISTS Scored_Match ON Scored(Match_Id, Goals)"),
+          ("Took_Place_Stadium", "CREATE INDEX IF NOT EXISTS Took_Place_Stadium ON Took_Place(Stadium_Id, Spectators)"),
+
+          # goals scored in each stadium, kept up to date by the triggers below instead of aggregating
+          # Goals_In_Stadium on every read. Matches counts the Took_Place rows of the stadium
+          ("Stadium_Goals", "CREATE TABLE IF NOT EXISTS Stadium_Goals("
+                            "Stadium_Id INTEGER PRIMARY KEY REFERENCES Stadium "
+                            "ON DELETE CASCADE,"
+                            "Matches INTEGER NOT NULL DEFAULT 0,"
+                            "Goals INTEGER NOT NULL DEFAULT 0)"),
+          ("Stadium_Goals_Attractiveness", "CREATE INDEX IF NOT EXISTS Stadium_Goals_Attractiveness "
+                                           "ON Stadium_Goals(Goals DESC, Stadium_Id) WHERE Matches>0"),
+          ("Stadium_Goals rows", "INSERT INTO Stadium_Goals "
+                                 "SELECT St.Stadium_Id, "
+                                 "(SELECT COUNT(*) FROM Took_Place T WHERE T.Stadium_Id=St.Stadium_Id), "
+                                 "(SELECT COALESCE(SUM(S.Goals), 0) FROM Took_Place T "
+                                 "JOIN Scored S ON S.Match_Id=T.Match_Id WHERE T.Stadium_Id=St.Stadium_Id) "
+                                 "FROM Stadium St "
+                                 "ON CONFLICT DO NOTHING"),
+          ("Stadium_Goals_On_Stadium()", "CREATE OR REPLACE FUNCTION Stadium_Goals_On_Stadium() RETURNS TRIGGER AS $$ "
+                                         "BEGIN "
+                                         "INSERT INTO Stadium_Goals(Stadium_Id) VALUES(NEW.Stadium_Id); "
+                                         "RETURN NULL; "
+                                         "END; $$ LANGUAGE plpgsql"),
+          ("Stadium_Goals_On_Stadium", "DROP TRIGGER IF EXISTS Stadium_Goals_On_Stadium ON Stadium; "
+                                       "CREATE TRIGGER Stadium_Goals_On_Stadium AFTER INSERT ON Stadium "
+                                       "FOR EACH ROW EXECUTE PROCEDURE Stadium_Goals_On_Stadium()"),
+          # a match moving in or out of a stadium brings all of its goals along
+          ("Stadium_Goals_On_Took_Place()",
+           "CREATE OR REPLACE FUNCTION Stadium_Goals_On_Took_Place() RETURNS TRIGGER AS $$ "
+           "BEGIN "
+           "IF TG_OP IN ('DELETE', 'UPDATE') THEN "
+           "UPDATE Stadium_Goals SET Matches=Matches-1, "
+           "Goals=Goals-(SELECT COALESCE(SUM(S.Goals), 0) FROM Scored S WHERE S.Match_Id=OLD.Match_Id) "
+           "WHERE Stadium_Id=OLD.Stadium_Id; "
+           "END IF; "
+           "IF TG_OP IN ('INSERT', 'UPDATE') THEN "
+           "UPDATE Stadium_Goals SET Matches=Matches+1, "
+           "Goals=Goals+(SELECT COALESCE(SUM(S.Goals), 0) FROM Scored S WHERE S.Match_Id=NEW.Match_Id) "
+           "WHERE Stadium_Id=NEW.Stadium_Id; "
+           "END IF; "
+           "RETURN NULL; "
+           "END; $$ LANGUAGE plpgsql"),
+          ("Stadium_Goals_On_Took_Place", "DROP TRIGGER IF EXISTS Stadium_Goals_On_Took_Place ON Took_Place; "
+                                          "CREATE TRIGGER Stadium_Goals_On_Took_Place "
+                                          "AFTER INSERT OR UPDATE OR DELETE ON Took_Place "
+                                          "FOR EACH ROW EXECUTE PROCEDURE Stadium_Goals_On_Took_Place()"),
+          # goals count in every stadium their match took place in, deleting a match or a player cascades
+          # here and to Took_Place, whichever goes first the other one finds nothing left to subtract
+          ("Stadium_Goals_On_Scored()", "CREATE OR REPLACE FUNCTION Stadium_Goals_On_Scored() RETURNS TRIGGER AS $$ "
+                                        "BEGIN "
+                                        "IF TG_OP IN ('DELETE', 'UPDATE') THEN "
+                                        "UPDATE Stadium_Goals G SET Goals=G.Goals-OLD.Goals FROM Took_Place T "
+                                        "WHERE T.Match_Id=OLD.Match_Id AND G.Stadium_Id=T.Stadium_Id; "
+                                        "END IF; "
+                                        "IF TG_OP IN ('INSERT', 'UPDATE') THEN "
+                                        "UPDATE Stadium_Goals G SET Goals=G.Goals+NEW.Goals FROM Took_Place T "
+                                        "WHERE T.Match_Id=NEW.Match_Id AND G.Stadium_Id=T.Stadium_Id; "
+                                        "END IF; "
+                                        "RETURN NULL; "
+                                        "END; $$ LANGUAGE plpgsql"),
+          ("Stadium_Goals_On_Scored", "DROP TRIGGER IF EXISTS Stadium_Goals_On_Scored ON Scored; "
+                                      "CREATE TRIGGER Stadium_Goals_On_Scored AFTER INSERT OR UPDATE OR DELETE ON Scored "
+                                      "FOR EACH ROW EXECUTE PROCEDURE Stadium_Goals_On_Scored()"),
+
+          # goals scored in each match, kept up to date by the triggers below so winner checks and scorelines
+          # read one row by primary key. A deleted match takes its row along, the cascaded Scored deletes
+          # then find nothing left to update
+          ("Match_Goal_Totals", "CREATE TABLE IF NOT EXISTS Match_Goal_Totals("
+                                "Match_Id INTEGER PRIMARY KEY REFERENCES Match "
+                                "ON DELETE CASCADE,"
+                                "Goals INTEGER NOT NULL DEFAULT 0)"),
+          # fills the totals of matches that existed before the table, a no-op on a new schema
+          ("Match_Goal_Totals rows", "INSERT INTO Match_Goal_Totals "
+                                     "SELECT M.Match_Id, "
+                                     "(SELECT COALESCE(SUM(S.Goals), 0) FROM Scored S WHERE S.Match_Id=M.Match_Id) "
+                                     "FROM Match M "
+                                     "ON CONFLICT DO NOTHING"),
+          ("Match_Goal_Totals_On_Match()", "CREATE OR REPLACE FUNCTION Match_Goal_Totals_On_Match() "
+                                           "RETURNS TRIGGER AS $$ "
+                                           "BEGIN "
+                                           "INSERT INTO Match_Goal_Totals(Match_Id) VALUES(NEW.Match_Id); "
+                                           "RETURN NULL; "
+                                           "END; $$ LANGUAGE plpgsql"),
+          ("Match_Goal_Totals_On_Match", "DROP TRIGGER IF EXISTS Match_Goal_Totals_On_Match ON Match; "
+                                         "CREATE TRIGGER Match_Goal_Totals_On_Match AFTER INSERT ON Match "
+                                         "FOR EACH ROW EXECUTE PROCEDURE Match_Goal_Totals_On_Match()"),
+          ("Match_Goal_Totals_On_Scored()", "CREATE OR REPLACE FUNCTION Match_Goal_Totals_On_Scored() "
+                                            "RETURNS TRIGGER AS $$ "
+                                            "BEGIN "
+                                            "IF TG_OP IN ('DELETE', 'UPDATE') THEN "
+                                            "UPDATE Match_Goal_Totals SET Goals=Goals-OLD.Goals "
+                                            "WHERE Match_Id=OLD.Match_Id; "
+                                            "END IF; "
+                                            "IF TG_OP IN ('INSERT', 'UPDATE') THEN "
+                                            "UPDATE Match_Goal_Totals SET Goals=Goals+NEW.Goals "
+                                            "WHERE Match_Id=NEW.Match_Id; "
+                                            "END IF; "
+                                            "RETURN NULL; "
+                                            "END; $$ LANGUAGE plpgsql"),
+          ("Match_Goal_Totals_On_Scored", "DROP TRIGGER IF EXISTS Match_Goal_Totals_On_Scored ON Scored; "
+                                          "CREATE TRIGGER Match_Goal_Totals_On_Scored "
+                                          "AFTER INSERT OR UPDATE OR DELETE ON Scored "
+                                          "FOR EACH ROW EXECUTE PROCEDURE Match_Goal_Totals_On_Scored()"),
+
+          # goals of each player over all matches, kept up to date by the triggers below so mostGoalsForTeam
+          # is a top 5 scan of Player_Goal_Totals_Top. Team_Id follows the player's team, a deleted player
+          # takes its row along
+          ("Player_Goal_Totals", "CREATE TABLE IF NOT EXISTS Player_Goal_Totals("
+                                 "Player_Id INTEGER PRIMARY KEY REFERENCES Player "
+                                 "ON DELETE CASCADE,"
+                                 "Team_Id INTEGER NOT NULL,"
+                                 "Total INTEGER NOT NULL DEFAULT 0)"),
+          ("Player_Goal_Totals_Top", "CREATE INDEX IF NOT EXISTS Player_Goal_Totals_Top "
+                                     "ON Player_Goal_Totals(Team_Id, Total DESC, Player_Id DESC)"),
+          # fills the totals of players that existed before the table, a no-op on a new schema
+          ("Player_Goal_Totals rows", "INSERT INTO Player_Goal_Totals "
+                                      "SELECT P.Player_Id, P.Team_Id, "
+                                      "(SELECT COALESCE(SUM(S.Goals), 0) FROM Scored S "
+                                      "WHERE S.Player_Id=P.Player_Id) "
+                                      "FROM Player P "
+                                      "ON CONFLICT DO NOTHING"),
+          ("Player_Goal_Totals_On_Player()", "CREATE OR REPLACE FUNCTION Player_Goal_Totals_On_Player() "
+                                             "RETURNS TRIGGER AS $$ "
+                                             "BEGIN "
+                                             "IF TG_OP='INSERT' THEN "
+                                             "INSERT INTO Player_Goal_Totals(Player_Id, Team_Id) "
+                                             "VALUES(NEW.Player_Id, NEW.Team_Id); "
+                                             "ELSE "
+                                             "UPDATE Player_Goal_Totals SET Team_Id=NEW.Team_Id "
+                                             "WHERE Player_Id=NEW.Player_Id; "
+                                             "END IF; "
+                                             "RETURN NULL; "
+                                             "END; $$ LANGUAGE plpgsql"),
+          ("Player_Goal_Totals_On_Player", "DROP TRIGGER IF EXISTS Player_Goal_Totals_On_Player ON Player; "
+                                           "CREATE TRIGGER Player_Goal_Totals_On_Player "
+                                           "AFTER INSERT OR UPDATE OF Team_Id ON Player "
+                                           "FOR EACH ROW EXECUTE PROCEDURE Player_Goal_Totals_On_Player()"),
+          ("Player_Goal_Totals_On_Scored()", "CREATE OR REPLACE FUNCTION Player_Goal_Totals_On_Scored() "
+                                             "RETURNS TRIGGER AS $$ "
+                                             "BEGIN "
+                                             "IF TG_OP IN ('DELETE', 'UPDATE') THEN "
+                                             "UPDATE Player_Goal_Totals SET Total=Total-OLD.Goals "
+                                             "WHERE Player_Id=OLD.Player_Id; "
+                                             "END IF; "
+                                             "IF TG_OP IN ('INSERT', 'UPDATE') THEN "
+                                             "UPDATE Player_Goal_Totals SET Total=Total+NEW.Goals "
+                                             "WHERE Player_Id=NEW.Player_Id; "
+                                             "END IF; "
+                                             "RETURN NULL; "
+                                             "END; $$ LANGUAGE plpgsql"),
+          ("Player_Goal_Totals_On_Scored", "DROP TRIGGER IF EXISTS Player_Goal_Totals_On_Scored ON Scored; "
+                                           "CREATE TRIGGER Player_Goal_Totals_On_Scored "
+                                           "AFTER INSERT OR UPDATE OR DELETE ON Scored "
+                                           "FOR EACH ROW EXECUTE PROCEDURE Player_Goal_Totals_On_Scored()"),
+
+          # home and away matches of each team and the attendance of its home matches, kept up to date by the
+          # triggers below so popularTeams reads ten rows of an index. Attended counts the Took_Place rows of the
+          # home matches and Min_Attendance is their lowest Spectators, NULL while there are none
+          ("Team_Popularity", "CREATE TABLE IF NOT EXISTS Team_Popularity("
+                              "Team_Id INTEGER PRIMARY KEY REFERENCES Team(Team_Id) "
+                              "ON DELETE CASCADE,"
+                              "Home_Matches INTEGER NOT NULL DEFAULT 0,"
+                              "Away_Matches INTEGER NOT NULL DEFAULT 0,"
+                              "Attended INTEGER NOT NULL DEFAULT 0,"
+                              "Min_Attendance INTEGER)"),
+          ("Team_Popularity_Popular", "CREATE INDEX IF NOT EXISTS Team_Popularity_Popular "
+                                      "ON Team_Popularity(Team_Id DESC) "
+                                      "WHERE (Attended>0 AND Min_Attendance>40000) "
+                                      "OR (Home_Matches=0 AND Away_Matches>0)"),
+          # fills the summary of teams that existed before it, a no-op on a new schema
+          ("Team_Popularity rows", "INSERT INTO Team_Popularity "
+                                   "SELECT T.Team_Id, "
+                                   "(SELECT COUNT(*) FROM Match M WHERE M.Home_Team_Id=T.Team_Id), "
+                                   "(SELECT COUNT(*) FROM Match M WHERE M.Away_Team_Id=T.Team_Id), "
+                                   "(SELECT COUNT(*) FROM Match M JOIN Took_Place P ON P.Match_Id=M.Match_Id "
+                                   "WHERE M.Home_Team_Id=T.Team_Id), "
+                                   "(SELECT MIN(P.Spectators) FROM Match M JOIN Took_Place P "
+                                   "ON P.Match_Id=M.Match_Id WHERE M.Home_Team_Id=T.Team_Id) "
+                                   "FROM Team T WHERE T.Team_Id IS NOT NULL "
+                                   "ON CONFLICT DO NOTHING"),
+          # recounts the attendance of the home matches of one team, for deletes that may remove its minimum
+          ("Team_Popularity_Refresh()", "CREATE OR REPLACE FUNCTION Team_Popularity_Refresh(Refreshed INTEGER) "
+                                        "RETURNS VOID AS $$ "
+                                        "UPDATE Team_Popularity SET (Attended, Min_Attendance)="
+                                        "(SELECT COUNT(*), MIN(P.Spectators) FROM Match M JOIN Took_Place P "
+                                        "ON P.Match_Id=M.Match_Id WHERE M.Home_Team_Id=Refreshed) "
+                                        "WHERE Team_Id=Refreshed "
+                                        "$$ LANGUAGE sql"),
+          ("Team_Popularity_On_Team()", "CREATE OR REPLACE FUNCTION Team_Popularity_On_Team() RETURNS TRIGGER AS $$ "
+                                        "BEGIN "
+                                        "IF NEW.Team_Id IS NOT NULL THEN "
+                                        "INSERT INTO Team_Popularity(Team_Id) VALUES(NEW.Team_Id); "
+                                        "END IF; "
+                                        "RETURN NULL; "
+                                        "END; $$ LANGUAGE plpgsql"),
+          ("Team_Popularity_On_Team", "DROP TRIGGER IF EXISTS Team_Popularity_On_Team ON Team; "
+                                      "CREATE TRIGGER Team_Popularity_On_Team AFTER INSERT ON Team "
+                                      "FOR EACH ROW EXECUTE PROCEDURE Team_Popularity_On_Team()"),
+          # the deleted match is not visible anymore, so the refresh leaves its Took_Place rows out whether
+          # their cascade ran already or not, and the Took_Place trigger skips the rows of a match that is gone
+          ("Team_Popularity_On_Match()", "CREATE OR REPLACE FUNCTION Team_Popularity_On_Match() RETURNS TRIGGER AS $$ "
+                                         "BEGIN "
+                                         "IF TG_OP IN ('DELETE', 'UPDATE') THEN "
+                                         "UPDATE Team_Popularity SET Home_Matches=Home_Matches-1 "
+                                         "WHERE Team_Id=OLD.Home_Team_Id; "
+                                         "UPDATE Team_Popularity SET Away_Matches=Away_Matches-1 "
+                                         "WHERE Team_Id=OLD.Away_Team_Id; "
+                                         "END IF; "
+                                         "IF TG_OP IN ('INSERT', 'UPDATE') THEN "
+                                         "UPDATE Team_Popularity SET Home_Matches=Home_Matches+1 "
+                                         "WHERE Team_Id=NEW.Home_Team_Id; "
+                                         "UPDATE Team_Popularity SET Away_Matches=Away_Matches+1 "
+                                         "WHERE Team_Id=NEW.Away_Team_Id; "
+                                         "END IF; "
+                                         "IF TG_OP='DELETE' THEN "
+                                         "PERFORM Team_Popularity_Refresh(OLD.Home_Team_Id); "
+                                         "ELSIF TG_OP='UPDATE' THEN "
+                                         "PERFORM Team_Popularity_Refresh(OLD.Home_Team_Id); "
+                                         "PERFORM Team_Popularity_Refresh(NEW.Home_Team_Id); "
+                                         "END IF; "
+                                         "RETURN NULL; "
+                                         "END; $$ LANGUAGE plpgsql"),
+          ("Team_Popularity_On_Match", "DROP TRIGGER IF EXISTS Team_Popularity_On_Match ON Match; "
+                                       "CREATE TRIGGER Team_Popularity_On_Match AFTER INSERT OR UPDATE OR DELETE ON Match "
+                                       "FOR EACH ROW EXECUTE PROCEDURE Team_Popularity_On_Match()"),
+          ("Team_Popularity_On_Took_Place()",
+           "CREATE OR REPLACE FUNCTION Team_Popularity_On_Took_Place() RETURNS TRIGGER AS $$ "
+           "DECLARE "
+           "Home INTEGER; "
+           "BEGIN "
+           "IF TG_OP='UPDATE' THEN "
+           "PERFORM Team_Popularity_Refresh(M.Home_Team_Id) FROM Match M "
+           "WHERE M.Match_Id IN (OLD.Match_Id, NEW.Match_Id); "
+           "RETURN NULL; "
+           "END IF; "
+           "IF TG_OP='DELETE' THEN "
+           "SELECT Home_Team_Id INTO Home FROM Match WHERE Match_Id=OLD.Match_Id; "
+           "IF FOUND THEN "
+           "UPDATE Team_Popularity SET Attended=Attended-1 WHERE Team_Id=Home; "
+           "IF EXISTS(SELECT 1 FROM Team_Popularity WHERE Team_Id=Home "
+           "AND Min_Attendance>=OLD.Spectators) THEN "
+           "PERFORM Team_Popularity_Refresh(Home); "
+           "END IF; "
+           "END IF; "
+           "ELSE "
+           "SELECT Home_Team_Id INTO Home FROM Match WHERE Match_Id=NEW.Match_Id; "
+           "UPDATE Team_Popularity SET Attended=Attended+1, "
+           "Min_Attendance=LEAST(Min_Attendance, NEW.Spectators) "
+           "WHERE Team_Id=Home; "
+           "END IF; "
+           "RETURN NULL; "
+           "END; $$ LANGUAGE plpgsql"),
+          ("Team_Popularity_On_Took_Place", "DROP TRIGGER IF EXISTS Team_Popularity_On_Took_Place ON Took_Place; "
+                                            "CREATE TRIGGER Team_Popularity_On_Took_Place "
+                                            "AFTER INSERT OR UPDATE OR DELETE ON Took_Place "
+                                            "FOR EACH ROW EXECUTE PROCEDURE Team_Popularity_On_Took_Place()"),
+
+          ("Goals_In_Stadium", "CREATE OR REPLACE VIEW Goals_In_Stadium AS "
+                               "SELECT Player_Id, Stadium_Id, Goals "
+                               "FROM Took_Place LEFT OUTER JOIN Scored "
+                               "ON Took_Place.Match_Id=Scored.Match_Id"),
+          ("Active_Teams", "CREATE OR REPLACE VIEW Active_Teams AS "
+                           "SELECT Home_Team_Id FROM Match "
+                           "UNION "
+                           "SELECT Away_Team_Id FROM Match"),
+          ("Home_Teams_Stadiums", "CREATE OR REPLACE VIEW Home_Teams_Stadiums AS "
+                                  "SELECT M.Home_Team_Id, T.Spectators ,T.Stadium_Id "
+                                  "FROM Match M, Took_Place T "
+                                  "WHERE M.Match_Id=T.Match_Id"),
+          ("Player_Join_Scored", "CREATE OR REPLACE VIEW Player_Join_Scored AS "
+                                 "SELECT Team_Id, Player_Id, Match_Id, goals "
+                                 "FROM Player NATURAL JOIN Scored"),
+          ("Player_Left_Join_Scored", "CREATE OR REPLACE VIEW Player_Left_Join_Scored AS "
+                                      "SELECT Team_Id, P.Player_Id, Match_Id, COALESCE(goals, 0) "
+                                      "FROM Player P LEFT OUTER JOIN Scored S "
+                                      "ON P.Player_Id=S.Player_Id"),
+          # the same rows and columns as the aggregate it used to be
+          ("Player_Overall_Scored", "CREATE OR REPLACE VIEW Player_Overall_Scored AS "
+                                    "SELECT Player_Id, Team_Id, Total::BIGINT AS sum "
+                                    "FROM Player_Goal_Totals"),
+          ("Team_Scored_On_Match", "CREATE OR REPLACE VIEW Team_Scored_On_Match AS "
+                                   "SELECT Team_Id, Match_Id, SUM(goals) "
+                                   "FROM Player_Join_Scored "
+                                   "GROUP BY Team_Id, Match_Id"),
+          # the same rows and columns as the aggregate it used to be, matches nobody scored in are left out
+          ("Goals_In_Match", "CREATE OR REPLACE VIEW Goals_In_Match AS "
+                             "SELECT Match_Id, Goals::BIGINT AS sum "
+                             "FROM Match_Goal_Totals WHERE Goals>0"),
+          ("Goals_In_Match_Join_Scored", "CREATE OR REPLACE VIEW Goals_In_Match_Join_Scored AS "
+                                         "SELECT * "
+                                         "FROM Scored NATURAL JOIN Goals_In_Match"),
+          ("Active_Tall_Teams", "CREATE OR REPLACE VIEW Active_Tall_Teams AS "
+                                "SELECT P.Team_Id "
+                                "FROM PLAYER P, ACTIVE_TEAMS T "
+                                "WHERE P.TEAM_Id=T.Home_Team_Id AND P.Height>190 "
+                                "GROUP BY P.Team_Id "
+                                "HAVING COUNT(P.Player_Id)>=2")]
+
+# every UPDATE or DELETE statement on these tables NOTIFYs CHANGES_CHANNEL once, with the key columns of the rows
+# it changed, as {"table": "player", "op": "DELETE", "keys": [{"player_id": 1}, ...]}, and a TRUNCATE with
+# {"table": ..., "op": "TRUNCATE"}. A statement changing more than NOTIFY_KEY_LIMIT rows is sent without "keys", the
+# payload of a NOTIFY is limited to 8000 bytes. Processes sharing the database listen to it to invalidate their
+# caches, see listenForChanges.
+# INSERTs are not notified, a new row can't make a cache stale, so bulk loads (COPY in bulkInsert, loadLeague) pay
+# nothing for it. Updates and deletes pay one scan of the transition tables and one pg_notify per statement, whether
+# anybody listens or not, where the former per-row triggers paid a JSON payload and a pg_notify for every row
+CHANGES_CHANNEL = "wet2_changes"
+NOTIFY_KEY_LIMIT = 100
+CHANGE_KEYS = [("Team", ["team_id"]), ("Match", ["match_id"]), ("Player", ["player_id"]),
+               ("Stadium", ["stadium_id"]), ("Scored", ["player_id", "match_id"]),
+               ("Took_Place", ["match_id", "stadium_id"])]
+
+SCHEMA += [("Change_Keys()", "CREATE OR REPLACE FUNCTION Change_Keys(Changed JSONB, Key_Names TEXT[]) "
+                             "RETURNS JSONB AS $$ "
+                             "SELECT jsonb_object_agg(K, Changed->K) FROM unnest(Key_Names) K "
+                             "$$ LANGUAGE sql IMMUTABLE"),
+           # statement level, an UPDATE reports the old and the new keys of its rows
+           ("Notify_Change()", "CREATE OR REPLACE FUNCTION Notify_Change() RETURNS TRIGGER AS $$ "
+                               "DECLARE Keys JSONB; "
+                               "BEGIN "
+                               "IF TG_OP='DELETE' THEN "
+                               "SELECT jsonb_agg(K) INTO Keys FROM "
+                               "(SELECT DISTINCT Change_Keys(to_jsonb(R), TG_ARGV) K FROM Old_Rows R "
+                               "LIMIT " + str(NOTIFY_KEY_LIMIT + 1) + ") C; "
+                               "ELSIF TG_OP='UPDATE' THEN "
+                               "SELECT jsonb_agg(K) INTO Keys FROM "
+                               "(SELECT Change_Keys(to_jsonb(R), TG_ARGV) K FROM Old_Rows R "
+                               "UNION SELECT Change_Keys(to_jsonb(R), TG_ARGV) FROM New_Rows R "
+                               "LIMIT " + str(NOTIFY_KEY_LIMIT + 1) + ") C; "
+                               "END IF; "
+                               "IF TG_OP='TRUNCATE' OR jsonb_array_length(Keys)>" + str(NOTIFY_KEY_LIMIT) + " THEN "
+                               "PERFORM pg_notify('" + CHANGES_CHANNEL + "', "
+                               "json_build_object('table', TG_TABLE_NAME, 'op', TG_OP)::TEXT); "
+                               "ELSIF Keys IS NOT NULL THEN "
+                               "PERFORM pg_notify('" + CHANGES_CHANNEL + "', "
+                               "json_build_object('table', TG_TABLE_NAME, 'op', TG_OP, 'keys', Keys)::TEXT); "
+                               "END IF; "
+                               "RETURN NULL; "
+                               "END; $$ LANGUAGE plpgsql")]
+for table, keys in CHANGE_KEYS:
+    arguments = "(" + ", ".join(keys) + ")"
+    # a trigger with transition tables can only fire on one event, Notify_<table> is the former per-row trigger
+    SCHEMA += [("Notify_" + table, "DROP TRIGGER IF EXISTS Notify_" + table + " ON " + table + "; "
+                                   "DROP TRIGGER IF EXISTS Notify_" + table + "_Update ON " + table + "; "
+                                   "CREATE TRIGGER Notify_" + table + "_Update AFTER UPDATE ON " + table +
+                                   " REFERENCING OLD TABLE AS Old_Rows NEW TABLE AS New_Rows"
+                                   " FOR EACH STATEMENT EXECUTE PROCEDURE Notify_Change" + arguments + "; "
+                                   "DROP TRIGGER IF EXISTS Notify_" + table + "_Delete ON " + table + "; "
+                                   "CREATE TRIGGER Notify_" + table + "_Delete AFTER DELETE ON " + table +
+                                   " REFERENCING OLD TABLE AS Old_Rows"
+                                   " FOR EACH STATEMENT EXECUTE PROCEDURE Notify_Change" + arguments),
+               ("Notify_" + table + "_Truncate", "DROP TRIGGER IF EXISTS Notify_" + table + "_Truncate ON " + table +
+                                                 "; CREATE TRIGGER Notify_" + table + "_Truncate AFTER TRUNCATE ON " +
+                                                 table + " FOR EACH STATEMENT EXECUTE PROCEDURE Notify_Change()")]
+
+# serializes concurrent bootstraps, IF NOT EXISTS alone races between two sessions creating the same object
+SCHEMA_LOCK = "SELECT pg_advisory_xact_lock(236363)"
+
+
+def createTables(profile: bool = False) -> Dict[str, float]:
+    """
+    Creates every object of SCHEMA in one transaction on one connection, objects that exist already are kept,
+    so running it on an existing schema is safe. Nothing is created if any statement fails
+    :param profile: run the statements one by one and time each of them, instead of sending the whole
+    schema in a single round trip
+    :return: seconds spent on each object when profiling, otherwise only the total under "Schema"
+    """
+    conn, timings = None, {}
     try:
         conn = Connector.DBConnector()
-        conn.execute(schema)
-    except DatabaseException.ConnectionInvalid as e:
-        print(e)
-    except DatabaseException.NOT_NULL_VIOLATION as e:
-        print(e)
-    except DatabaseException.CHECK_VIOLATION as e:
-        print(e)
-    except DatabaseException.UNIQUE_VIOLATION as e:
-        print(e)
-    except DatabaseException.FOREIGN_KEY_VIOLATION as e:
-        print(e)
+        with conn.transaction():
+            conn.execute(SCHEMA_LOCK)
+            start = time.perf_counter()
+            if profile:
+                for name, schema in SCHEMA:
+                    before = time.perf_counter()
+                    conn.execute(schema)
+                    timings[name] = time.perf_counter() - before
+            else:
+                conn.execute(";\n".join(schema for _, schema in SCHEMA))
+            timings["Schema"] = time.perf_counter() - start
     except Exception as e:
         print(e)
+        timings = {}
     finally:
-        conn.close()
+        if conn is not None:
+            conn.close()
+        return timings
+
+
+# the tables and functions of SCHEMA, TRUNCATE takes all of the tables at once
+TABLES = [name for name, schema in SCHEMA if schema.startswith("CREATE TABLE")]
+FUNCTIONS = [name[:-2] for name, schema in SCHEMA if name.endswith("()")]
 
 
 def clearTables():
-    conn = Connector.DBConnector()
-    tables_names = sql.SQL("SELECT TABLE_NAME FROM INFORMATION_SCHEMA.TABLES "
-                           "WHERE TABLE_TYPE={} AND TABLE_SCHEMA={}").format(sql.Literal('BASE TABLE'),
-                                                                             sql.Literal('public'))
-    result = conn.execute(tables_names)
-    for name in result[1].rows:
-        clear_table_query = sql.SQL("DELETE FROM {} CASCADE ").format(sql.Identifier(name[0]))
-        conn.execute(clear_table_query)
-    conn.close()
+    # one TRUNCATE empties every table without scanning or logging the rows one by one, tables that don't exist
+    # (before createTables or after dropTables) are skipped
+    conn = None
+    try:
+        conn = Connector.DBConnector()
+        with conn.transaction():
+            _, result = conn.execute("SELECT tablename FROM pg_catalog.pg_tables "
+                                     "WHERE schemaname='public' AND tablename=ANY(%s)",
+                                     params=([name.lower() for name in TABLES],))
+            if result.size() > 0:
+                conn.execute(sql.SQL("TRUNCATE {} RESTART IDENTITY CASCADE").format(
+                    sql.SQL(", ").join(sql.Identifier(row[0]) for row in result.rows)))
+    finally:
+        clearProfileCaches()
+        if conn is not None:
+            conn.close()
 
 
 def dropTables():
-    conn = Connector.DBConnector()
-    # conn.execute("DROP VIEW Active_Teams")
-    # conn.execute("DROP VIEW Goals_In_Stadium")
-    tables_names = sql.SQL("SELECT TABLE_NAME FROM INFORMATION_SCHEMA.TABLES "
-                    "WHERE TABLE_TYPE={} AND TABLE_SCHEMA={}").format(sql.Literal('BASE TABLE'), sql.Literal('public'))
-    result = conn.execute(tables_names)
-    for name in result[1].rows:
-        drop_table_query = sql.SQL("DROP TABLE IF EXISTS {} CASCADE").format(sql.Identifier(name[0]))
-        conn.execute(drop_table_query)
-    conn.close()
+    # every base table in the catalog, not only those of SCHEMA, so leftovers of older schemas go as well,
+    # dropped by a single statement in the same transaction. Views, indexes and triggers go with the tables,
+    # the trigger and helper functions of SCHEMA are dropped by name, with every signature they were created with
+    conn = None
+    try:
+        conn = Connector.DBConnector()
+        with conn.transaction():
+            _, result = conn.execute("SELECT tablename FROM pg_catalog.pg_tables WHERE schemaname='public'")
+            if result.size() > 0:
+                conn.execute(sql.SQL("DROP TABLE IF EXISTS {} CASCADE").format(
+                    sql.SQL(", ").join(sql.Identifier(row[0]) for row in result.rows)))
+            _, result = conn.execute("SELECT P.oid::regprocedure::TEXT FROM pg_catalog.pg_proc P "
+                                     "JOIN pg_catalog.pg_namespace N ON N.oid=P.pronamespace "
+                                     "WHERE N.nspname='public' AND P.proname=ANY(%s)",
+                                     params=([name.lower() for name in FUNCTIONS],))
+            if result.size() > 0:
+                conn.execute("DROP FUNCTION IF EXISTS " + ", ".join(row[0] for row in result.rows) + " CASCADE")
+    finally:
+        clearProfileCaches()
+        if conn is not None:
+            conn.close()
+
+
+# every exception DBConnector raises: the nested DatabaseException classes, which don't derive from
+# DatabaseException itself, and the psycopg2 errors it doesn't map
+DATABASE_ERRORS = (DatabaseException, DatabaseException.ConnectionInvalid, DatabaseException.NOT_NULL_VIOLATION,
+                   DatabaseException.FOREIGN_KEY_VIOLATION, DatabaseException.UNIQUE_VIOLATION,
+                   DatabaseException.CHECK_VIOLATION, DatabaseException.database_ini_ERROR,
+                   DatabaseException.UNKNOWN_ERROR, psycopg2.Error)
+
+
+def bulkInsert(table: str, columns: List[str], rows: list, valid: str, references: str,
+               keys: List[str], texts: List[str] = ()) -> List[ReturnValue]:
+    """
+    Streams rows into a staging table with COPY and inserts the acceptable ones with a single INSERT
+    :param table: target table
+    :param columns: target columns, in the order of the values of each row
+    :param rows: list of tuples
+    :param valid: condition over the staging row S mirroring the NOT NULL and CHECK constraints of table
+    :param references: condition over the staging row S mirroring the foreign keys of table
+    :param keys: unique columns of table
+    :param texts: VARCHAR columns of table, staged as unbounded TEXT so an over-long value fails its own row in
+                  valid instead of the whole COPY
+    :return: Return value of each row, the same as adding the rows one by one in the given order
+    """
+    if len(rows) == 0:
+        return []
+    ret_values, conn = [ReturnValue.ERROR] * len(rows), None
+    staging = "Staging_" + table
+    column_list = ", ".join(columns)
+    staged_list = ", ".join(column + "::TEXT AS " + column if column in texts else column for column in columns)
+    try:
+        conn = Connector.DBConnector()
+        # one transaction for the whole batch, the staging table is dropped when it ends
+        with conn.transaction():
+            conn.execute("CREATE TEMP TABLE " + staging + " ON COMMIT DROP AS "
+                         "SELECT 0 AS Row_No, " + staged_list + " FROM " + table + " WITH NO DATA")
+            conn.copy(staging, ["Row_No"] + columns, ((row_no,) + tuple(row) for row_no, row in enumerate(rows)))
+            key_flags = "".join(", S.{0}, EXISTS(SELECT 1 FROM {1} T WHERE T.{0}=S.{0})".format(key, table)
+                                for key in keys)
+            _, flags = conn.execute("SELECT Row_No, COALESCE(" + valid + ", FALSE), "
+                                    "COALESCE(" + references + ", FALSE)" + key_flags + " "
+                                    "FROM " + staging + " S ORDER BY Row_No")
+
+            # unique violations depend on the rows inserted before, so the verdicts are given in input order
+            results, accepted, seen = [], [], [set() for _ in keys]
+            for flag in flags.rows:
+                row_no, is_valid, is_referenced = flag[0], flag[1], flag[2]
+                key_values = [(flag[3 + 2 * i], flag[4 + 2 * i]) for i in range(len(keys))]
+                if not is_valid:
+                    results.append(ReturnValue.BAD_PARAMS)
+                elif any(value is not None and (exists or value in seen[i])
+                         for i, (value, exists) in enumerate(key_values)):
+                    results.append(ReturnValue.ALREADY_EXISTS)
+                elif not is_referenced:
+                    results.append(ReturnValue.BAD_PARAMS)
+                else:
+                    results.append(ReturnValue.OK)
+                    accepted.append(row_no)
+                    for i, (value, _) in enumerate(key_values):
+                        seen[i].add(value)
+
+            if len(accepted) > 0:
+                conn.execute("INSERT INTO " + table + "(" + column_list + ") "
+                             "SELECT " + column_list + " FROM " + staging + " WHERE Row_No = ANY(%s)",
+                             params=(accepted,))
+            # dropped here as well, a connection pinned for tests never really commits
+            conn.execute("DROP TABLE " + staging)
+        ret_values = results
+    except DATABASE_ERRORS:
+        ret_values = [ReturnValue.ERROR] * len(rows)
+    finally:
+        if conn is not None:
+            conn.close()
+    return ret_values
+
+
+# write-through caches in front of the profile getters, keyed by ID and holding the fields of the profile as a tuple.
+# add* fills them, delete* and the functions emptying tables invalidate them
+MATCH_CACHE = LRUCache()
+PLAYER_CACHE = LRUCache()
+STADIUM_CACHE = LRUCache()
+PROFILE_CACHES = {"Match": MATCH_CACHE, "Player": PLAYER_CACHE, "Stadium": STADIUM_CACHE}
+
+
+def configureProfileCaches(maxSize: int = 4096, ttl: float = None):
+    """
+    Sets the size and the time to live of the three profile caches, emptying them and resetting their counters
+    :param maxSize: entries kept in each cache
+    :param ttl: seconds an entry stays valid, None keeps it until it is evicted or invalidated
+    """
+    for cache in PROFILE_CACHES.values():
+        cache.maxSize = maxSize
+        cache.ttl = ttl
+        cache.clear()
+        cache.resetStats()
+
+
+def profileCacheStats() -> Dict[str, dict]:
+    """
+    :return: hit, miss, eviction and expiration counters and size of each profile cache
+    """
+    return {name: cache.stats() for name, cache in PROFILE_CACHES.items()}
+
+
+def clearProfileCaches():
+    for cache in PROFILE_CACHES.values():
+        cache.clear()
+
+
+def invalidateTeam(teamID: int):
+    """
+    Invalidates the cached profiles deleting teamID cascades to: its matches, players and stadium
+    :param teamID: integer
+    """
+    MATCH_CACHE.invalidateWhere(lambda match: teamID in (match[2], match[3]))
+    PLAYER_CACHE.invalidateWhere(lambda player: player[1] == teamID)
+    STADIUM_CACHE.invalidateWhere(lambda stadium: stadium[2] == teamID)
+
+
+# the listener started by listenForChanges
+change_listener = None
+
+
+def listenForChanges(reconnectDelay: float = 1.0):
+    """
+    Starts a background listener invalidating the profile caches on the writes of every process sharing the
+    database, including cascades and TRUNCATE. The caches are emptied whenever notifications may have been missed
+    :param reconnectDelay: seconds to wait before connecting again after the connection was lost
+    :return: ChangeListener instance
+    """
+    global change_listener
+    if change_listener is None:
+        change_listener = Connector.DBConnector.listen(CHANGES_CHANNEL, applyChange, reconnectDelay)
+    return change_listener
+
+
+def stopListeningForChanges():
+    global change_listener
+    if change_listener is not None:
+        change_listener.stop()
+        change_listener = None
+
+
+def applyChange(change: dict):
+    """
+    Invalidates the cache entries a change notification is about
+    :param change: decoded payload of CHANGES_CHANNEL, None when notifications may have been missed
+    """
+    if change is None or change["op"] == "TRUNCATE":
+        clearProfileCaches()
+        return
+    cache = PROFILE_CACHES.get(change["table"].capitalize())
+    if "keys" not in change:
+        # more rows than one notification lists, a team's rows cascade to every cache
+        if cache is not None:
+            cache.clear()
+        elif change["table"] == "team":
+            clearProfileCaches()
+        return
+    for keys in change["keys"]:
+        if cache is not None:
+            cache.invalidate(keys[change["table"] + "_id"])
+        elif change["table"] == "team":
+            invalidateTeam(keys["team_id"])
+
+
+def cacheAdded(cache: LRUCache, rows: list, ret_values: List[ReturnValue]) -> List[ReturnValue]:
+    """
+    Writes the rows a bulk add inserted through to cache
+    :param rows: tuples of the profile fields, the ID first
+    :param ret_values: Return value of each row
+    :return: ret_values
+    """
+    for row, ret_value in zip(rows, ret_values):
+        if ret_value == ReturnValue.OK:
+            cache.put(row[0], row)
+    return ret_values
 
 
 def addTeam(teamID: int) -> ReturnValue:
@@ -176,13 +798,14 @@ def addTeam(teamID: int) -> ReturnValue:
     :param teamID: teamID to be added
     :return: Return value assoicated with the result of the action
     """
+    if teamID is None:
+        # Team_Id is nullable and CHECK passes on NULL, the INSERT would add a team without an ID
+        return ReturnValue.BAD_PARAMS
     ret_value, conn = None, None
     try:
         conn = Connector.DBConnector()
-        add_team_query = sql.SQL("INSERT INTO Team(Team_Id) "
-                                 "VALUES({Team_Id})").format(Team_Id=sql.Literal(teamID))
-        _ = conn.execute(add_team_query)
-        ret_value = ReturnValue.OK
+        rows_effected, _ = conn.executePrepared("add_team", (teamID,))
+        ret_value = ReturnValue.OK if rows_effected == 1 else ReturnValue.ALREADY_EXISTS
     except DatabaseException.ConnectionInvalid:
         ret_value = ReturnValue.ERROR
     except DatabaseException.NOT_NULL_VIOLATION:
@@ -202,6 +825,19 @@ def addTeam(teamID: int) -> ReturnValue:
         return ret_value
 
 
+def addTeams(teamIDs) -> List[ReturnValue]:
+    """
+    Add many Teams to the database in one round of COPY
+    :param teamIDs: iterable of teamIDs to be added
+    :return: Return value assoicated with each teamID, in the given order
+    """
+    return bulkInsert("Team", ["Team_Id"], [(teamID,) for teamID in teamIDs],
+                      # a NULL ID is rejected here, as it is by addTeam
+                      valid="S.Team_Id IS NOT NULL AND S.Team_Id>0",
+                      references="TRUE",
+                      keys=["Team_Id"])
+
+
 def addMatch(match: Match) -> ReturnValue:
     """
     Add Match to the database
@@ -211,12 +847,14 @@ def addMatch(match: Match) -> ReturnValue:
     ret_value, conn = None, None
     try:
         conn = Connector.DBConnector()
-        add_match_query = sql.SQL("INSERT INTO Match(Match_Id, Competition, Home_Team_Id, Away_Team_Id) "
-                                  "VALUES({Match_Id},{Competition},{Home_Team_Id},{Away_Team_Id})").\
-            format(Match_Id=sql.Literal(match.getMatchID()), Competition=sql.Literal(match.getCompetition()),
-                   Home_Team_Id=sql.Literal(match.getHomeTeamID()),  Away_Team_Id=sql.Literal(match.getAwayTeamID()))
-        _ = conn.execute(add_match_query)
-        ret_value = ReturnValue.OK
+        rows_effected, _ = conn.executePrepared("add_match", (match.getMatchID(), match.getCompetition(),
+                                                              match.getHomeTeamID(), match.getAwayTeamID()))
+        if rows_effected == 1:
+            MATCH_CACHE.put(match.getMatchID(), (match.getMatchID(), match.getCompetition(),
+                                                 match.getHomeTeamID(), match.getAwayTeamID()))
+            ret_value = ReturnValue.OK
+        else:
+            ret_value = ReturnValue.ALREADY_EXISTS
     except DatabaseException.ConnectionInvalid:
         ret_value = ReturnValue.ERROR
     except DatabaseException.NOT_NULL_VIOLATION:
@@ -236,24 +874,46 @@ def addMatch(match: Match) -> ReturnValue:
         return ret_value
 
 
+def addMatches(matches) -> List[ReturnValue]:
+    """
+    Add many Matches to the database in one round of COPY
+    :param matches: iterable of match class instances
+    :return: Return value assoicated with each match, in the given order
+    """
+    rows = [(match.getMatchID(), match.getCompetition(), match.getHomeTeamID(), match.getAwayTeamID())
+            for match in matches]
+    return cacheAdded(MATCH_CACHE, rows,
+                      bulkInsert("Match", ["Match_Id", "Competition", "Home_Team_Id", "Away_Team_Id"], rows,
+                                 valid="S.Match_Id IS NOT NULL AND S.Competition IN('International', 'Domestic') "
+                                       "AND S.Home_Team_Id<>S.Away_Team_Id",
+                                 references="S.Home_Team_Id IN(SELECT Team_Id FROM Team) "
+                                            "AND S.Away_Team_Id IN(SELECT Team_Id FROM Team)",
+                                 keys=["Match_Id"],
+                                 texts=["Competition"]))
+
+
 def getMatchProfile(matchID: int) -> Match:
     """
     Returns match profile  of matchID
     :param matchID: integer
     :return: match class instance
     """
+    cached = MATCH_CACHE.get(matchID)
+    if cached is not None:
+        return Match(*cached)
     conn, res = None, None
     # rows_effected, result = 0, ResultSet()
     ret_match = Match()
+    stamp = MATCH_CACHE.stamp()
     try:
         conn = Connector.DBConnector()
-        get_match_profile_query = sql.SQL("SELECT * FROM Match WHERE Match_Id={0}").format(sql.Literal(matchID))
-        rows_effected, result = conn.execute(get_match_profile_query)
+        rows_effected, result = conn.executePrepared("get_match_profile", (matchID,))
         if rows_effected == 1:
             ret_match.setMatchID(result.rows[0][0])
             ret_match.setCompetition(result.rows[0][1])
             ret_match.setHomeTeamID(result.rows[0][2])
             ret_match.setAwayTeamID(result.rows[0][3])
+            MATCH_CACHE.put(matchID, tuple(result.rows[0]), stamp)
         else:
             ret_match = Match.badMatch()
     except DatabaseException:
@@ -273,8 +933,8 @@ def deleteMatch(match: Match) -> ReturnValue:
     ret_value, conn = None, None
     try:
         conn = Connector.DBConnector()
-        delete_match_query = sql.SQL("DELETE FROM Match WHERE Match_Id={0}").format(sql.Literal(match.getMatchID()))
-        rows_effected, _ = conn.execute(delete_match_query)
+        rows_effected, _ = conn.executePrepared("delete_match", (match.getMatchID(),))
+        MATCH_CACHE.invalidate(match.getMatchID())
         if rows_effected == 0:
             ret_value = ReturnValue.NOT_EXISTS
         else:
@@ -307,13 +967,14 @@ def addPlayer(player: Player) -> ReturnValue:
     return_value = ReturnValue.OK
     try:
         conn = Connector.DBConnector()
-        add_player_query = sql.SQL("INSERT INTO PLAYER(Player_Id, Team_Id, Age, Height, Preferred_Foot)"
-                                   "VALUES({Player_Id}, {Team_Id}, {Age}, {Height}, {Preferred_Foot});").format(Player_Id=sql.Literal(player.getPlayerID()),
-                                    Team_Id=sql.Literal(player.getTeamID()),
-                                    Age=sql.Literal(player.getAge()),
-                                    Height=sql.Literal(player.getHeight()),
-                                    Preferred_Foot=sql.Literal(player.getFoot()))
-        _ = conn.execute(add_player_query)
+        rows_effected, _ = conn.executePrepared("add_player", (player.getPlayerID(), player.getTeamID(),
+                                                               player.getAge(), player.getHeight(),
+                                                               player.getFoot()))
+        if rows_effected == 1:
+            PLAYER_CACHE.put(player.getPlayerID(), (player.getPlayerID(), player.getTeamID(), player.getAge(),
+                                                    player.getHeight(), player.getFoot()))
+        else:
+            return_value = ReturnValue.ALREADY_EXISTS
     except DatabaseException.ConnectionInvalid:
         return_value = ReturnValue.ERROR
     except DatabaseException.UNIQUE_VIOLATION:
@@ -322,6 +983,8 @@ def addPlayer(player: Player) -> ReturnValue:
         return_value = ReturnValue.BAD_PARAMS
     except DatabaseException.CHECK_VIOLATION:
         return_value = ReturnValue.BAD_PARAMS
+    except DatabaseException.FOREIGN_KEY_VIOLATION:
+        return_value = ReturnValue.BAD_PARAMS
     except DatabaseException.database_ini_ERROR:
         return_value = ReturnValue.ERROR
     except DatabaseException.UNKNOWN_ERROR:
@@ -330,35 +993,52 @@ def addPlayer(player: Player) -> ReturnValue:
         conn.close()
         return return_value
 
+def addPlayers(players) -> List[ReturnValue]:
+    """
+    Add many players to the database in one round of COPY
+    :param players: iterable of player class instances
+    :return: Return value assoicated with each player, in the given order
+    """
+    rows = [(player.getPlayerID(), player.getTeamID(), player.getAge(), player.getHeight(), player.getFoot())
+            for player in players]
+    return cacheAdded(PLAYER_CACHE, rows,
+                      bulkInsert("Player", ["Player_Id", "Team_Id", "Age", "Height", "Preferred_Foot"], rows,
+                                 valid="S.Player_Id>0 AND S.Team_Id IS NOT NULL AND S.Age>0 AND S.Height>0 "
+                                       "AND S.Preferred_Foot IN('Left', 'Right')",
+                                 references="S.Team_Id IN(SELECT Team_Id FROM Team)",
+                                 keys=["Player_Id"],
+                                 texts=["Preferred_Foot"]))
+
+
 def getPlayerProfile(playerID: int) -> Player:
     """
     Returns player profile
     :param playerID: integer
     :return: player class instance
     """
+    cached = PLAYER_CACHE.get(playerID)
+    if cached is not None:
+        return Player(*cached)
     conn = None
     ret_player = None
     query_result = None
+    stamp = PLAYER_CACHE.stamp()
     try:
         conn = Connector.DBConnector()
-        get_player_query = sql.SQL("SELECT Team_Id, Age, Height, Preferred_Foot FROM PLAYER"
-                                   " WHERE Player_Id = {Player_Id};").format(Player_Id=sql.Literal(playerID))
-
-        query_result = conn.execute(get_player_query)
+        query_result = conn.executePrepared("get_player_profile", (playerID,))
     except DatabaseException:
         conn.close()
         return Player.badPlayer()
     finally:
         conn.close()
-        if ret_player is None:
-            return Player.badPlayer()
-        if query_result[0] == 0:
+        if query_result is None or query_result[0] == 0:
             return Player.badPlayer()
         ret_player = Player(playerID,
                             query_result[1].rows[0][0],
                             query_result[1].rows[0][1],
                             query_result[1].rows[0][2],
                             query_result[1].rows[0][3])
+        PLAYER_CACHE.put(playerID, (playerID,) + tuple(query_result[1].rows[0]), stamp)
         return ret_player
 
 def deletePlayer(player: Player) -> ReturnValue:
@@ -366,10 +1046,8 @@ def deletePlayer(player: Player) -> ReturnValue:
     query_result = None
     try:
         conn = Connector.DBConnector()
-        delete_player_query = sql.SQL("DELETE FROM PLAYER "
-                                      "WHERE Player_Id = {Player_Id};") \
-            .format(Player_Id=sql.Literal(player.getPlayerID()))
-        query_result = conn.execute(delete_player_query)
+        query_result = conn.executePrepared("delete_player", (player.getPlayerID(),))
+        PLAYER_CACHE.invalidate(player.getPlayerID())
     except DatabaseException.ConnectionInvalid:
         conn.close()
         return ReturnValue.ERROR
@@ -379,7 +1057,7 @@ def deletePlayer(player: Player) -> ReturnValue:
     finally:
         conn.close()
         if query_result is None:
-            return ReturnValue.Error
+            return ReturnValue.ERROR
         if query_result[0] == 0:
             return ReturnValue.NOT_EXISTS
         return ReturnValue.OK
@@ -393,12 +1071,14 @@ def addStadium(stadium: Stadium) -> ReturnValue:
     ret_value, conn = None, None
     try:
         conn = Connector.DBConnector()
-        add_stadium_query = sql.SQL("INSERT INTO Stadium(Stadium_Id, Capacity, Belong_to)"
-                                    " VALUES({Stadium_Id},{Capacity},{Belong_to})"). \
-            format(Stadium_Id=sql.Literal(stadium.getStadiumID()), Capacity=sql.Literal(stadium.getCapacity()),
-                   Belong_to=sql.Literal(stadium.getBelongsTo()))
-        _ = conn.execute(add_stadium_query)
-        ret_value = ReturnValue.OK
+        rows_effected, _ = conn.executePrepared("add_stadium", (stadium.getStadiumID(), stadium.getCapacity(),
+                                                                stadium.getBelongsTo()))
+        if rows_effected == 1:
+            STADIUM_CACHE.put(stadium.getStadiumID(), (stadium.getStadiumID(), stadium.getCapacity(),
+                                                       stadium.getBelongsTo()))
+            ret_value = ReturnValue.OK
+        else:
+            ret_value = ReturnValue.ALREADY_EXISTS
     except DatabaseException.ConnectionInvalid:
         ret_value = ReturnValue.ERROR
     except DatabaseException.NOT_NULL_VIOLATION:
@@ -417,23 +1097,41 @@ def addStadium(stadium: Stadium) -> ReturnValue:
         conn.close()
         return ret_value
 
+def addStadiums(stadiums) -> List[ReturnValue]:
+    """
+    Add many Stadiums to the database in one round of COPY
+    :param stadiums: iterable of stadium class instances
+    :return: Return value assoicated with each stadium, in the given order
+    """
+    rows = [(stadium.getStadiumID(), stadium.getCapacity(), stadium.getBelongsTo()) for stadium in stadiums]
+    return cacheAdded(STADIUM_CACHE, rows,
+                      bulkInsert("Stadium", ["Stadium_Id", "Capacity", "Belong_to"], rows,
+                                 valid="S.Stadium_Id>0 AND S.Capacity>0",
+                                 references="S.Belong_to IS NULL OR S.Belong_to IN(SELECT Team_Id FROM Team)",
+                                 keys=["Stadium_Id", "Belong_to"]))
+
+
 def getStadiumProfile(stadiumID: int) -> Stadium:
     """
     Returns stadium profile of stadiumID
     :param stadiumID: integer
     :return: stadium class instance
     """
+    cached = STADIUM_CACHE.get(stadiumID)
+    if cached is not None:
+        return Stadium(*cached)
     conn, res = None, None
     # rows_effected, result = 0, ResultSet()
     ret_stadium = Stadium()
+    stamp = STADIUM_CACHE.stamp()
     try:
         conn = Connector.DBConnector()
-        get_match_profile_query = sql.SQL("SELECT * FROM Stadium WHERE stadium_Id={0}").format(sql.Literal(stadiumID))
-        rows_effected, result = conn.execute(get_match_profile_query)
+        rows_effected, result = conn.executePrepared("get_stadium_profile", (stadiumID,))
         if rows_effected == 1:
             ret_stadium.setStadiumID(result.rows[0][0])
             ret_stadium.setCapacity(result.rows[0][1])
             ret_stadium.setBelongsTo(result.rows[0][2])
+            STADIUM_CACHE.put(stadiumID, tuple(result.rows[0]), stamp)
         else:
             ret_stadium = Stadium.badStadium()
     except DatabaseException:
@@ -451,8 +1149,8 @@ def deleteStadium(stadium: Stadium) -> ReturnValue:
     ret_value, conn = None, None
     try:
         conn = Connector.DBConnector()
-        query = sql.SQL("DELETE FROM Match WHERE Stadium_Id={0}").format(sql.Literal(stadium.getStadiumID()))
-        rows_effected, _ = conn.execute(query)
+        rows_effected, _ = conn.executePrepared("delete_stadium", (stadium.getStadiumID(),))
+        STADIUM_CACHE.invalidate(stadium.getStadiumID())
         if rows_effected == 0:
             ret_value = ReturnValue.NOT_EXISTS
         else:
@@ -487,12 +1185,7 @@ def playerScoredInMatch(match: Match, player: Player, amount: int) -> ReturnValu
     ret_value, conn = None, None
     try:
         conn = Connector.DBConnector()
-        player_scored_query = sql.SQL("INSERT INTO Scored(Player_Id, Match_Id, Goals)"
-                                      "VALUES({Player_Id},{Match_Id},{Goals})").\
-            format(Player_Id=sql.Literal(player.getPlayerID()),
-                   Match_Id=sql.Literal(match.getMatchID()),
-                   Goals=sql.Literal(amount))
-        rows_effected, _ = conn.execute(player_scored_query)
+        rows_effected, _ = conn.executePrepared("player_scored", (player.getPlayerID(), match.getMatchID(), amount))
         if rows_effected == 0:
             ret_value = ReturnValue.NOT_EXISTS
         else:
@@ -527,9 +1220,7 @@ def playerDidntScoreInMatch(match: Match, player: Player) -> ReturnValue:
     # rows_effected = 0
     try:
         conn = Connector.DBConnector()
-        player_unscored_query = sql.SQL("DELETE FROM Scored WHERE Player_Id={0} AND Match_Id={0}").\
-            format(sql.Literal(player.getPlayerID()), sql.Literal(match.getMatchID()))
-        rows_effected, _ = conn.execute(player_unscored_query)
+        rows_effected, _ = conn.executePrepared("player_didnt_score", (player.getPlayerID(), match.getMatchID()))
         if rows_effected == 1:
             ret_value = ReturnValue.OK
         elif rows_effected == 0:
@@ -565,12 +1256,8 @@ def matchInStadium(match: Match, stadium: Stadium, attendance: int) -> ReturnVal
     ret_value, conn = None, None
     try:
         conn = Connector.DBConnector()
-        player_scored_query = sql.SQL("INSERT INTO Took_Place(Match_Id, Stadium_Id, Spectators)"
-                                      "VALUES({Match_Id},{Stadium_Id},{Spectators})"). \
-            format(Match_Id=sql.Literal(match.getMatchID()),
-                   Stadium_Id=sql.Literal(stadium.getStadiumID()),
-                   Spectators=sql.Literal(attendance))
-        rows_effected, _ = conn.execute(player_scored_query)
+        rows_effected, _ = conn.executePrepared("match_in_stadium", (match.getMatchID(), stadium.getStadiumID(),
+                                                                     attendance))
         if rows_effected == 0:
             ret_value = ReturnValue.NOT_EXISTS
         else:
@@ -603,9 +1290,7 @@ def matchNotInStadium(match: Match, stadium: Stadium) -> ReturnValue:
     query_result, conn = None, None
     try:
         conn = Connector.DBConnector()
-        match_not_in_stadium_query = sql.SQL("DELETE FROM Took_Place "
-                                             "WHERE Match_Id = {Match_Id} AND Stadium_Id = {Stadium_Id};").format(Match_Id=sql.Literal(match.getMatchID()), Stadium_Id=sql.Literal(stadium.getStadiumID()))
-        query_result = conn.execute(match_not_in_stadium_query)
+        query_result = conn.executePrepared("match_not_in_stadium", (match.getMatchID(), stadium.getStadiumID()))
 
     except DatabaseException.ConnectionInvalid:
         conn.close()
@@ -617,6 +1302,52 @@ def matchNotInStadium(match: Match, stadium: Stadium) -> ReturnValue:
         return ReturnValue.OK
 
 
+def registerMatch(match: Match, stadium: Stadium = None, attendance: int = None, scorers=()) -> ReturnValue:
+    """
+    Adds a match, the stadium it took place in and its scorers in a single transaction
+    :param match: match class instance
+    :param stadium: stadium class instance the match took place in, or None
+    :param attendance: integer, spectators in stadium
+    :param scorers: iterable of (player class instance, amount) pairs
+    :return: OK when everything was added, otherwise nothing is added and the Return value is the one
+             addMatch, matchInStadium or playerScoredInMatch gives for the first step that failed
+    """
+    ret_value, conn = ReturnValue.OK, None
+    adding_match = True
+    try:
+        conn = Connector.DBConnector()
+        with conn.transaction():
+            rows_effected, _ = conn.executePrepared("add_match", (match.getMatchID(), match.getCompetition(),
+                                                                  match.getHomeTeamID(), match.getAwayTeamID()))
+            if rows_effected == 0:
+                raise DatabaseException.UNIQUE_VIOLATION("UNIQUE_VIOLATION")
+            adding_match = False
+            if stadium is not None:
+                conn.executePrepared("match_in_stadium", (match.getMatchID(), stadium.getStadiumID(), attendance))
+            for player, amount in scorers:
+                conn.executePrepared("player_scored", (player.getPlayerID(), match.getMatchID(), amount))
+        MATCH_CACHE.put(match.getMatchID(), (match.getMatchID(), match.getCompetition(),
+                                             match.getHomeTeamID(), match.getAwayTeamID()))
+    except DatabaseException.ConnectionInvalid:
+        ret_value = ReturnValue.ERROR
+    except DatabaseException.NOT_NULL_VIOLATION:
+        ret_value = ReturnValue.BAD_PARAMS
+    except DatabaseException.CHECK_VIOLATION:
+        ret_value = ReturnValue.BAD_PARAMS
+    except DatabaseException.UNIQUE_VIOLATION:
+        ret_value = ReturnValue.ALREADY_EXISTS
+    except DatabaseException.FOREIGN_KEY_VIOLATION:
+        ret_value = ReturnValue.BAD_PARAMS if adding_match else ReturnValue.NOT_EXISTS
+    except DatabaseException.database_ini_ERROR:
+        ret_value = ReturnValue.ERROR
+    except DatabaseException.UNKNOWN_ERROR:
+        ret_value = ReturnValue.ERROR
+    finally:
+        if conn is not None:
+            conn.close()
+        return ret_value
+
+
 def averageAttendanceInStadium(stadiumID: int) -> float:
     """
     Calculates average specatators for a give stadium
@@ -626,11 +1357,7 @@ def averageAttendanceInStadium(stadiumID: int) -> float:
     query_result, conn = None, None
     try:
         conn = Connector.DBConnector()
-        average_attendance_in_stadium_query = sql.SQL("SELECT AVG(Spectators) "
-                                                      "FROM Took_Place "
-                                                      "WHERE Stadium_Id={0}").format(sql.Literal(stadiumID))
-
-        query_result = conn.execute(average_attendance_in_stadium_query)
+        query_result = conn.executePrepared("average_attendance", (stadiumID,))
 
     except DatabaseException:
         conn.close()
@@ -654,10 +1381,7 @@ def stadiumTotalGoals(stadiumID: int) -> int:
     # rows_effected, result = 0, ResultSet()
     try:
         conn = Connector.DBConnector()
-        stadium_tot_goals_query = sql.SQL("SELECT COALESCE(SUM(Goals), 0) "
-                                          "FROM Goals_In_Stadium "
-                                          "WHERE Stadium_Id={0}").format(sql.Literal(stadiumID))
-        rows_effected, result = conn.execute(stadium_tot_goals_query)
+        rows_effected, result = conn.executePrepared("stadium_total_goals", (stadiumID,))
         if rows_effected == 1:
             ret_sum = result.rows[0][0]
         elif rows_effected == 0:
@@ -670,6 +1394,25 @@ def stadiumTotalGoals(stadiumID: int) -> int:
         conn.close()
         return ret_sum
 
+def matchTotalGoals(matchID: int) -> int:
+    """
+    Returns the total amount of goals scored in match with matchID
+    :param matchID: integer
+    :return: integer, 0 if the match doesn't exist and -1 on a database error
+    """
+    ret_sum, conn = -1, None
+    try:
+        conn = Connector.DBConnector()
+        rows_effected, result = conn.executePrepared("match_total_goals", (matchID,))
+        ret_sum = result.rows[0][0] if rows_effected == 1 else 0
+    except DatabaseException:
+        ret_sum = -1
+    finally:
+        if conn is not None:
+            conn.close()
+        return ret_sum
+
+
 def playerIsWinner(playerID: int, matchID: int) -> bool:
     """
     Decides if a player is a winner in a given match
@@ -680,11 +1423,7 @@ def playerIsWinner(playerID: int, matchID: int) -> bool:
     conn, query_result = None, None
     try:
         conn = Connector.DBConnector()
-        winner_player_query = sql.SQL("SELECT Player_Id "
-                                      "FROM Goals_In_Match_Join_Scored "
-                                      "WHERE 2*goals >= sum AND Match_Id={Match_Id} AND Player_Id={Player_Id};")\
-            .format(Match_Id=sql.Literal(matchID), Player_Id=sql.Literal(playerID))
-        query_result = conn.execute(winner_player_query)
+        query_result = conn.executePrepared("player_is_winner", (matchID, playerID))
     except DatabaseException:
         conn.close()
         return False
@@ -701,6 +1440,48 @@ def playerIsWinner(playerID: int, matchID: int) -> bool:
         else:
             return False
 
+
+def winnersOfMatches(matchIDs) -> Dict[int, List[int]]:
+    """
+    Returns the winners of many matches in one query
+    :param matchIDs: iterable of integers
+    :return: dictionary from each matchID to the IDs of its winners, ascending, matches without goals map to []
+    """
+    conn = None
+    match_ids = list(dict.fromkeys(matchIDs))
+    winners = {match_id: [] for match_id in match_ids}
+    try:
+        conn = Connector.DBConnector()
+        _, result = conn.executePrepared("winners_of_matches", (match_ids,))
+        for match_id, player_id in result.rows:
+            winners[match_id].append(player_id)
+    except DatabaseException:
+        winners = {match_id: [] for match_id in match_ids}
+    finally:
+        if conn is not None:
+            conn.close()
+        return winners
+
+
+def winnersOfMatch(matchID: int) -> List[int]:
+    """
+    Returns the winners of a match
+    :param matchID: integer
+    :return: list of integers, ascending
+    """
+    return winnersOfMatches([matchID])[matchID]
+
+
+def playerIsWinnerMany(pairs) -> Dict[tuple, bool]:
+    """
+    playerIsWinner for many (playerID, matchID) pairs in one query
+    :param pairs: iterable of (playerID, matchID) tuples
+    :return: dictionary from each pair to whether the player is a winner in the match
+    """
+    pairs = list(dict.fromkeys((player_id, match_id) for player_id, match_id in pairs))
+    winners = winnersOfMatches(match_id for _, match_id in pairs)
+    return {(player_id, match_id): player_id in winners[match_id] for player_id, match_id in pairs}
+
 def getActiveTallTeams() -> List[int]:
     """
     Returns ta list(up to size 5) of active teams'ID that have at least 2 players over the height of 190cm.
@@ -712,13 +1493,7 @@ def getActiveTallTeams() -> List[int]:
     active_tall_teams_list = []
     try:
         conn = Connector.DBConnector()
-        result = conn.execute("SELECT P.Team_Id "
-                              "FROM Player P, Active_Teams T "
-                              "WHERE P.Team_Id=T.Home_Team_Id AND P.Height>190 "
-                              "GROUP BY P.Team_Id "
-                              "HAVING COUNT(P.Player_Id)>=2 "
-                              "ORDER BY P.Team_Id DESC "
-                              "LIMIT 5")
+        result = conn.executePrepared("active_tall_teams")
         for team in result[1].rows:
             active_tall_teams_list.append(team[0])
     except DatabaseException:
@@ -736,13 +1511,7 @@ def getActiveTallRichTeams() -> List[int]:
     active_rich_tall_teams_list = []
     try:
         conn = Connector.DBConnector()
-        active_rich_tall_teams_query = ("SELECT Team_Id "
-                                        "FROM Active_Tall_Teams INNER JOIN Stadium "
-                                        "ON Team_Id=belong_to "
-                                        "WHERE Capacity > 55000 "
-                                        "ORDER BY Team_Id "
-                                        "ASC LIMIT 5;")
-        query_result = conn.execute(active_rich_tall_teams_query)
+        query_result = conn.executePrepared("active_tall_rich_teams")
     except DatabaseException:
         conn.close()
         return []
@@ -765,16 +1534,7 @@ def popularTeams() -> List[int]:
     popular_teams_list = []
     try:
         conn = Connector.DBConnector()
-        result = conn.execute("SELECT Home_Team_Id "
-                              "FROM Home_Teams_Stadiums "
-                              "GROUP BY Home_Team_Id "
-                              "HAVING MIN(Spectators)>40000 "
-                              "UNION "
-                              "SELECT Away_Team_Id "
-                              "FROM Match "
-                              "WHERE Away_Team_Id NOT IN(SELECT Home_Team_Id FROM Match) "
-                              "ORDER BY Home_Team_Id DESC "
-                              "LIMIT 10")
+        result = conn.executePrepared("popular_teams")
         for team in result[1].rows:
             popular_teams_list.append(team[0])
     except DatabaseException:
@@ -795,12 +1555,8 @@ def getMostAttractiveStadiums() -> List[int]:
     most_attractive_stadiums_list = []
     try:
         conn = Connector.DBConnector()
-        result = conn.execute("SELECT Stadium_Id, COALESCE(SUM(Goals), 0) "
-                              "FROM Goals_In_Stadium "
-                              "GROUP BY Stadium_Id "
-                              "ORDER BY COALESCE(SUM(Goals), 0) DESC, Stadium_Id ASC")
-        for team in result[1].rows:
-            most_attractive_stadiums_list.append(team[0])
+        result = conn.executePrepared("most_attractive_stadiums", columnar=True)
+        most_attractive_stadiums_list = list(result[1].column("Stadium_Id"))
     except DatabaseException:
         most_attractive_stadiums_list = []
     finally:
@@ -817,12 +1573,7 @@ def mostGoalsForTeam(teamID: int) -> List[int]:
     most_goals_for_team = []
     try:
         conn = Connector.DBConnector()
-        most_goals_for_team_query = sql.SQL("SELECT Player_Id "
-                                            "FROM Player_Overall_Scored "
-                                            "WHERE Team_Id={Team_Id} "
-                                            "ORDER BY sum DESC, Player_Id DESC "
-                                            "LIMIT 5;").format(Team_Id=sql.Literal(teamID))
-        query_result = conn.execute(most_goals_for_team_query)
+        query_result = conn.executePrepared("most_goals_for_team", (teamID,))
         if query_result[0] == 0:
             return []
         for player in query_result[1].rows:
@@ -833,5 +1584,77 @@ def mostGoalsForTeam(teamID: int) -> List[int]:
         conn.close()
         return most_goals_for_team
 
+def mostGoalsForAllTeams(limit: int = 5):
+    """
+    mostGoalsForTeam for every team in one query, streamed team by team as rows arrive from the database.
+    A database error ends the stream early
+    :param limit: players listed for each team
+    :return: generator of (teamID, list of integers) tuples, by teamID ascending, teams without players get []
+    """
+    if limit < 1:
+        return
+    conn, stream = None, None
+    team_id, players = None, []
+    try:
+        conn = Connector.DBConnector()
+        stream = conn.executeStream(MOST_GOALS_FOR_ALL_TEAMS, params=(limit,), name="most_goals_for_all_teams")
+        for row_team, row_player in stream:
+            if row_team != team_id:
+                if team_id is not None:
+                    yield team_id, players
+                team_id, players = row_team, []
+            if row_player is not None:
+                players.append(row_player)
+        if team_id is not None:
+            yield team_id, players
+    except DATABASE_ERRORS:
+        return
+    finally:
+        # the server-side cursor is closed before the connection goes back to the pool
+        if stream is not None:
+            stream.close()
+        if conn is not None:
+            conn.close()
+
+
 def getClosePlayers(playerID: int) -> List[int]:
-    pass
+    """
+    Returns up to 10 players, by ID ascending, that scored in at least half of the matches playerID scored in.
+    When playerID did not score at all every other player is close. A player is never close to himself
+    :param playerID: integer
+    :return: list of integers
+    """
+    conn = None
+    close_players = []
+    try:
+        conn = Connector.DBConnector()
+        _, result = conn.executePrepared("close_players", (playerID,))
+        close_players = [row[0] for row in result.rows]
+    except DatabaseException:
+        close_players = []
+    finally:
+        if conn is not None:
+            conn.close()
+        return close_players
+
+
+def getClosePlayersMany(playerIDs) -> Dict[int, List[int]]:
+    """
+    getClosePlayers for many players in one query
+    :param playerIDs: iterable of integers
+    :return: dictionary from each playerID to its close players, players that do not exist map to []
+    """
+    conn = None
+    player_ids = list(dict.fromkeys(playerIDs))
+    close_players = {player_id: [] for player_id in player_ids}
+    try:
+        conn = Connector.DBConnector()
+        _, result = conn.executePrepared("close_players_many", (player_ids,))
+        for target, close in result.rows:
+            close_players[target].append(close)
+    except DatabaseException:
+        close_players = {player_id: [] for player_id in player_ids}
+    finally:
+        if conn is not None:
+            conn.close()
+        return close_players
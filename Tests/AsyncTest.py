@@ -0,0 +1,67 @@
+import asyncio
+import unittest
+import AsyncSolution
+from Utility.ReturnValue import ReturnValue
+from Utility.AsyncDBConnector import AsyncConnectionPool, AsyncDBConnector
+from Utility.DBConnector import DBConnector
+from Tests.abstractTest import AbstractTest
+from Business.Match import Match
+from Business.Stadium import Stadium
+from Business.Player import Player
+
+
+class Test(AbstractTest):
+    # several connections at once, a pinned connection would hide them
+    isolated = False
+
+    def tearDown(self) -> None:
+        AsyncDBConnector.closePool()
+        super().tearDown()
+
+    def test_Team(self) -> None:
+        async def run():
+            results = await asyncio.gather(*[AsyncSolution.addTeam(team) for team in [1, 2, 1, 0]])
+            self.assertEqual(sorted([ReturnValue.OK, ReturnValue.OK, ReturnValue.ALREADY_EXISTS,
+                                     ReturnValue.BAD_PARAMS], key=str), sorted(results, key=str))
+        asyncio.run(run())
+
+    def test_Profiles(self) -> None:
+        async def run():
+            self.assertEqual([ReturnValue.OK] * 2, await AsyncSolution.addTeams([1, 2]), "Should work")
+            self.assertEqual(ReturnValue.OK, await AsyncSolution.addMatch(Match(1, "Domestic", 1, 2)), "Should work")
+            self.assertEqual(ReturnValue.BAD_PARAMS, await AsyncSolution.addMatch(Match(2, "Domestic", 1, 1)),
+                             "Same home and away team")
+            self.assertEqual(ReturnValue.OK, await AsyncSolution.addPlayer(Player(1, 1, 20, 185, "Left")), "Should work")
+            self.assertEqual(ReturnValue.OK, await AsyncSolution.addStadium(Stadium(1, 55000, 1)), "Should work")
+            match, player, stadium = await asyncio.gather(AsyncSolution.getMatchProfile(1),
+                                                          AsyncSolution.getPlayerProfile(1),
+                                                          AsyncSolution.getStadiumProfile(1))
+            self.assertEqual("Domestic", match.getCompetition())
+            self.assertEqual(185, player.getHeight())
+            self.assertEqual(55000, stadium.getCapacity())
+            self.assertIsNone((await AsyncSolution.getMatchProfile(7)).getMatchID(), "ID 7 not exists")
+            self.assertEqual(ReturnValue.OK, await AsyncSolution.registerMatch(Match(3, "Domestic", 2, 1), stadium,
+                                                                                41000, [(player, 2)]), "Should work")
+            self.assertEqual(2, await AsyncSolution.stadiumTotalGoals(1))
+            self.assertTrue(await AsyncSolution.playerIsWinner(1, 3))
+            self.assertEqual(ReturnValue.NOT_EXISTS, await AsyncSolution.deleteMatch(Match(7)), "ID 7 not exists")
+        asyncio.run(run())
+
+    def test_DeadConnectionIsReplaced(self) -> None:
+        async def run():
+            pool = AsyncConnectionPool(DBConnector.config(), minSize=0, maxSize=1, pingAfter=0)
+            try:
+                connection = await pool.acquire()
+                pool.release(connection)
+                AbstractTest.terminate(connection.get_backend_pid())
+                replacement = await pool.acquire()
+                self.assertIsNot(connection, replacement, "The ping should find the connection dead")
+                pool.release(replacement)
+            finally:
+                pool.close()
+        asyncio.run(run())
+
+
+# *** DO NOT RUN EACH TEST MANUALLY ***
+if __name__ == '__main__':
+    unittest.main(verbosity=2, exit=False)
@@ -0,0 +1,58 @@
+import unittest
+import Solution
+from Utility.ReturnValue import ReturnValue
+from Tests.abstractTest import AbstractTest
+from Business.Match import Match
+from Business.Stadium import Stadium
+from Business.Player import Player
+
+
+class Test(AbstractTest):
+    def test_Teams(self) -> None:
+        self.assertEqual(ReturnValue.OK, Solution.addTeam(1), "Should work")
+        self.assertEqual([ReturnValue.ALREADY_EXISTS, ReturnValue.OK, ReturnValue.BAD_PARAMS, ReturnValue.ALREADY_EXISTS],
+                         Solution.addTeams([1, 2, 0, 2]), "ID 1 exists, 0 is illegal, 2 is repeated")
+        self.assertEqual(ReturnValue.ALREADY_EXISTS, Solution.addTeam(2), "ID 2 was added in bulk")
+
+    def test_MatchesPlayersStadiums(self) -> None:
+        self.assertEqual([ReturnValue.OK] * 3, Solution.addTeams([1, 2, 3]), "Should work")
+        self.assertEqual([ReturnValue.OK, ReturnValue.BAD_PARAMS, ReturnValue.BAD_PARAMS, ReturnValue.ALREADY_EXISTS],
+                         Solution.addMatches([Match(1, "Domestic", 1, 2), Match(2, "Boop", 1, 2),
+                                              Match(3, "Domestic", 1, 7), Match(1, "Domestic", 2, 3)]),
+                         "Bad competition, missing team and repeated ID")
+        self.assertEqual([ReturnValue.OK, ReturnValue.BAD_PARAMS, ReturnValue.BAD_PARAMS],
+                         Solution.addPlayers([Player(1, 1, 20, 185, "Left"), Player(2, 1, 20, 185, "Both"),
+                                              Player(3, 9, 20, 185, "Left")]),
+                         "Bad foot and missing team")
+        self.assertEqual([ReturnValue.OK, ReturnValue.ALREADY_EXISTS, ReturnValue.OK, ReturnValue.BAD_PARAMS],
+                         Solution.addStadiums([Stadium(1, 55000, 1), Stadium(2, 5000, 1), Stadium(3, 5000, None),
+                                               Stadium(4, 5000, 9)]),
+                         "Team 1 already owns a stadium and team 9 not exists")
+        self.assertEqual(55000, Solution.getStadiumProfile(1).getCapacity(), "Should be inserted")
+
+    def test_NullIDs(self) -> None:
+        self.assertEqual(ReturnValue.OK, Solution.addTeam(1), "Should work")
+        singles = [Solution.addTeam(None), Solution.addMatch(Match(None, "Domestic", 1, 2)),
+                   Solution.addPlayer(Player(None, 1, 20, 185, "Left")), Solution.addStadium(Stadium(None, 5000))]
+        self.assertEqual([ReturnValue.BAD_PARAMS] * 4, singles, "Should work")
+        self.assertEqual([singles[0]], Solution.addTeams([None]), "Same as addTeam")
+        self.assertEqual([singles[1]], Solution.addMatches([Match(None, "Domestic", 1, 2)]), "Same as addMatch")
+        self.assertEqual([singles[2]], Solution.addPlayers([Player(None, 1, 20, 185, "Left")]), "Same as addPlayer")
+        self.assertEqual([singles[3]], Solution.addStadiums([Stadium(None, 5000)]), "Same as addStadium")
+
+    def test_LongText(self) -> None:
+        self.assertEqual([ReturnValue.OK] * 2, Solution.addTeams([1, 2]), "Should work")
+        self.assertEqual([ReturnValue.BAD_PARAMS, ReturnValue.OK],
+                         Solution.addMatches([Match(1, "Intercontinental", 1, 2), Match(2, "Domestic", 1, 2)]),
+                         "Longer than VARCHAR(13), only its own row fails")
+        self.assertEqual([ReturnValue.OK, ReturnValue.BAD_PARAMS],
+                         Solution.addPlayers([Player(1, 1, 20, 185, "Left"), Player(2, 1, 20, 185, "Neither")]),
+                         "Longer than VARCHAR(5)")
+
+    def test_Empty(self) -> None:
+        self.assertEqual([], Solution.addTeams([]), "Nothing to add")
+
+
+# *** DO NOT RUN EACH TEST MANUALLY ***
+if __name__ == '__main__':
+    unittest.main(verbosity=2, exit=False)
@@ -0,0 +1,77 @@
+import time
+import unittest
+import Solution
+from Utility.ReturnValue import ReturnValue
+from Utility.DBConnector import DBConnector
+from Tests.abstractTest import AbstractTest
+from Business.Match import Match
+from Business.Player import Player
+
+
+class Test(AbstractTest):
+    # the notifications are sent on commit, to a connection of their own
+    isolated = False
+
+    def setUp(self) -> None:
+        super().setUp()
+        self.listener = Solution.listenForChanges(reconnectDelay=0.1)
+        self.assertTrue(self.listener.waitUntilListening(), "Should connect")
+        self.assertEqual([ReturnValue.OK] * 2, Solution.addTeams([1, 2]), "Should work")
+
+    def tearDown(self) -> None:
+        Solution.stopListeningForChanges()
+        super().tearDown()
+
+    # what another worker process would do, a write that bypasses the caches of this one
+    def writeElsewhere(self, query: str):
+        received = self.listener.received()
+        conn = DBConnector()
+        try:
+            conn.execute(query)
+        finally:
+            conn.close()
+        deadline = time.monotonic() + 5
+        while self.listener.received() == received and time.monotonic() < deadline:
+            time.sleep(0.01)
+        time.sleep(0.05)
+
+    def test_Update(self) -> None:
+        self.assertEqual(ReturnValue.OK, Solution.addPlayer(Player(1, 1, 20, 185, "Left")), "Should work")
+        self.assertEqual(185, Solution.getPlayerProfile(1).getHeight(), "Cached")
+        self.writeElsewhere("UPDATE Player SET Height=190 WHERE Player_Id=1")
+        self.assertEqual(190, Solution.getPlayerProfile(1).getHeight(), "Invalidated by the notification")
+
+    def test_Cascade(self) -> None:
+        self.assertEqual(ReturnValue.OK, Solution.addMatch(Match(1, "Domestic", 1, 2)), "Should work")
+        self.assertEqual(ReturnValue.OK, Solution.addPlayer(Player(1, 2, 20, 185, "Left")), "Should work")
+        self.writeElsewhere("DELETE FROM Team WHERE Team_Id=2")
+        self.assertIsNone(Solution.getMatchProfile(1).getMatchID(), "Cascaded with the away team")
+        self.assertIsNone(Solution.getPlayerProfile(1).getPlayerID(), "Cascaded with the team")
+
+    def test_Statement(self) -> None:
+        players = [Player(i, 1, 20, 185, "Left") for i in range(1, 4)]
+        self.assertEqual([ReturnValue.OK] * 3, Solution.addPlayers(players), "Should work")
+        received = self.listener.received()
+        self.writeElsewhere("UPDATE Player SET Height=190")
+        self.assertEqual(received + 1, self.listener.received(), "One notification for the whole statement")
+        for i in range(1, 4):
+            self.assertEqual(190, Solution.getPlayerProfile(i).getHeight(), "Invalidated by the notification")
+
+    def test_ManyRows(self) -> None:
+        count = Solution.NOTIFY_KEY_LIMIT + 1
+        players = [Player(i, 1, 20, 185, "Left") for i in range(1, count + 1)]
+        self.assertEqual([ReturnValue.OK] * count, Solution.addPlayers(players), "Should work")
+        self.assertEqual(185, Solution.getPlayerProfile(count).getHeight(), "Cached")
+        self.writeElsewhere("UPDATE Player SET Height=190")
+        self.assertEqual(0, len(Solution.PLAYER_CACHE), "Too many keys for one notification, the cache is emptied")
+        self.assertEqual(190, Solution.getPlayerProfile(count).getHeight(), "Should work")
+
+    def test_Truncate(self) -> None:
+        self.assertEqual(ReturnValue.OK, Solution.addMatch(Match(1, "Domestic", 1, 2)), "Should work")
+        self.writeElsewhere("TRUNCATE Team CASCADE")
+        self.assertIsNone(Solution.getMatchProfile(1).getMatchID(), "Every cache is emptied")
+
+
+# *** DO NOT RUN EACH TEST MANUALLY ***
+if __name__ == '__main__':
+    unittest.main(verbosity=2, exit=False)
@@ -0,0 +1,46 @@
+import unittest
+import Solution
+from Utility.ReturnValue import ReturnValue
+from Tests.abstractTest import AbstractTest
+from Business.Match import Match
+from Business.Player import Player
+
+
+class Test(AbstractTest):
+    def setUp(self) -> None:
+        super().setUp()
+        self.assertEqual([ReturnValue.OK] * 2, Solution.addTeams([1, 2]), "Should work")
+        self.assertEqual([ReturnValue.OK] * 4, Solution.addMatches([Match(m, "Domestic", 1, 2)
+                                                                    for m in range(1, 5)]), "Should work")
+        self.assertEqual([ReturnValue.OK] * 12, Solution.addPlayers([Player(p, 1 + p % 2, 20, 185, "Left")
+                                                                     for p in range(1, 13)]), "Should work")
+
+    def test_HalfOfTheMatches(self) -> None:
+        for match in (1, 2, 3, 4):
+            self.assertEqual(ReturnValue.OK, Solution.playerScoredInMatch(Match(match), Player(1), 1), "Should work")
+        for match in (1, 2):
+            self.assertEqual(ReturnValue.OK, Solution.playerScoredInMatch(Match(match), Player(2), 1), "Should work")
+        self.assertEqual(ReturnValue.OK, Solution.playerScoredInMatch(Match(3), Player(3), 2), "Should work")
+        self.assertEqual(ReturnValue.OK, Solution.playerScoredInMatch(Match(4), Player(4), 1), "Should work")
+
+        self.assertEqual([2], Solution.getClosePlayers(1), "Player 3 and 4 scored in a quarter of the matches")
+        self.assertEqual([1], Solution.getClosePlayers(2), "Should work")
+        self.assertEqual([1], Solution.getClosePlayers(3), "Should work")
+        self.assertEqual([2, 3, 4, 5, 6, 7, 8, 9, 10, 11], Solution.getClosePlayers(12), "Didn't score, capped at 10")
+        self.assertEqual([], Solution.getClosePlayers(13), "Player doesn't exist")
+
+    def test_Many(self) -> None:
+        for player in range(1, 13):
+            self.assertEqual(ReturnValue.OK, Solution.playerScoredInMatch(Match(1), Player(player), 1), "Should work")
+        self.assertEqual(ReturnValue.OK, Solution.playerDidntScoreInMatch(Match(1), Player(12)), "Should work")
+
+        expected = {player: Solution.getClosePlayers(player) for player in (1, 12, 13)}
+        self.assertEqual([2, 3, 4, 5, 6, 7, 8, 9, 10, 11], expected[1], "Capped at 10")
+        self.assertEqual([1, 2, 3, 4, 5, 6, 7, 8, 9, 10], expected[12], "Should work")
+        self.assertEqual(expected, Solution.getClosePlayersMany([1, 12, 13, 1]), "Same as one call per player")
+        self.assertEqual({}, Solution.getClosePlayersMany([]), "Should work")
+
+
+# *** DO NOT RUN EACH TEST MANUALLY ***
+if __name__ == '__main__':
+    unittest.main(verbosity=2, exit=False)
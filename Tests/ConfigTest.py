@@ -0,0 +1,91 @@
+import os
+import shutil
+import tempfile
+import unittest
+from configparser import ConfigParser
+from unittest import mock
+from Utility.DBConnector import DBConnector
+
+INI = "[postgresql]\nhost=localhost\ndatabase={0}\nuser=tester\npassword=secret\nport=5432\n"
+
+
+class CountingParser(ConfigParser):
+    reads = 0
+
+    def read(self, *args, **kwargs):
+        CountingParser.reads += 1
+        return super().read(*args, **kwargs)
+
+
+class Test(unittest.TestCase):
+    # the loader reads Utility/database.ini under the working directory first, none of these tests needs a server
+    def setUp(self) -> None:
+        self.cwd = os.getcwd()
+        self.directory = tempfile.mkdtemp()
+        os.mkdir(os.path.join(self.directory, "Utility"))
+        self.path = os.path.join(self.directory, "Utility", "database.ini")
+        self.write("first", 1000000000)
+        os.chdir(self.directory)
+        self.environ = mock.patch.dict(os.environ, {key: value for key, value in os.environ.items()
+                                                    if not key.startswith("DB_")}, clear=True)
+        self.environ.start()
+        DBConnector.reloadConfig()
+        CountingParser.reads = 0
+        self.parser = mock.patch("Utility.DBConnector.ConfigParser", CountingParser)
+        self.parser.start()
+
+    def tearDown(self) -> None:
+        self.parser.stop()
+        self.environ.stop()
+        DBConnector.watchConfig(False)
+        os.chdir(self.cwd)
+        shutil.rmtree(self.directory)
+        DBConnector.reloadConfig()
+
+    def write(self, database: str, mtime: int):
+        with open(self.path, "w") as ini:
+            ini.write(INI.format(database))
+        os.utime(self.path, (mtime, mtime))
+
+    def test_ParsedOnce(self) -> None:
+        for _ in range(5):
+            self.assertEqual("first", DBConnector.config()["database"], "Should work")
+        self.assertEqual(0, CountingParser.reads, "Parsed by reloadConfig in setUp only")
+        self.write("second", 1000000100)
+        self.assertEqual("first", DBConnector.config()["database"], "Not watched, the cached values stay")
+
+    def test_EnvironmentOverrides(self) -> None:
+        os.environ["DB_HOST"] = "db.example"
+        os.environ["DB_PORT"] = "6543"
+        params = DBConnector.reloadConfig()
+        self.assertEqual("db.example", params["host"], "Should work")
+        self.assertEqual("6543", params["port"], "Should work")
+        self.assertEqual("first", params["database"], "The rest comes from the file")
+        self.assertEqual(1, CountingParser.reads, "Should work")
+
+        os.environ["DB_DATABASE"] = "env"
+        os.environ["DB_USER"] = "someone"
+        params = DBConnector.reloadConfig()
+        self.assertEqual("env", params["database"], "Should work")
+        self.assertNotIn("password", params, "The file is skipped entirely")
+        self.assertEqual(1, CountingParser.reads, "Should work")
+
+    def test_Reload(self) -> None:
+        self.write("second", 1000000100)
+        self.assertEqual("second", DBConnector.reloadConfig()["database"], "Should work")
+        self.assertEqual("second", DBConnector.config()["database"], "Should work")
+        self.assertEqual(1, CountingParser.reads, "Should work")
+
+    def test_Watch(self) -> None:
+        DBConnector.watchConfig()
+        self.assertEqual("first", DBConnector.config()["database"], "Should work")
+        self.assertEqual(0, CountingParser.reads, "Same mtime, no parse")
+        self.write("second", 1000000100)
+        self.assertEqual("second", DBConnector.config()["database"], "Picked up the new mtime")
+        self.assertEqual("second", DBConnector.config()["database"], "Should work")
+        self.assertEqual(1, CountingParser.reads, "Parsed once per change")
+
+
+# *** DO NOT RUN EACH TEST MANUALLY ***
+if __name__ == '__main__':
+    unittest.main(verbosity=2, exit=False)
@@ -0,0 +1,54 @@
+import unittest
+import Solution
+from Utility.ReturnValue import ReturnValue
+from Utility.DBConnector import DBConnector
+from Tests.abstractTest import AbstractTest
+from Business.Match import Match
+from Business.Player import Player
+from Business.Stadium import Stadium
+
+
+class Test(AbstractTest):
+    def setUp(self) -> None:
+        super().setUp()
+        self.assertEqual([ReturnValue.OK] * 2, Solution.addTeams([1, 2]), "Should work")
+
+    def test_AlreadyExists(self) -> None:
+        self.assertEqual(ReturnValue.ALREADY_EXISTS, Solution.addTeam(1), "Should work")
+        self.assertEqual(ReturnValue.OK, Solution.addMatch(Match(1, "Domestic", 1, 2)), "Should work")
+        self.assertEqual(ReturnValue.ALREADY_EXISTS, Solution.addMatch(Match(1, "Domestic", 2, 1)), "Should work")
+        self.assertEqual(ReturnValue.OK, Solution.addPlayer(Player(1, 1, 20, 185, "Left")), "Should work")
+        self.assertEqual(ReturnValue.ALREADY_EXISTS, Solution.addPlayer(Player(1, 2, 20, 185, "Left")), "Should work")
+        self.assertEqual(ReturnValue.OK, Solution.addStadium(Stadium(1, 500, 1)), "Should work")
+        self.assertEqual(ReturnValue.ALREADY_EXISTS, Solution.addStadium(Stadium(1, 600)), "Should work")
+        self.assertEqual(ReturnValue.ALREADY_EXISTS, Solution.addStadium(Stadium(2, 600, 1)), "Team 1 has a stadium")
+
+        self.assertEqual(1, Solution.getMatchProfile(1).getHomeTeamID(), "The duplicate didn't replace the match")
+        self.assertEqual(1, Solution.getPlayerProfile(1).getTeamID(), "Should work")
+        self.assertEqual(500, Solution.getStadiumProfile(1).getCapacity(), "Should work")
+        self.assertEqual(ReturnValue.ALREADY_EXISTS, Solution.registerMatch(Match(1, "Domestic", 2, 1)), "Should work")
+
+    def test_BadParams(self) -> None:
+        self.assertEqual(ReturnValue.OK, Solution.addPlayer(Player(1, 1, 20, 185, "Left")), "Should work")
+        self.assertEqual(ReturnValue.BAD_PARAMS, Solution.addPlayer(Player(1, 1, -20, 185, "Left")), "Check first")
+        self.assertEqual(ReturnValue.ALREADY_EXISTS, Solution.addPlayer(Player(1, 3, 20, 185, "Left")),
+                         "Foreign keys are checked after the insert")
+        self.assertEqual(ReturnValue.BAD_PARAMS, Solution.addPlayer(Player(2, 3, 20, 185, "Left")), "No team 3")
+        self.assertEqual(ReturnValue.BAD_PARAMS, Solution.addMatch(Match(1, "Domestic", 1, 3)), "No team 3")
+        self.assertEqual(ReturnValue.BAD_PARAMS, Solution.addStadium(Stadium(1, 500, 3)), "No team 3")
+        self.assertEqual(ReturnValue.BAD_PARAMS, Solution.addTeam(None), "A team needs an ID")
+
+    def test_NoErrorRoundTrip(self) -> None:
+        conn = DBConnector()
+        try:
+            rows_effected, _ = conn.executePrepared("add_team", (1,))
+            self.assertEqual(0, rows_effected, "Skipped without raising")
+            rows_effected, _ = conn.executePrepared("add_team", (3,))
+            self.assertEqual(1, rows_effected, "The transaction wasn't aborted")
+        finally:
+            conn.close()
+
+
+# *** DO NOT RUN EACH TEST MANUALLY ***
+if __name__ == '__main__':
+    unittest.main(verbosity=2, exit=False)
@@ -0,0 +1,82 @@
+import random
+import unittest
+import Solution
+from Utility.ReturnValue import ReturnValue
+from Utility.DBConnector import DBConnector
+from Tests.abstractTest import AbstractTest
+from Business.Match import Match
+from Business.Stadium import Stadium
+from Business.Player import Player
+
+TEAMS, PLAYERS_PER_TEAM, MATCHES, STADIUMS, SCORERS_PER_MATCH = 200, 25, 5000, 1000, 3
+
+
+class Test(AbstractTest):
+    # the keyed lookups of Solution.py, all of them should be answered from an index
+    queries = [("get_match_profile", (1,)), ("delete_match", (1,)),
+               ("get_player_profile", (1,)), ("delete_player", (1,)),
+               ("get_stadium_profile", (1,)), ("delete_stadium", (1,)),
+               ("player_didnt_score", (1, 1)), ("match_not_in_stadium", (1, 1)),
+               ("average_attendance", (1,)), ("stadium_total_goals", (1,)), ("match_total_goals", (1,)),
+               ("player_is_winner", (1, 1)), ("most_goals_for_team", (1,))]
+
+    def setUp(self) -> None:
+        super().setUp()
+        rand = random.Random(236363)
+        teams = range(1, TEAMS + 1)
+        players = range(1, TEAMS * PLAYERS_PER_TEAM + 1)
+        self.assertNotIn(ReturnValue.ERROR, Solution.addTeams(teams))
+        self.assertNotIn(ReturnValue.ERROR, Solution.addPlayers(
+            Player(p, (p - 1) // PLAYERS_PER_TEAM + 1, rand.randint(18, 35), rand.randint(165, 205),
+                   rand.choice(["Left", "Right"])) for p in players))
+        self.assertNotIn(ReturnValue.ERROR, Solution.addStadiums(
+            Stadium(s, rand.randint(1000, 90000), s if s <= TEAMS else None) for s in range(1, STADIUMS + 1)))
+        matches = [Match(m, "Domestic", *rand.sample(teams, 2)) for m in range(1, MATCHES + 1)]
+        self.assertNotIn(ReturnValue.ERROR, Solution.addMatches(matches))
+
+        conn = DBConnector()
+        try:
+            conn.copy("Took_Place", ["Match_Id", "Stadium_Id", "Spectators"],
+                      ((m, rand.randint(1, STADIUMS), rand.randint(1, 90000)) for m in range(1, MATCHES + 1)))
+            conn.copy("Scored", ["Player_Id", "Match_Id", "Goals"],
+                      ((p, m.getMatchID(), rand.randint(1, 3))
+                       for m in matches
+                       for p in rand.sample(range((m.getHomeTeamID() - 1) * PLAYERS_PER_TEAM + 1,
+                                                  m.getHomeTeamID() * PLAYERS_PER_TEAM + 1), SCORERS_PER_MATCH)))
+            conn.execute("ANALYZE")
+        finally:
+            conn.close()
+
+    def test_LookupsUseIndexes(self) -> None:
+        conn = DBConnector()
+        try:
+            for name, params in self.queries:
+                plan = conn.explainPrepared(name, params)
+                self.assertTrue(Test.usesIndex(plan[0]["Plan"]), name + " should use an index: " + str(plan))
+        finally:
+            conn.close()
+
+    # a third of the players are taller than 190, a sequential scan may win on this data, so only check that the
+    # partial index matches the filter of the queries it was made for
+    def test_TallPlayersUsePartialIndex(self) -> None:
+        conn = DBConnector()
+        try:
+            conn.execute("SET enable_seqscan = off")
+            for name in ["active_tall_teams", "active_tall_rich_teams"]:
+                plan = conn.explainPrepared(name)
+                self.assertTrue(Test.usesIndex(plan[0]["Plan"], "player_tall_team"),
+                                name + " should use Player_Tall_Team: " + str(plan))
+        finally:
+            conn.execute("RESET enable_seqscan")
+            conn.close()
+
+    @staticmethod
+    def usesIndex(plan, index=None) -> bool:
+        if "Index" in plan["Node Type"] and (index is None or plan.get("Index Name") == index):
+            return True
+        return any(Test.usesIndex(child, index) for child in plan.get("Plans", []))
+
+
+# *** DO NOT RUN EACH TEST MANUALLY ***
+if __name__ == '__main__':
+    unittest.main(verbosity=2, exit=False)
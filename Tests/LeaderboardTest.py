@@ -0,0 +1,49 @@
+import unittest
+import Solution
+from Utility.ReturnValue import ReturnValue
+from Tests.abstractTest import AbstractTest
+from Business.Match import Match
+from Business.Player import Player
+
+
+class Test(AbstractTest):
+    def setUp(self) -> None:
+        super().setUp()
+        self.assertEqual([ReturnValue.OK] * 3, Solution.addTeams([1, 2, 3]), "Should work")
+        self.assertEqual([ReturnValue.OK] * 2, Solution.addMatches([Match(1, "Domestic", 1, 2),
+                                                                    Match(2, "Domestic", 2, 1)]), "Should work")
+        self.assertEqual([ReturnValue.OK] * 9, Solution.addPlayers([Player(p, 1 if p <= 7 else 2, 20, 185, "Left")
+                                                                    for p in range(1, 10)]), "Should work")
+        for match, player, amount in [(1, 1, 2), (2, 1, 1), (1, 2, 3), (2, 3, 1), (1, 8, 1)]:
+            self.assertEqual(ReturnValue.OK, Solution.playerScoredInMatch(Match(match), Player(player), amount))
+
+    def test_SingleTeam(self) -> None:
+        self.assertEqual([2, 1, 3, 7, 6], Solution.mostGoalsForTeam(1), "Ties by ID descending")
+        self.assertEqual([8, 9], Solution.mostGoalsForTeam(2), "Should work")
+        self.assertEqual([], Solution.mostGoalsForTeam(3), "No players")
+
+    def test_AllTeams(self) -> None:
+        expected = [(team, Solution.mostGoalsForTeam(team)) for team in (1, 2, 3)]
+        self.assertEqual(expected, list(Solution.mostGoalsForAllTeams()), "Same as one call per team")
+        self.assertEqual([(1, [2, 1]), (2, [8, 9]), (3, [])], list(Solution.mostGoalsForAllTeams(limit=2)))
+        self.assertEqual([], list(Solution.mostGoalsForAllTeams(limit=0)), "Should work")
+
+    def test_AbandonedStream(self) -> None:
+        stream = Solution.mostGoalsForAllTeams()
+        self.assertEqual(1, next(stream)[0], "Should work")
+        stream.close()
+        self.assertEqual([8, 9], Solution.mostGoalsForTeam(2), "Connection still usable")
+
+    def test_TotalsFollowWrites(self) -> None:
+        self.assertEqual(ReturnValue.OK, Solution.playerDidntScoreInMatch(Match(1), Player(2)), "Should work")
+        self.assertEqual([1, 3, 7, 6, 5], Solution.mostGoalsForTeam(1), "Player 2 scored nothing anymore")
+        self.assertEqual(ReturnValue.OK, Solution.deletePlayer(Player(1)), "Should work")
+        self.assertEqual([3, 7, 6, 5, 4], Solution.mostGoalsForTeam(1), "Deleted with the player")
+        self.assertEqual(ReturnValue.OK, Solution.deleteMatch(Match(2)), "Should work")
+        self.assertEqual([7, 6, 5, 4, 3], Solution.mostGoalsForTeam(1), "Goals cascade with the match")
+        self.assertEqual([(1, [7, 6, 5, 4, 3]), (2, [8, 9]), (3, [])], list(Solution.mostGoalsForAllTeams()))
+
+
+# *** DO NOT RUN EACH TEST MANUALLY ***
+if __name__ == '__main__':
+    unittest.main(verbosity=2, exit=False)
@@ -0,0 +1,101 @@
+import os
+import time
+import unittest
+from unittest import mock
+import Solution
+from Utility.ReturnValue import ReturnValue
+from Utility.ConnectionPool import ConnectionPool
+from Utility.DBConnector import DBConnector
+from Tests.abstractTest import AbstractTest
+
+
+class Test(AbstractTest):
+    # several connections at once, a pinned connection would hide them
+    isolated = False
+
+    def test_ConnectionIsReused(self) -> None:
+        first = DBConnector()
+        connection = first.connection
+        first.close()
+        second = DBConnector()
+        self.assertIs(connection, second.connection, "Closed connection should be borrowed again")
+        second.close()
+
+    def test_PoolIsBounded(self) -> None:
+        DBConnector.configurePool(minSize=0, maxSize=2, timeout=0.1)
+        try:
+            borrowed = [DBConnector(), DBConnector()]
+            self.assertRaises(Exception, DBConnector)
+            for conn in borrowed:
+                conn.close()
+            self.assertEqual(ReturnValue.OK, Solution.addTeam(1), "Should work once connections are returned")
+        finally:
+            DBConnector.configurePool()
+
+    def test_IdleConnectionsAreReaped(self) -> None:
+        pool = ConnectionPool(DBConnector.config(), minSize=1, maxSize=3, maxIdle=0.05)
+        try:
+            borrowed = [pool.acquire() for _ in range(3)]
+            for connection in borrowed:
+                pool.release(connection)
+            self.assertEqual((3, 0), pool.stats(), "Should work")
+            time.sleep(0.1)
+            connection = pool.acquire()
+            self.assertIs(borrowed[2], connection, "The most recently used connection is kept")
+            self.assertEqual((0, 1), pool.stats(), "Idle connections above minSize are closed")
+            self.assertTrue(all(stale.closed != 0 for stale in borrowed[:2]), "Should be closed")
+            pool.release(connection)
+        finally:
+            pool.close()
+
+    def test_DeadConnectionIsReplaced(self) -> None:
+        pool = ConnectionPool(DBConnector.config(), minSize=0, maxSize=1, pingAfter=0)
+        try:
+            connection = pool.acquire()
+            pool.release(connection)
+            AbstractTest.terminate(connection.get_backend_pid())
+            replacement = pool.acquire()
+            self.assertIsNot(connection, replacement, "The ping should find the connection dead")
+            self.assertEqual((0, 1), pool.stats(), "The dead connection is not counted")
+            pool.release(replacement)
+
+            replacement.close()
+            fresh = pool.acquire()
+            self.assertIsNot(replacement, fresh, "A connection closed while idle is not borrowed")
+            pool.release(fresh)
+        finally:
+            pool.close()
+
+    def test_BrokenConnectionIsDiscarded(self) -> None:
+        pool = ConnectionPool(DBConnector.config(), minSize=0, maxSize=2)
+        try:
+            first, second = pool.acquire(), pool.acquire()
+            pool.release(first, broken=True)
+            self.assertEqual((0, 1), pool.stats(), "A broken connection is not returned to the idle list")
+            self.assertNotEqual(0, first.closed, "Should be closed")
+            pool.release(second)
+            self.assertEqual((1, 0), pool.stats(), "Should work")
+        finally:
+            pool.close()
+
+    def test_ForkStartsOver(self) -> None:
+        pool = ConnectionPool(DBConnector.config(), minSize=0, maxSize=1)
+        parent = pool.acquire()
+        pool.release(parent)
+        try:
+            with mock.patch("Utility.ConnectionPool.os.getpid", return_value=os.getpid() + 1):
+                child = pool.acquire()
+                self.assertIsNot(parent, child, "The parent's connections are not shared with the child")
+                self.assertEqual((0, 1), pool.stats(), "The parent's connections are forgotten")
+                pool.release(child)
+                self.assertEqual((1, 0), pool.stats(), "Should work")
+                pool.close()
+            self.assertEqual(0, parent.closed, "The parent's connection is left to the parent")
+        finally:
+            parent.close()
+            pool.close()
+
+
+# *** DO NOT RUN EACH TEST MANUALLY ***
+if __name__ == '__main__':
+    unittest.main(verbosity=2, exit=False)
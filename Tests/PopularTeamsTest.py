@@ -0,0 +1,72 @@
+import random
+import unittest
+import Solution
+from Utility.ReturnValue import ReturnValue
+from Utility.DBConnector import DBConnector
+from Tests.abstractTest import AbstractTest
+from Business.Match import Match
+from Business.Stadium import Stadium
+
+# popularTeams before Team_Popularity, aggregating every match on each call
+RECOMPUTED = "SELECT Home_Team_Id " \
+             "FROM Home_Teams_Stadiums " \
+             "GROUP BY Home_Team_Id " \
+             "HAVING MIN(Spectators)>40000 " \
+             "UNION " \
+             "SELECT Away_Team_Id " \
+             "FROM Match " \
+             "WHERE Away_Team_Id NOT IN(SELECT Home_Team_Id FROM Match) " \
+             "ORDER BY Home_Team_Id DESC " \
+             "LIMIT 10"
+
+
+class Test(AbstractTest):
+    def recomputed(self):
+        conn = DBConnector()
+        try:
+            return [row[0] for row in conn.execute(RECOMPUTED)[1].rows]
+        finally:
+            conn.close()
+
+    def test_Summary(self) -> None:
+        self.assertEqual([ReturnValue.OK] * 4, Solution.addTeams([1, 2, 3, 4]), "Should work")
+        self.assertEqual([ReturnValue.OK] * 2, Solution.addStadiums([Stadium(1, 90000, 1), Stadium(2, 90000, 2)]))
+        self.assertEqual([ReturnValue.OK] * 3, Solution.addMatches([Match(1, "Domestic", 1, 2),
+                                                                    Match(2, "Domestic", 1, 3),
+                                                                    Match(3, "Domestic", 2, 4)]))
+        self.assertEqual([4, 3], Solution.popularTeams(), "Only played away")
+        self.assertEqual(ReturnValue.OK, Solution.matchInStadium(Match(1), Stadium(1), 50000), "Should work")
+        self.assertEqual(ReturnValue.OK, Solution.matchInStadium(Match(2), Stadium(2), 30000), "Should work")
+        self.assertEqual([4, 3], Solution.popularTeams(), "Team 1 had a home match of 30000")
+        self.assertEqual(ReturnValue.OK, Solution.matchNotInStadium(Match(2), Stadium(2)), "Should work")
+        self.assertEqual([4, 3, 1], Solution.popularTeams(), "The minimum is recounted")
+        self.assertEqual(ReturnValue.OK, Solution.deleteMatch(Match(2)), "Should work")
+        self.assertEqual([4, 1], Solution.popularTeams(), "Team 3 played no match anymore")
+        self.assertEqual(ReturnValue.OK, Solution.deleteStadium(Stadium(1)), "Should work")
+        self.assertEqual([4], Solution.popularTeams(), "Team 1 home matches had no attendance")
+        self.assertEqual(self.recomputed(), Solution.popularTeams(), "Same as aggregating")
+
+    def test_Random(self) -> None:
+        rand = random.Random(236363)
+        teams, stadiums = range(1, 31), range(1, 11)
+        self.assertNotIn(ReturnValue.ERROR, Solution.addTeams(teams))
+        self.assertNotIn(ReturnValue.ERROR, Solution.addStadiums(Stadium(s, 90000, s) for s in stadiums))
+        matches = [Match(m, "Domestic", *rand.sample(teams, 2)) for m in range(1, 201)]
+        self.assertNotIn(ReturnValue.ERROR, Solution.addMatches(matches))
+        for match in matches:
+            for stadium in rand.sample(stadiums, rand.randint(0, 2)):
+                Solution.matchInStadium(match, Stadium(stadium), rand.choice([30000, 45000, 60000]))
+        self.assertEqual(self.recomputed(), Solution.popularTeams(), "Same as aggregating")
+        for match in rand.sample(matches, 50):
+            for stadium in stadiums:
+                Solution.matchNotInStadium(match, Stadium(stadium))
+        for match in rand.sample(matches, 50):
+            Solution.deleteMatch(match)
+            self.assertEqual(self.recomputed(), Solution.popularTeams(), "Same as aggregating")
+        Solution.deleteStadium(Stadium(1))
+        self.assertEqual(self.recomputed(), Solution.popularTeams(), "Same as aggregating")
+
+
+# *** DO NOT RUN EACH TEST MANUALLY ***
+if __name__ == '__main__':
+    unittest.main(verbosity=2, exit=False)
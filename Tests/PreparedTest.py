@@ -0,0 +1,79 @@
+import unittest
+import Solution
+from Utility.ReturnValue import ReturnValue
+from Utility.DBConnector import DBConnector
+from Utility.Exceptions import DatabaseException
+from Utility.QueryHooks import HistogramCollector
+from Tests.abstractTest import AbstractTest
+from Business.Match import Match
+
+DBConnector.prepare("prepared_test_missing_table", "SELECT * FROM Prepared_Test_Missing WHERE Id=$1")
+
+
+class Test(AbstractTest):
+    def setUp(self) -> None:
+        super().setUp()
+        self.assertEqual([ReturnValue.OK] * 2, Solution.addTeams([1, 2]), "Should work")
+        self.assertEqual(ReturnValue.OK, Solution.addMatch(Match(1, "Domestic", 1, 2)), "Should work")
+        self.histogram = HistogramCollector()
+        DBConnector.addHook(self.histogram)
+        self.conn = DBConnector()
+
+    def tearDown(self) -> None:
+        try:
+            # test_PrepareFails leaves the transaction aborted
+            self.conn.rollback()
+            # later tests must not inherit a statement planned against the altered schema
+            self.conn.connection.prepared.clear()
+            self.conn.execute("DEALLOCATE ALL")
+        finally:
+            self.conn.close()
+            DBConnector.removeHook(self.histogram)
+            super().tearDown()
+
+    def profile(self):
+        return self.conn.executePrepared("get_match_profile", (1,))[1].rows
+
+    def failures(self) -> int:
+        return self.histogram.summary()["get_match_profile"]["errors"]
+
+    def test_Deallocated(self) -> None:
+        self.assertEqual([(1, "Domestic", 1, 2)], self.profile(), "Should work")
+        self.conn.execute("DEALLOCATE get_match_profile")
+        self.assertEqual([(1, "Domestic", 1, 2)], self.profile(), "Prepared again and retried")
+        self.assertEqual(1, self.failures(), "The first EXECUTE failed")
+        self.assertIn("get_match_profile", self.conn.connection.prepared, "Should work")
+
+        self.conn.execute("DEALLOCATE ALL")
+        self.assertEqual([(1, "Domestic", 1, 2)], self.profile(), "Every statement was lost")
+        self.assertEqual(2, self.failures(), "Should work")
+
+    def test_StalePlan(self) -> None:
+        self.assertEqual([(1, "Domestic", 1, 2)], self.profile(), "Should work")
+        self.conn.execute("ALTER TABLE Match ADD COLUMN Prepared_Test INTEGER")
+        self.assertEqual([(1, "Domestic", 1, 2, None)], self.profile(), "SELECT * changed its result type")
+        self.assertEqual(1, self.failures(), "The cached plan was rejected once")
+
+    def test_StaleInTransaction(self) -> None:
+        self.assertEqual([(1, "Domestic", 1, 2)], self.profile(), "Should work")
+        self.conn.execute("ALTER TABLE Match ADD COLUMN Prepared_Test INTEGER")
+        with self.assertRaises(DatabaseException.UNKNOWN_ERROR):
+            with self.conn.transaction():
+                self.profile()
+        self.assertEqual([(1, "Domestic", 1, 2, None)], self.profile(), "Retried once outside the transaction")
+
+        self.conn.execute("DEALLOCATE get_match_profile")
+        with self.assertRaises(DatabaseException.UNKNOWN_ERROR):
+            with self.conn.transaction():
+                self.profile()
+        self.assertEqual([(1, "Domestic", 1, 2, None)], self.profile(), "Lost statements too")
+
+    def test_PrepareFails(self) -> None:
+        with self.assertRaises(DatabaseException.UNKNOWN_ERROR):
+            self.conn.executePrepared("prepared_test_missing_table", (1,))
+        self.assertNotIn("prepared_test_missing_table", self.conn.connection.prepared, "Should work")
+
+
+# *** DO NOT RUN EACH TEST MANUALLY ***
+if __name__ == '__main__':
+    unittest.main(verbosity=2, exit=False)
@@ -0,0 +1,66 @@
+import time
+import unittest
+import Solution
+from Utility.ReturnValue import ReturnValue
+from Utility.DBConnector import DBConnector
+from Tests.abstractTest import AbstractTest
+from Business.Match import Match
+from Business.Player import Player
+from Business.Stadium import Stadium
+
+
+class Test(AbstractTest):
+    def setUp(self) -> None:
+        super().setUp()
+        Solution.configureProfileCaches()
+        self.assertEqual([ReturnValue.OK] * 2, Solution.addTeams([1, 2]), "Should work")
+
+    def tearDown(self) -> None:
+        Solution.configureProfileCaches()
+        super().tearDown()
+
+    def test_WriteThrough(self) -> None:
+        self.assertEqual(ReturnValue.OK, Solution.addPlayer(Player(1, 1, 20, 185, "Left")), "Should work")
+        before = Solution.profileCacheStats()["Player"]
+        self.assertEqual(185, Solution.getPlayerProfile(1).getHeight(), "Should work")
+        after = Solution.profileCacheStats()["Player"]
+        self.assertEqual(before["hits"] + 1, after["hits"], "Filled by addPlayer")
+
+        self.assertEqual(ReturnValue.OK, Solution.deletePlayer(Player(1)), "Should work")
+        self.assertIsNone(Solution.getPlayerProfile(1).getPlayerID(), "Invalidated by deletePlayer")
+        self.assertEqual(after["misses"] + 1, Solution.profileCacheStats()["Player"]["misses"], "Should work")
+
+    def test_FilledOnRead(self) -> None:
+        conn = DBConnector()
+        try:
+            conn.execute("INSERT INTO Stadium VALUES(1, 500, 1)")
+        finally:
+            conn.close()
+        self.assertEqual(500, Solution.getStadiumProfile(1).getCapacity(), "Miss")
+        self.assertEqual(500, Solution.getStadiumProfile(1).getCapacity(), "Hit")
+        self.assertEqual(1, Solution.profileCacheStats()["Stadium"]["hits"], "Should work")
+
+    def test_Cascade(self) -> None:
+        self.assertEqual(ReturnValue.OK, Solution.addMatch(Match(1, "Domestic", 1, 2)), "Should work")
+        self.assertEqual(ReturnValue.OK, Solution.addStadium(Stadium(1, 500, 2)), "Should work")
+        conn = DBConnector()
+        try:
+            conn.execute("DELETE FROM Team WHERE Team_Id=2")
+        finally:
+            conn.close()
+        Solution.invalidateTeam(2)
+        self.assertIsNone(Solution.getMatchProfile(1).getMatchID(), "Cascaded with the away team")
+        self.assertIsNone(Solution.getStadiumProfile(1).getStadiumID(), "Cascaded with the team it belongs to")
+
+    def test_EvictionAndTTL(self) -> None:
+        Solution.configureProfileCaches(maxSize=2, ttl=0.05)
+        self.assertEqual([ReturnValue.OK] * 3, Solution.addMatches([Match(m, "Domestic", 1, 2) for m in (1, 2, 3)]))
+        self.assertEqual(1, Solution.profileCacheStats()["Match"]["evictions"], "Only two matches fit")
+        time.sleep(0.1)
+        self.assertEqual("Domestic", Solution.getMatchProfile(3).getCompetition(), "Expired, read again")
+        self.assertEqual(1, Solution.profileCacheStats()["Match"]["expirations"], "Should work")
+
+
+# *** DO NOT RUN EACH TEST MANUALLY ***
+if __name__ == '__main__':
+    unittest.main(verbosity=2, exit=False)
@@ -0,0 +1,91 @@
+import json
+import os
+import tempfile
+import unittest
+import Solution
+import Utility.DBConnector as Connector
+from Utility.ReturnValue import ReturnValue
+from Utility.QueryHooks import HistogramCollector, JsonLinesExporter, QueryHook
+from Tests.abstractTest import AbstractTest
+
+
+class FailingHook(QueryHook):
+    def beforeExecute(self, event):
+        raise RuntimeError("A hook must never fail the query")
+
+
+class Test(AbstractTest):
+    def setUp(self) -> None:
+        super().setUp()
+        self.histogram = HistogramCollector()
+        Connector.DBConnector.addHook(self.histogram)
+
+    def tearDown(self) -> None:
+        Connector.DBConnector.removeHook(self.histogram)
+        super().tearDown()
+
+    def test_Histogram(self) -> None:
+        self.assertEqual(ReturnValue.OK, Solution.addTeam(1), "Should work")
+        self.assertEqual(ReturnValue.BAD_PARAMS, Solution.addTeam(-1), "Check violation")
+        self.assertEqual(ReturnValue.OK, Solution.addTeam(2), "Should work")
+
+        summary = self.histogram.summary()
+        self.assertIn("add_team", summary, "Labelled by the template name")
+        self.assertEqual(3, summary["add_team"]["count"], "Failed statements are counted too")
+        self.assertEqual(1, summary["add_team"]["errors"], "Should work")
+        self.assertEqual(2, summary["add_team"]["rows"], "Should work")
+        self.assertEqual(3, sum(summary["add_team"]["buckets"]), "Should work")
+        self.assertLessEqual(summary["add_team"]["p50_ms"], summary["add_team"]["max_ms"], "Should work")
+
+        self.histogram.reset()
+        self.assertEqual({}, self.histogram.summary(), "Should work")
+
+    def test_Stream(self) -> None:
+        self.assertEqual([ReturnValue.OK] * 3, Solution.addTeams([1, 2, 3]), "Should work")
+        self.histogram.reset()
+        self.assertEqual([(1, []), (2, []), (3, [])], list(Solution.mostGoalsForAllTeams()), "Should work")
+        summary = self.histogram.summary()
+        self.assertIn("most_goals_for_all_teams", summary, "Labelled by the template it mirrors")
+        self.assertEqual(1, summary["most_goals_for_all_teams"]["count"], "One event per stream")
+        self.assertEqual(3, summary["most_goals_for_all_teams"]["rows"], "One row per team")
+
+        stream = Solution.mostGoalsForAllTeams()
+        self.assertEqual((1, []), next(stream), "Should work")
+        stream.close()
+        summary = self.histogram.summary()
+        self.assertEqual(2, summary["most_goals_for_all_teams"]["count"], "Reported when closed early")
+        self.assertEqual(0, summary["most_goals_for_all_teams"]["errors"], "Should work")
+
+    def test_FailingHook(self) -> None:
+        hook = FailingHook()
+        Connector.DBConnector.addHook(hook)
+        try:
+            self.assertEqual(ReturnValue.OK, Solution.addTeam(1), "Should work")
+        finally:
+            Connector.DBConnector.removeHook(hook)
+        self.assertEqual(1, self.histogram.summary()["add_team"]["count"], "Other hooks still run")
+
+    def test_JsonLines(self) -> None:
+        path = os.path.join(tempfile.mkdtemp(), "queries.jsonl")
+        exporter = JsonLinesExporter(path, withQuery=True)
+        Connector.DBConnector.addHook(exporter)
+        try:
+            self.assertEqual(ReturnValue.OK, Solution.addTeam(1), "Should work")
+            self.assertEqual(ReturnValue.OK, Solution.addTeam(2), "Should work")
+        finally:
+            Connector.DBConnector.removeHook(exporter)
+            exporter.close()
+
+        with open(path) as lines:
+            records = [json.loads(line) for line in lines]
+        self.assertEqual(["add_team", "add_team"], [record["name"] for record in records], "Should work")
+        self.assertEqual(1, records[0]["params"], "Should work")
+        self.assertEqual(1, records[0]["rows"], "Should work")
+        self.assertIsNone(records[0]["error"], "Should work")
+        self.assertIn("$1", records[0]["query"], "The template text is written")
+        os.remove(path)
+
+
+# *** DO NOT RUN EACH TEST MANUALLY ***
+if __name__ == '__main__':
+    unittest.main(verbosity=2, exit=False)
@@ -0,0 +1,72 @@
+import array
+import collections
+import unittest
+from Utility.DBConnector import ResultSet
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+# what a cursor description holds for each column, the type codes are postgres type OIDs
+Column = collections.namedtuple("Column", ["name", "type_code"])
+DESCRIPTION = [Column("team_id", 23), Column("height", 701), Column("foot", 1043)]
+ROWS = [(1, 185.5, "Left"), (2, None, "Right"), (3, 190.0, None)]
+
+
+class Test(unittest.TestCase):
+    # ResultSet is plain Python, none of these tests needs a database
+    def build(self, columnar: bool) -> ResultSet:
+        # a columnar ResultSet empties the list it is given, like the one fetchall() returns
+        return ResultSet(DESCRIPTION, list(ROWS), columnar)
+
+    def test_SameAsRows(self) -> None:
+        rows, columnar = self.build(False), self.build(True)
+        self.assertEqual(ROWS, list(rows.rows), "Should work")
+        self.assertEqual(ROWS, list(columnar.rows), "Rows are built on access")
+        self.assertEqual(rows.size(), columnar.size(), "Should work")
+        self.assertFalse(columnar.isEmpty(), "Should work")
+        self.assertEqual(str(rows), str(columnar), "Should print the same")
+        self.assertEqual(ROWS[1], columnar.rows[1], "Should work")
+        self.assertEqual(ROWS[-1], columnar.rows[-1], "Negative index")
+        self.assertEqual(ROWS[1:], columnar.rows[1:], "Slice")
+        self.assertRaises(IndexError, lambda: columnar.rows[3])
+        self.assertEqual(rows[0]["Team_Id"], columnar[0]["Team_Id"], "Row by index, column by name")
+
+    def test_Empty(self) -> None:
+        for columnar in (False, True):
+            result = ResultSet(DESCRIPTION, [], columnar)
+            self.assertEqual(0, result.size(), "Should work")
+            self.assertTrue(result.isEmpty(), "Should work")
+            self.assertEqual([], result.column("Team_Id"), "Should work")
+            self.assertEqual(str(ResultSet()), str(result), "Should work")
+
+    def test_Column(self) -> None:
+        for columnar in (False, True):
+            result = self.build(columnar)
+            self.assertEqual([1, 2, 3], list(result.column("Team_Id")), "Case insensitive")
+            self.assertEqual(["Left", "Right", None], list(result.column("foot")), "Should work")
+            self.assertEqual([], result.column("Age"), "Unknown column")
+
+    def test_Types(self) -> None:
+        result = self.build(True)
+        team_ids = result.column("team_id")
+        self.assertIsInstance(team_ids, array.array, "Integers are kept in a typed array")
+        self.assertEqual('q', team_ids.typecode, "Should work")
+        self.assertIsInstance(result.column("height"), list, "A NULL keeps the column a list")
+        self.assertEqual([185.5, None, 190.0], result.column("height"), "NULLs are kept")
+        self.assertIsInstance(result.column("foot"), list, "Text is not typed")
+
+    @unittest.skipIf(numpy is None, "NumPy is not installed")
+    def test_Numpy(self) -> None:
+        result = self.build(True)
+        team_ids = result.columnAsNumpy("team_id")
+        self.assertEqual(numpy.int64, team_ids.dtype, "Should work")
+        self.assertEqual([1, 2, 3], team_ids.tolist(), "Should work")
+        self.assertEqual([185.5, None, 190.0], result.columnAsNumpy("height").tolist(), "An object array")
+        self.assertEqual([1, 2, 3], self.build(False).columnAsNumpy("team_id").tolist(), "Row mode too")
+
+
+# *** DO NOT RUN EACH TEST MANUALLY ***
+if __name__ == '__main__':
+    unittest.main(verbosity=2, exit=False)
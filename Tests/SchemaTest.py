@@ -0,0 +1,79 @@
+import unittest
+import Solution
+from Utility.ReturnValue import ReturnValue
+from Utility.DBConnector import DBConnector
+from Tests.abstractTest import AbstractTest
+from Business.Match import Match
+from Business.Player import Player
+from Business.Stadium import Stadium
+
+
+class Test(AbstractTest):
+    def test_CreateTwice(self) -> None:
+        self.assertEqual(ReturnValue.OK, Solution.addTeam(1), "Should work")
+        self.assertEqual(ReturnValue.OK, Solution.addStadium(Stadium(1, 100, 1)), "Should work")
+        self.assertIn("Schema", Solution.createTables(), "Existing objects should be kept")
+        self.assertEqual(ReturnValue.ALREADY_EXISTS, Solution.addTeam(1), "Rows should survive")
+        self.assertEqual(0, Solution.stadiumTotalGoals(1), "Stadium_Goals should survive")
+
+    def test_Backfill(self) -> None:
+        self.assertEqual([ReturnValue.OK] * 2, Solution.addTeams([1, 2]), "Should work")
+        self.assertEqual(ReturnValue.OK, Solution.addMatch(Match(1, "Domestic", 1, 2)), "Should work")
+        self.assertEqual(ReturnValue.OK, Solution.addPlayer(Player(1, 1, 20, 185, "Left")), "Should work")
+        self.assertEqual(ReturnValue.OK, Solution.addStadium(Stadium(1, 100, 1)), "Should work")
+        self.assertEqual(ReturnValue.OK, Solution.matchInStadium(Match(1), Stadium(1), 50), "Should work")
+        self.assertEqual(ReturnValue.OK, Solution.playerScoredInMatch(Match(1), Player(1), 3), "Should work")
+        conn = DBConnector()
+        try:
+            # a database filled before Stadium_Goals existed
+            conn.execute("DELETE FROM Stadium_Goals")
+        finally:
+            conn.close()
+        self.assertIn("Schema", Solution.createTables(), "Should work")
+        self.assertEqual(3, Solution.stadiumTotalGoals(1), "Filled from Took_Place and Scored")
+        self.assertEqual([1], Solution.getMostAttractiveStadiums(), "Should work")
+
+    def test_Profile(self) -> None:
+        timings = Solution.createTables(profile=True)
+        self.assertEqual({name for name, _ in Solution.SCHEMA} | {"Schema"}, set(timings), "Every object is timed")
+        self.assertTrue(all(seconds >= 0 for seconds in timings.values()))
+        self.assertEqual(ReturnValue.OK, Solution.addTeam(1), "Triggers replaced, not doubled")
+        self.assertEqual(ReturnValue.OK, Solution.addStadium(Stadium(1, 100, 1)), "Should work")
+        self.assertEqual(0, Solution.stadiumTotalGoals(1), "Should work")
+
+    def test_Clear(self) -> None:
+        self.assertEqual([ReturnValue.OK] * 2, Solution.addTeams([1, 2]), "Should work")
+        self.assertEqual(ReturnValue.OK, Solution.addStadium(Stadium(1, 100, 1)), "Should work")
+        Solution.clearTables()
+        self.assertIsNone(Solution.getStadiumProfile(1).getStadiumID(), "Every table should be empty")
+        self.assertEqual([], Solution.getMostAttractiveStadiums(), "Stadium_Goals should be empty")
+        self.assertEqual([ReturnValue.OK] * 2, Solution.addTeams([1, 2]), "Should work again")
+
+    # the test's transaction is rolled back, the shared schema comes back with it
+    def test_Drop(self) -> None:
+        self.assertEqual(ReturnValue.OK, Solution.addTeam(1), "Should work")
+        Solution.dropTables()
+        conn = DBConnector()
+        try:
+            _, result = conn.execute("SELECT COUNT(*) FROM pg_catalog.pg_tables WHERE schemaname='public'")
+            self.assertEqual(0, result.rows[0][0], "Every table should be dropped")
+            _, result = conn.execute("SELECT COUNT(*) FROM pg_catalog.pg_proc P "
+                                     "JOIN pg_catalog.pg_namespace N ON N.oid=P.pronamespace "
+                                     "WHERE N.nspname='public' AND P.proname=ANY(%s)",
+                                     params=([name.lower() for name in Solution.FUNCTIONS],))
+            self.assertEqual(0, result.rows[0][0], "Every function of SCHEMA should be dropped")
+        finally:
+            conn.close()
+        Solution.clearTables()
+        self.assertIn("Schema", Solution.createTables(), "Should work after a drop")
+        self.assertEqual(ReturnValue.OK, Solution.addTeam(1), "Should work")
+
+    def test_ClearWithoutSchema(self) -> None:
+        Solution.dropTables()
+        Solution.clearTables()
+        self.assertIn("Schema", Solution.createTables(), "Should work")
+
+
+# *** DO NOT RUN EACH TEST MANUALLY ***
+if __name__ == '__main__':
+    unittest.main(verbosity=2, exit=False)
@@ -0,0 +1,85 @@
+import json
+import os
+import tempfile
+import unittest
+import Solution
+import Utility.DBConnector as Connector
+from Utility.ReturnValue import ReturnValue
+from Tests.abstractTest import AbstractTest
+
+
+class Test(AbstractTest):
+    def setUp(self) -> None:
+        super().setUp()
+        self.path = os.path.join(tempfile.mkdtemp(), "slow.log")
+        self.log = None
+
+    def tearDown(self) -> None:
+        if self.log is not None:
+            Connector.DBConnector.removeHook(self.log)
+            self.log.close()
+        super().tearDown()
+
+    def records(self) -> list:
+        self.log.flush()
+        with open(self.path) as lines:
+            return [json.loads(line) for line in lines]
+
+    def test_Plans(self) -> None:
+        self.log = Connector.DBConnector.logSlowQueries(self.path, thresholdMs=0, minInterval=0, labelInterval=0)
+        self.assertEqual([], Solution.popularTeams(), "Should work")
+        self.assertEqual([], Solution.getMostAttractiveStadiums(), "Should work")
+        self.assertEqual(ReturnValue.OK, Solution.addTeam(1), "Should work")
+
+        records = {record["label"]: record for record in self.records()}
+        self.assertNotIn("plan", records["add_team"], "Writes are logged without a plan")
+        self.assertEqual([1], records["add_team"]["values"], "Should work")
+        for name in ("popular_teams", "most_attractive_stadiums"):
+            self.assertIn("Plan", records[name]["plan"][0], "Should work")
+            self.assertIsNotNone(records[name]["explained_ms"], "EXPLAIN ANALYZE ran the statement")
+            self.assertNotIn("explain_error", records[name], "Should work")
+            self.assertTrue(records[name]["analyzed"], "Registered read templates are analyzed")
+        self.assertEqual(2, self.log.stats()["captured"], "Should work")
+
+    def test_PlainExplain(self) -> None:
+        self.log = Connector.DBConnector.logSlowQueries(self.path, thresholdMs=0, minInterval=0, labelInterval=0)
+        conn = Connector.DBConnector()
+        try:
+            conn.execute("SELECT pg_advisory_xact_lock(%s)", params=(236363,))
+        finally:
+            conn.close()
+
+        records = self.records()
+        self.assertEqual(1, len(records), "Should work")
+        self.assertIn("Plan", records[0]["plan"][0], "Planned")
+        self.assertFalse(records[0]["analyzed"], "Not run a second time, it may have side effects")
+        self.assertIsNone(records[0]["explained_ms"], "Should work")
+
+    def test_Stream(self) -> None:
+        self.log = Connector.DBConnector.logSlowQueries(self.path, thresholdMs=0, minInterval=0, labelInterval=0)
+        self.assertEqual([], list(Solution.mostGoalsForAllTeams()), "No teams")
+
+        records = self.records()
+        self.assertEqual(["most_goals_for_all_teams"], [record["label"] for record in records], "Should work")
+        self.assertTrue(records[0]["analyzed"], "Explained through the template the stream mirrors")
+        self.assertEqual([5], records[0]["values"], "Should work")
+
+    def test_RateLimit(self) -> None:
+        self.log = Connector.DBConnector.logSlowQueries(self.path, thresholdMs=0, minInterval=0, labelInterval=60)
+        for _ in range(3):
+            self.assertEqual([], Solution.popularTeams(), "Should work")
+
+        records = self.records()
+        self.assertEqual(3, len(records), "Every slow statement is logged")
+        self.assertEqual(1, len([record for record in records if "plan" in record]), "One plan per label a minute")
+        self.assertEqual({"captured": 1, "skipped": 2}, self.log.stats(), "Should work")
+
+    def test_Threshold(self) -> None:
+        self.log = Connector.DBConnector.logSlowQueries(self.path, thresholdMs=60000)
+        self.assertEqual([], Solution.popularTeams(), "Should work")
+        self.assertEqual([], self.records(), "Nothing is that slow")
+
+
+# *** DO NOT RUN EACH TEST MANUALLY ***
+if __name__ == '__main__':
+    unittest.main(verbosity=2, exit=False)
@@ -0,0 +1,52 @@
+import unittest
+import Solution
+from Utility.ReturnValue import ReturnValue
+from Tests.abstractTest import AbstractTest
+from Business.Match import Match
+from Business.Stadium import Stadium
+from Business.Player import Player
+
+
+class Test(AbstractTest):
+    def setUp(self) -> None:
+        super().setUp()
+        self.assertEqual([ReturnValue.OK] * 3, Solution.addTeams([1, 2, 3]), "Should work")
+        self.assertEqual([ReturnValue.OK] * 2, Solution.addMatches([Match(1, "Domestic", 1, 2),
+                                                                    Match(2, "Domestic", 2, 3)]), "Should work")
+        self.assertEqual([ReturnValue.OK] * 3, Solution.addStadiums([Stadium(1, 100, 1), Stadium(2, 100, 2),
+                                                                     Stadium(3, 100, None)]), "Should work")
+        self.assertEqual([ReturnValue.OK] * 2, Solution.addPlayers([Player(1, 1, 20, 185, "Left"),
+                                                                    Player(2, 2, 20, 185, "Left")]), "Should work")
+
+    def test_TotalsFollowWrites(self) -> None:
+        self.assertEqual(ReturnValue.OK, Solution.playerScoredInMatch(Match(1), Player(1), 3), "Should work")
+        self.assertEqual(ReturnValue.OK, Solution.matchInStadium(Match(1), Stadium(1), 500), "Should work")
+        self.assertEqual(ReturnValue.OK, Solution.matchInStadium(Match(2), Stadium(2), 500), "Should work")
+        self.assertEqual(ReturnValue.OK, Solution.playerScoredInMatch(Match(2), Player(2), 1), "Should work")
+        self.assertEqual(ReturnValue.OK, Solution.playerScoredInMatch(Match(1), Player(2), 2), "Should work")
+        self.assertEqual(5, Solution.stadiumTotalGoals(1), "Goals scored before and after the match was placed")
+        self.assertEqual(1, Solution.stadiumTotalGoals(2), "Should work")
+        self.assertEqual(0, Solution.stadiumTotalGoals(3), "No matches")
+        self.assertEqual([1, 2], Solution.getMostAttractiveStadiums(), "Stadium 3 hosted no match")
+
+        self.assertEqual(ReturnValue.OK, Solution.playerDidntScoreInMatch(Match(1), Player(1)), "Should work")
+        self.assertEqual(2, Solution.stadiumTotalGoals(1), "Should work")
+        self.assertEqual(ReturnValue.OK, Solution.deletePlayer(Player(2)), "Should work")
+        self.assertEqual(0, Solution.stadiumTotalGoals(1), "Goals cascade with the player")
+        self.assertEqual(0, Solution.stadiumTotalGoals(2), "Goals cascade with the player")
+        self.assertEqual([1, 2], Solution.getMostAttractiveStadiums(), "Ties are ordered by ID")
+
+    def test_MatchDeletion(self) -> None:
+        self.assertEqual(ReturnValue.OK, Solution.matchInStadium(Match(1), Stadium(2), 500), "Should work")
+        self.assertEqual(ReturnValue.OK, Solution.matchInStadium(Match(2), Stadium(1), 500), "Should work")
+        self.assertEqual(ReturnValue.OK, Solution.playerScoredInMatch(Match(1), Player(1), 4), "Should work")
+        self.assertEqual(ReturnValue.OK, Solution.playerScoredInMatch(Match(2), Player(2), 1), "Should work")
+        self.assertEqual([2, 1], Solution.getMostAttractiveStadiums(), "Should work")
+        self.assertEqual(ReturnValue.OK, Solution.deleteMatch(Match(1)), "Should work")
+        self.assertEqual(0, Solution.stadiumTotalGoals(2), "Goals cascade with the match")
+        self.assertEqual([1], Solution.getMostAttractiveStadiums(), "Stadium 2 hosts nothing anymore")
+
+
+# *** DO NOT RUN EACH TEST MANUALLY ***
+if __name__ == '__main__':
+    unittest.main(verbosity=2, exit=False)
@@ -0,0 +1,47 @@
+import unittest
+import Solution
+from Utility.ReturnValue import ReturnValue
+from Utility.DBConnector import DBConnector
+from Utility.Exceptions import DatabaseException
+from Tests.abstractTest import AbstractTest
+
+
+class Test(AbstractTest):
+    def test_StreamRows(self) -> None:
+        self.assertEqual([ReturnValue.OK] * 250, Solution.addTeams(range(1, 251)), "Should work")
+        conn = DBConnector()
+        try:
+            teams = [row[0] for row in conn.executeStream("SELECT Team_Id FROM Team ORDER BY Team_Id", batchSize=100)]
+            self.assertEqual(list(range(1, 251)), teams, "Every row should be streamed in order")
+            sizes = [len(batch) for batch in conn.executeStream("SELECT Team_Id FROM Team", batchSize=100, batches=True)]
+            self.assertEqual([100, 100, 50], sizes, "Rows should arrive in batches")
+        finally:
+            conn.close()
+
+    def test_ErrorWhileStreaming(self) -> None:
+        self.assertEqual([ReturnValue.OK] * 10, Solution.addTeams(range(1, 11)), "Should work")
+        conn = DBConnector()
+        try:
+            stream = conn.executeStream("SELECT 4/(Team_Id-5) FROM Team ORDER BY Team_Id", batchSize=2)
+            self.assertEqual(-1, next(stream)[0], "Should work")
+            with self.assertRaises(DatabaseException.UNKNOWN_ERROR):
+                list(stream)
+            self.assertEqual(10, conn.execute("SELECT COUNT(*) FROM Team")[1].rows[0][0], "Connection still usable")
+        finally:
+            conn.close()
+
+    def test_AbandonedStream(self) -> None:
+        self.assertEqual([ReturnValue.OK] * 10, Solution.addTeams(range(1, 11)), "Should work")
+        conn = DBConnector()
+        try:
+            stream = conn.executeStream("SELECT Team_Id FROM Team", batchSize=2)
+            next(stream)
+            stream.close()
+            self.assertEqual(10, conn.execute("SELECT COUNT(*) FROM Team")[1].rows[0][0], "Connection still usable")
+        finally:
+            conn.close()
+
+
+# *** DO NOT RUN EACH TEST MANUALLY ***
+if __name__ == '__main__':
+    unittest.main(verbosity=2, exit=False)
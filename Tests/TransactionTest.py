@@ -0,0 +1,46 @@
+import unittest
+import Solution
+from Utility.ReturnValue import ReturnValue
+from Utility.DBConnector import DBConnector
+from Utility.Exceptions import DatabaseException
+from Tests.abstractTest import AbstractTest
+from Business.Match import Match
+from Business.Stadium import Stadium
+from Business.Player import Player
+
+
+class Test(AbstractTest):
+    def test_Savepoint(self) -> None:
+        conn = DBConnector()
+        try:
+            with conn.transaction():
+                conn.execute("INSERT INTO Team(Team_Id) VALUES(1)")
+                with self.assertRaises(DatabaseException.UNIQUE_VIOLATION):
+                    with conn.transaction():
+                        conn.execute("INSERT INTO Team(Team_Id) VALUES(2)")
+                        conn.execute("INSERT INTO Team(Team_Id) VALUES(1)")
+                conn.execute("INSERT INTO Team(Team_Id) VALUES(3)")
+        finally:
+            conn.close()
+        self.assertEqual(ReturnValue.ALREADY_EXISTS, Solution.addTeam(1), "Committed with the transaction")
+        self.assertEqual(ReturnValue.OK, Solution.addTeam(2), "Rolled back with the savepoint")
+        self.assertEqual(ReturnValue.ALREADY_EXISTS, Solution.addTeam(3), "Committed with the transaction")
+
+    def test_RegisterMatch(self) -> None:
+        self.assertEqual([ReturnValue.OK] * 2, Solution.addTeams([1, 2]), "Should work")
+        self.assertEqual(ReturnValue.OK, Solution.addStadium(Stadium(1, 55000, 1)), "Should work")
+        self.assertEqual([ReturnValue.OK] * 2, Solution.addPlayers([Player(1, 1, 20, 185, "Left"),
+                                                                    Player(2, 2, 20, 185, "Left")]), "Should work")
+        self.assertEqual(ReturnValue.NOT_EXISTS,
+                         Solution.registerMatch(Match(1, "Domestic", 1, 2), Stadium(1), 40000,
+                                                [(Player(1), 2), (Player(7), 1)]), "Player 7 not exists")
+        self.assertIsNone(Solution.getMatchProfile(1).getMatchID(), "Nothing should be added")
+        self.assertEqual(ReturnValue.OK,
+                         Solution.registerMatch(Match(1, "Domestic", 1, 2), Stadium(1), 40000,
+                                                [(Player(1), 2), (Player(2), 1)]), "Should work")
+        self.assertEqual(3, Solution.stadiumTotalGoals(1), "Goals of both scorers")
+
+
+# *** DO NOT RUN EACH TEST MANUALLY ***
+if __name__ == '__main__':
+    unittest.main(verbosity=2, exit=False)
@@ -0,0 +1,44 @@
+import unittest
+import Solution
+from Utility.ReturnValue import ReturnValue
+from Tests.abstractTest import AbstractTest
+from Business.Match import Match
+from Business.Player import Player
+
+
+class Test(AbstractTest):
+    def setUp(self) -> None:
+        super().setUp()
+        self.assertEqual([ReturnValue.OK] * 2, Solution.addTeams([1, 2]), "Should work")
+        self.assertEqual([ReturnValue.OK] * 3, Solution.addMatches([Match(m, "Domestic", 1, 2) for m in (1, 2, 3)]))
+        self.assertEqual([ReturnValue.OK] * 3, Solution.addPlayers([Player(p, 1, 20, 185, "Left") for p in (1, 2, 3)]))
+        for match, player, amount in [(1, 1, 3), (1, 2, 1), (2, 1, 2), (2, 2, 2), (3, 1, 1), (3, 2, 1), (3, 3, 1)]:
+            self.assertEqual(ReturnValue.OK, Solution.playerScoredInMatch(Match(match), Player(player), amount))
+
+    def test_WinnersOfMatches(self) -> None:
+        self.assertEqual({1: [1], 2: [1, 2], 3: [], 7: []}, Solution.winnersOfMatches([1, 2, 3, 7, 1]),
+                         "Half of the goals or more")
+        self.assertEqual([1, 2], Solution.winnersOfMatch(2), "Should work")
+        self.assertEqual({}, Solution.winnersOfMatches([]), "Should work")
+
+    def test_PlayerIsWinnerMany(self) -> None:
+        pairs = [(player, match) for player in (1, 2, 3, 4) for match in (1, 2, 3, 4)]
+        expected = {pair: Solution.playerIsWinner(*pair) for pair in pairs}
+        self.assertEqual(expected, Solution.playerIsWinnerMany(pairs), "Same as one call per pair")
+        self.assertEqual(3, sum(expected.values()), "Should work")
+
+    def test_Totals(self) -> None:
+        self.assertEqual([4, 4, 3, 0], [Solution.matchTotalGoals(m) for m in (1, 2, 3, 7)], "Should work")
+        self.assertEqual(ReturnValue.OK, Solution.playerDidntScoreInMatch(Match(1), Player(1)), "Should work")
+        self.assertEqual(1, Solution.matchTotalGoals(1), "Should work")
+        self.assertEqual([2], Solution.winnersOfMatch(1), "The only scorer left")
+        self.assertEqual(ReturnValue.OK, Solution.deletePlayer(Player(2)), "Should work")
+        self.assertEqual([0, 2, 2], [Solution.matchTotalGoals(m) for m in (1, 2, 3)], "Goals cascade with the player")
+        self.assertEqual({1: [], 2: [1], 3: [1, 3]}, Solution.winnersOfMatches([1, 2, 3]), "Should work")
+        self.assertEqual(ReturnValue.OK, Solution.deleteMatch(Match(2)), "Should work")
+        self.assertEqual(0, Solution.matchTotalGoals(2), "Match doesn't exist")
+
+
+# *** DO NOT RUN EACH TEST MANUALLY ***
+if __name__ == '__main__':
+    unittest.main(verbosity=2, exit=False)
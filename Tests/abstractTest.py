@@ -1,12 +1,59 @@
+import atexit
+import time
 import unittest
 import Solution
+from Utility.DBConnector import DBConnector
+from Tests.pinnedPool import PinnedPool
+
+# the savepoint rewriting of pinned connections lives in the tests only, production pools stay plain
+DBConnector.usePoolClass(PinnedPool)
 
 
 class AbstractTest(unittest.TestCase):
+    # isolated tests share a schema created once per process, each of them runs inside one transaction on a
+    # pinned connection that is rolled back after it; tests that need several real connections set this to False
+    # and get a schema of their own instead
+    isolated = True
+    __schemaReady = False
+
     # before each test, setUp is executed
     def setUp(self) -> None:
-        Solution.createTables()
+        if not self.isolated:
+            AbstractTest.__dropSchema()
+            Solution.createTables()
+            return
+        if not AbstractTest.__schemaReady:
+            Solution.dropTables()
+            Solution.createTables()
+            AbstractTest.__schemaReady = True
+            atexit.register(AbstractTest.__dropSchema)
+        DBConnector.getPool().pin()
 
     # after each test, tearDown is executed
     def tearDown(self) -> None:
+        if not self.isolated:
+            AbstractTest.__dropSchema()
+            return
+        DBConnector.getPool().unpin()
+        # the rolled back rows may still be cached
+        Solution.clearProfileCaches()
+
+    @staticmethod
+    def __dropSchema():
         Solution.dropTables()
+        AbstractTest.__schemaReady = False
+        atexit.unregister(AbstractTest.__dropSchema)
+
+    # ends the session of pid from another connection, as a server restart or an idle timeout would
+    @staticmethod
+    def terminate(pid: int):
+        conn = DBConnector()
+        try:
+            conn.execute("SELECT pg_terminate_backend(%s)", params=(pid,))
+            deadline = time.monotonic() + 5
+            while conn.execute("SELECT 1 FROM pg_stat_activity WHERE pid=%s", params=(pid,))[0] > 0 \
+                    and time.monotonic() < deadline:
+                time.sleep(0.01)
+        finally:
+            conn.close()
+
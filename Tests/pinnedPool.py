@@ -0,0 +1,81 @@
+from Utility.ConnectionPool import ConnectionPool, PooledConnection
+
+
+class PinnedConnection(PooledConnection):
+    # a pooled connection whose transactions become savepoints while it is pinned, see PinnedPool.pin
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # depth of the savepoints standing in for transactions, None while the connection is not pinned
+        self.savepoints = None
+
+    # while pinned, commit only moves the current borrower's savepoint forward, the real transaction stays open
+    def commit(self):
+        if self.savepoints is None:
+            return super().commit()
+        self.__savepoint("RELEASE SAVEPOINT {0}; SAVEPOINT {0}")
+
+    # while pinned, rollback undoes what the current borrower did since its last commit
+    def rollback(self):
+        if self.savepoints is None:
+            return super().rollback()
+        self.__savepoint("ROLLBACK TO SAVEPOINT {0}")
+
+    # a pinned connection is lent out again, nested borrowers get nested savepoints
+    def pushSavepoint(self):
+        self.savepoints += 1
+        self.__savepoint("SAVEPOINT {0}")
+
+    # the borrower gave the pinned connection back, its uncommitted work is undone like release() does
+    def popSavepoint(self):
+        try:
+            self.__savepoint("ROLLBACK TO SAVEPOINT {0}; RELEASE SAVEPOINT {0}")
+        finally:
+            self.savepoints -= 1
+
+    def __savepoint(self, template: str):
+        with self.cursor() as cursor:
+            cursor.execute(template.format("pinned_" + str(self.savepoints)))
+
+
+class PinnedPool(ConnectionPool):
+    # the pool of the tests, see AbstractTest: behaves like ConnectionPool until pin() is called
+    def __init__(self, params: dict, **options):
+        options["connectionFactory"] = PinnedConnection
+        super().__init__(params, **options)
+        self.__pinned = None
+
+    def acquire(self):
+        if self.__pinned is not None:
+            self.__pinned.pushSavepoint()
+            return self.__pinned
+        return super().acquire()
+
+    def release(self, connection, broken=False):
+        if connection is not None and connection is self.__pinned:
+            try:
+                connection.popSavepoint()
+            except Exception:
+                pass
+            return
+        super().release(connection, broken)
+
+    # pin one connection: until unpin(), every acquire() returns it and its commits only release savepoints,
+    # so unpin() rolls back everything done meanwhile; single threaded use only
+    def pin(self):
+        if self.__pinned is None:
+            connection = self.acquire()
+            connection.savepoints = 0
+            self.__pinned = connection
+        return self.__pinned
+
+    def unpin(self):
+        connection, self.__pinned = self.__pinned, None
+        if connection is None:
+            return
+        connection.savepoints = None
+        try:
+            connection.rollback()
+        except Exception:
+            self.release(connection, broken=True)
+            return
+        self.release(connection)
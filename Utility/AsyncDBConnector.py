@@ -0,0 +1,280 @@
+import asyncio
+import collections
+import time
+from contextlib import asynccontextmanager
+import psycopg2
+from psycopg2 import errors, extensions, sql
+from Utility.ConnectionPool import PooledConnection
+from Utility.DBConnector import DBConnector, ResultSet
+from Utility.Exceptions import DatabaseException
+from typing import Union
+
+
+# waits until the asynchronous psycopg2 connection finished its current operation, without blocking the loop
+async def wait(connection):
+    loop = asyncio.get_running_loop()
+    while True:
+        state = connection.poll()
+        if state == extensions.POLL_OK:
+            return
+        future = loop.create_future()
+        fd = connection.fileno()
+        if state == extensions.POLL_READ:
+            loop.add_reader(fd, lambda: future.done() or future.set_result(None))
+            try:
+                await future
+            finally:
+                loop.remove_reader(fd)
+        elif state == extensions.POLL_WRITE:
+            loop.add_writer(fd, lambda: future.done() or future.set_result(None))
+            try:
+                await future
+            finally:
+                loop.remove_writer(fd)
+        else:
+            raise psycopg2.OperationalError("Bad result from poll: " + str(state))
+
+
+class AsyncConnectionPool:
+    # constructor, the limits mean the same as in ConnectionPool, pingAfter included
+    # psycopg2 asynchronous connections are in autocommit mode, transactions are opened explicitly
+    def __init__(self, params: dict, minSize=1, maxSize=10, maxIdle=300.0, pingAfter=5.0, timeout=30.0):
+        if minSize < 0 or maxSize < 1 or minSize > maxSize:
+            raise ValueError("Invalid pool size: min=" + str(minSize) + ", max=" + str(maxSize))
+        self.params = dict(params)
+        self.minSize = minSize
+        self.maxSize = maxSize
+        self.maxIdle = maxIdle
+        self.pingAfter = pingAfter
+        self.timeout = timeout
+        self.__idle = collections.deque()  # (connection, time it was returned), most recently used last
+        self.__slots = asyncio.Semaphore(maxSize)
+        self.__closed = False
+
+    # borrow a connection, waits while maxSize connections are borrowed
+    async def acquire(self):
+        if self.__closed:
+            raise DatabaseException.ConnectionInvalid("Connection pool is closed")
+        try:
+            await asyncio.wait_for(self.__slots.acquire(), self.timeout)
+        except asyncio.TimeoutError:
+            raise DatabaseException.ConnectionInvalid("Connection pool exhausted")
+        try:
+            self.__reap()
+            while self.__idle:
+                connection, idleSince = self.__idle.pop()
+                if await AsyncConnectionPool.__isHealthy(connection, idleSince, self.pingAfter):
+                    return connection
+                AsyncConnectionPool.__closeQuietly(connection)
+            connection = psycopg2.connect(async_=True, connection_factory=PooledConnection, **self.params)
+            await wait(connection)
+            return connection
+        except Exception:
+            self.__slots.release()
+            raise DatabaseException.ConnectionInvalid("Could not connect to database")
+
+    # give a borrowed connection back, broken connections are closed instead of reused
+    def release(self, connection, broken=False):
+        if connection is None:
+            return
+        if broken or self.__closed or connection.closed != 0 or \
+                connection.get_transaction_status() != extensions.TRANSACTION_STATUS_IDLE:
+            AsyncConnectionPool.__closeQuietly(connection)
+        else:
+            self.__idle.append((connection, time.monotonic()))
+        self.__slots.release()
+
+    def close(self):
+        self.__closed = True
+        while self.__idle:
+            AsyncConnectionPool.__closeQuietly(self.__idle.pop()[0])
+
+    def __reap(self):
+        now = time.monotonic()
+        while len(self.__idle) > self.minSize and now - self.__idle[0][1] > self.maxIdle:
+            AsyncConnectionPool.__closeQuietly(self.__idle.popleft()[0])
+
+    # same as ConnectionPool, a connection idle for pingAfter seconds is pinged before it is borrowed
+    @staticmethod
+    async def __isHealthy(connection, idleSince, pingAfter) -> bool:
+        if connection.closed != 0:
+            return False
+        if time.monotonic() - idleSince < pingAfter:
+            return True
+        try:
+            cursor = connection.cursor()
+            try:
+                cursor.execute("SELECT 1")
+                await wait(connection)
+            finally:
+                cursor.close()
+            return True
+        except Exception:
+            return False
+
+    @staticmethod
+    def __closeQuietly(connection):
+        try:
+            connection.close()
+        except Exception:
+            pass
+
+
+class AsyncDBConnector:
+    # one pool per event loop, asyncio primitives and fd watchers belong to the loop that made them
+    __pools = {}
+    __poolOptions = {}
+
+    # use as: async with AsyncDBConnector() as conn
+    def __init__(self):
+        self.connection = None
+        self.pool = None
+        self.__savepoints = 0
+
+    async def __aenter__(self):
+        await self.open()
+        return self
+
+    async def __aexit__(self, *exc):
+        self.close()
+        return False
+
+    async def open(self):
+        try:
+            self.pool = AsyncDBConnector.getPool()
+            self.connection = await self.pool.acquire()
+        except Exception:
+            self.connection = None
+            raise DatabaseException.ConnectionInvalid("Could not connect to database")
+        return self
+
+    # close connection, the underlying connection goes back to the pool
+    def close(self):
+        if self.connection is not None:
+            # a connection left inside a transaction is not reused
+            self.pool.release(self.connection, broken=self.__savepoints > 0)
+            self.connection = None
+        self.__savepoints = 0
+
+    # the pool of the running event loop, created on first use
+    @staticmethod
+    def getPool() -> AsyncConnectionPool:
+        loop = asyncio.get_running_loop()
+        pool = AsyncDBConnector.__pools.get(loop)
+        if pool is None:
+            for other in [other for other in AsyncDBConnector.__pools if other.is_closed()]:
+                AsyncDBConnector.__pools.pop(other).close()
+            pool = AsyncConnectionPool(DBConnector.config(), **AsyncDBConnector.__poolOptions)
+            AsyncDBConnector.__pools[loop] = pool
+        return pool
+
+    # set the pool limits (minSize, maxSize, maxIdle, pingAfter, timeout), replacing the current pools
+    @staticmethod
+    def configurePool(**options):
+        AsyncDBConnector.__poolOptions = options
+        AsyncDBConnector.closePool()
+
+    @staticmethod
+    def closePool():
+        pools, AsyncDBConnector.__pools = AsyncDBConnector.__pools, {}
+        for pool in pools.values():
+            pool.close()
+
+    # async with conn.transaction(): same as DBConnector.transaction, nested scopes become savepoints
+    @asynccontextmanager
+    async def transaction(self):
+        if self.connection is None:
+            raise DatabaseException.ConnectionInvalid("Connection Invalid")
+        savepoint = sql.Identifier("savepoint_" + str(self.__savepoints))
+        if self.__savepoints == 0:
+            await self.execute("BEGIN")
+        else:
+            await self.execute(sql.SQL("SAVEPOINT {}").format(savepoint))
+        self.__savepoints += 1
+        try:
+            yield self
+        except BaseException:
+            self.__savepoints -= 1
+            if self.__savepoints == 0:
+                await self.execute("ROLLBACK")
+            else:
+                await self.execute(sql.SQL("ROLLBACK TO SAVEPOINT {}").format(savepoint))
+            raise
+        self.__savepoints -= 1
+        if self.__savepoints == 0:
+            await self.execute("COMMIT")
+        else:
+            await self.execute(sql.SQL("RELEASE SAVEPOINT {}").format(savepoint))
+
+    # executes the query, returns the number of rows effected and a ResultSet (for SELECT)
+    # raises the same exceptions as DBConnector.execute
+    async def execute(self, query: Union[str, sql.Composed], printSchema=False, params=None,
+                      columnar=False) -> (int, ResultSet):
+        if self.connection is None:
+            raise DatabaseException.ConnectionInvalid("Connection Invalid")
+        cursor = self.connection.cursor()
+        try:
+            try:
+                cursor.execute(query, params)
+                await wait(self.connection)
+            except errors.lookup("23502"):
+                raise DatabaseException.NOT_NULL_VIOLATION("NOT_NULL_VIOLATION")
+            except errors.lookup("23503"):
+                raise DatabaseException.FOREIGN_KEY_VIOLATION("FOREIGN_KEY_VIOLATION")
+            except errors.lookup("23505"):
+                raise DatabaseException.UNIQUE_VIOLATION("UNIQUE_VIOLATION")
+            except errors.lookup("23514"):
+                raise DatabaseException.CHECK_VIOLATION("CHECK_VIOLATION")
+            except psycopg2.OperationalError:
+                raise DatabaseException.ConnectionInvalid("Connection Invalid")
+            row_effected = max(cursor.rowcount, 0)
+
+            # get entries in case of SELECT
+            if cursor.description is not None:
+                entries = ResultSet(cursor.description, cursor.fetchall(), columnar)
+            else:
+                entries = ResultSet()
+        finally:
+            cursor.close()
+
+        # print SELECT entries
+        if printSchema:
+            print(entries)
+
+        return row_effected, entries
+
+    # executes a template registered with DBConnector.prepare, PREPAREd once per connection
+    async def executePrepared(self, name: str, params=(), printSchema=False, columnar=False) -> (int, ResultSet):
+        template = DBConnector.statement(name)
+        if template is None:
+            raise DatabaseException.UNKNOWN_ERROR("Unknown statement " + name)
+        if self.connection is None:
+            raise DatabaseException.ConnectionInvalid("Connection Invalid")
+
+        query = sql.SQL("EXECUTE {}").format(sql.Identifier(name))
+        if len(params) > 0:
+            query += sql.SQL("(" + ", ".join(["%s"] * len(params)) + ")")
+        try:
+            await self.__ensurePrepared(name, template)
+            return await self.execute(query, printSchema, tuple(params), columnar)
+        except (errors.InvalidSqlStatementName, errors.FeatureNotSupported):
+            # lost or stale statement, see DBConnector.executePrepared, the name stays in prepared inside a
+            # transaction so the retry happens outside of it
+            if self.__savepoints > 0:
+                raise DatabaseException.UNKNOWN_ERROR("Prepared statement " + name + " is stale")
+            self.connection.prepared.discard(name)
+            try:
+                await self.execute(sql.SQL("DEALLOCATE {}").format(sql.Identifier(name)))
+            except errors.InvalidSqlStatementName:
+                pass
+            await self.__ensurePrepared(name, template)
+            return await self.execute(query, printSchema, tuple(params), columnar)
+
+    async def __ensurePrepared(self, name: str, template: str):
+        if name in self.connection.prepared:
+            return
+        try:
+            await self.execute(sql.SQL("PREPARE {} AS ").format(sql.Identifier(name)) + sql.SQL(template))
+        except psycopg2.Error as e:
+            raise DatabaseException.UNKNOWN_ERROR(str(e).strip())
+        self.connection.prepared.add(name)
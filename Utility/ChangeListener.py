@@ -0,0 +1,81 @@
+import json
+import select
+import threading
+import psycopg2
+from psycopg2 import extensions, sql
+
+
+class ChangeListener:
+    # constructor
+    # channel - the channel to LISTEN on
+    # callback - called on the listener thread with every notification payload decoded from JSON, and with None
+    #            whenever notifications may have been missed (on connect and on every reconnect)
+    # params - connection parameters, see DBConnector.config
+    # reconnectDelay - seconds to wait before connecting again after the connection was lost
+    def __init__(self, channel: str, callback, params: dict, reconnectDelay=1.0):
+        self.channel = channel
+        self.callback = callback
+        self.params = dict(params)
+        self.reconnectDelay = reconnectDelay
+        self.__stopped = threading.Event()
+        self.__listening = threading.Event()
+        self.__thread = None
+        self.__received = 0
+
+    def start(self):
+        if self.__thread is not None and self.__thread.is_alive():
+            return
+        self.__stopped.clear()
+        self.__thread = threading.Thread(target=self.__run, name="ChangeListener-" + self.channel, daemon=True)
+        self.__thread.start()
+
+    def stop(self, timeout=5.0):
+        self.__stopped.set()
+        if self.__thread is not None:
+            self.__thread.join(timeout)
+        self.__thread = None
+
+    # blocks until the listener is connected and LISTENing, False if it is not after timeout seconds
+    def waitUntilListening(self, timeout=5.0) -> bool:
+        return self.__listening.wait(timeout)
+
+    # notifications delivered so far
+    def received(self) -> int:
+        return self.__received
+
+    def __run(self):
+        while not self.__stopped.is_set():
+            connection = None
+            try:
+                # a connection of its own, outside the pool, it stays in autocommit mode and idle forever
+                connection = psycopg2.connect(**self.params)
+                connection.set_isolation_level(extensions.ISOLATION_LEVEL_AUTOCOMMIT)
+                with connection.cursor() as cursor:
+                    cursor.execute(sql.SQL("LISTEN {}").format(sql.Identifier(self.channel)))
+                self.__deliver(None)
+                self.__listening.set()
+                while not self.__stopped.is_set():
+                    if select.select([connection], [], [], 0.5) == ([], [], []):
+                        continue
+                    connection.poll()
+                    while connection.notifies:
+                        self.__deliver(connection.notifies.pop(0).payload)
+            except Exception:
+                self.__listening.clear()
+                self.__stopped.wait(self.reconnectDelay)
+            finally:
+                if connection is not None:
+                    try:
+                        connection.close()
+                    except Exception:
+                        pass
+        self.__listening.clear()
+
+    def __deliver(self, payload):
+        try:
+            self.callback(None if payload is None else json.loads(payload))
+        except Exception:
+            # a failing callback must not take the listener down with it
+            pass
+        if payload is not None:
+            self.__received += 1
@@ -0,0 +1,169 @@
+import psycopg2
+from psycopg2 import extensions
+from Utility.Exceptions import DatabaseException
+import os
+import threading
+import time
+
+
+class PooledConnection(extensions.connection):
+    # a psycopg2 connection that remembers which named statements its session has PREPAREd
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.prepared = set()
+
+
+class ConnectionPool:
+    # constructor
+    # minSize - idle connections that are never reaped
+    # maxSize - upper bound on connections open at the same time (idle + borrowed)
+    # maxIdle - seconds an idle connection above minSize is kept before it is closed
+    # pingAfter - idle seconds after which a connection is pinged on checkout
+    # timeout - seconds acquire() waits for a free connection before giving up
+    # connectionFactory - PooledConnection or a subclass of it, the class of the opened connections
+    def __init__(self, params: dict, minSize=1, maxSize=10, maxIdle=300.0, pingAfter=5.0, timeout=30.0,
+                 connectionFactory=PooledConnection):
+        if minSize < 0 or maxSize < 1 or minSize > maxSize:
+            raise ValueError("Invalid pool size: min=" + str(minSize) + ", max=" + str(maxSize))
+        self.params = dict(params)
+        self.minSize = minSize
+        self.maxSize = maxSize
+        self.maxIdle = maxIdle
+        self.pingAfter = pingAfter
+        self.timeout = timeout
+        self.connectionFactory = connectionFactory
+        self.__idle = []  # (connection, time it was returned), most recently used last
+        self.__size = 0  # idle + borrowed connections
+        self.__pid = os.getpid()
+        self.__closed = False
+        self.__cond = threading.Condition()
+
+    # borrow a connection, blocks while the pool is exhausted
+    def acquire(self):
+        deadline = time.monotonic() + self.timeout
+        while True:
+            connection, idleSince = None, None
+            with self.__cond:
+                self.__checkFork()
+                if self.__closed:
+                    raise DatabaseException.ConnectionInvalid("Connection pool is closed")
+                self.__reap()
+                while not self.__idle and self.__size >= self.maxSize:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        raise DatabaseException.ConnectionInvalid("Connection pool exhausted")
+                    self.__cond.wait(remaining)
+                if self.__idle:
+                    connection, idleSince = self.__idle.pop()
+                else:
+                    self.__size += 1
+
+            # connect and ping outside the lock so other threads are not blocked on the network
+            if connection is None:
+                try:
+                    return self.__connect()
+                except Exception:
+                    self.__forget()
+                    raise DatabaseException.ConnectionInvalid("Could not connect to database")
+            if self.__isHealthy(connection, idleSince):
+                return connection
+            self.__discard(connection)
+
+    # give a borrowed connection back, broken connections are closed instead of reused
+    def release(self, connection, broken=False):
+        if connection is None:
+            return
+        if not broken and connection.closed == 0:
+            try:
+                if connection.get_transaction_status() != extensions.TRANSACTION_STATUS_IDLE:
+                    connection.rollback()
+            except Exception:
+                broken = True
+        else:
+            broken = True
+
+        with self.__cond:
+            if self.__pid != os.getpid():
+                # borrowed before a fork, the parent still owns the socket
+                return
+            if broken or self.__closed:
+                self.__size -= 1
+            else:
+                self.__idle.append((connection, time.monotonic()))
+            self.__cond.notify()
+        if broken or self.__closed:
+            ConnectionPool.__closeQuietly(connection)
+
+    # close every idle connection, borrowed connections are closed when released
+    def close(self):
+        with self.__cond:
+            self.__closed = True
+            idle, self.__idle = self.__idle, []
+            self.__size -= len(idle)
+            self.__cond.notify_all()
+        for connection, _ in idle:
+            ConnectionPool.__closeQuietly(connection)
+
+    # (idle, borrowed) connection counts
+    def stats(self):
+        with self.__cond:
+            return len(self.__idle), self.__size - len(self.__idle)
+
+    def __connect(self):
+        connection = psycopg2.connect(connection_factory=self.connectionFactory, **self.params)
+        connection.autocommit = False
+        return connection
+
+    def __isHealthy(self, connection, idleSince):
+        if connection.closed != 0:
+            return False
+        if time.monotonic() - idleSince < self.pingAfter:
+            return True
+        try:
+            with connection.cursor() as cursor:
+                cursor.execute("SELECT 1")
+            connection.rollback()
+            return True
+        except Exception:
+            return False
+
+    def __discard(self, connection):
+        self.__forget()
+        ConnectionPool.__closeQuietly(connection)
+
+    def __forget(self):
+        with self.__cond:
+            self.__size -= 1
+            self.__cond.notify()
+
+    # must be called while holding the lock
+    def __reap(self):
+        if len(self.__idle) <= self.minSize:
+            return
+        now = time.monotonic()
+        keep, reaped = [], []
+        # the list is ordered by return time, so the stalest connections come first
+        for connection, idleSince in self.__idle:
+            if now - idleSince > self.maxIdle and len(self.__idle) - len(reaped) > self.minSize:
+                reaped.append(connection)
+            else:
+                keep.append((connection, idleSince))
+        self.__idle = keep
+        self.__size -= len(reaped)
+        for connection in reaped:
+            ConnectionPool.__closeQuietly(connection)
+
+    # must be called while holding the lock
+    def __checkFork(self):
+        # connections must not be shared with a forked child, start over with an empty pool
+        if self.__pid != os.getpid():
+            self.__pid = os.getpid()
+            self.__idle = []
+            self.__size = 0
+
+    @staticmethod
+    def __closeQuietly(connection):
+        try:
+            connection.close()
+        except Exception:
+            pass
@@ -2,7 +2,15 @@ import psycopg2
 from psycopg2 import errors, sql
 from configparser import ConfigParser
 from Utility.Exceptions import DatabaseException
+from Utility.ConnectionPool import ConnectionPool
+from Utility.ChangeListener import ChangeListener
+from Utility.QueryHooks import QueryEvent, QueryHook
+from Utility.SlowQueryLog import SlowQueryLog
+import array
 import os
+import threading
+import time
+from contextlib import contextmanager
 from typing import Union
 
 
@@ -13,13 +21,43 @@ class ResultSetDict(dict):
         return super().__getitem__(item.lower())
 
 
+class ResultSetRows:
+    # read-only sequence of row tuples over the columns of a columnar ResultSet, built on access
+    def __init__(self, columns: list):
+        self.__columns = columns
+        self.__size = len(columns[0]) if len(columns) > 0 else 0
+
+    def __len__(self):
+        return self.__size
+
+    def __getitem__(self, row):
+        if isinstance(row, slice):
+            return [self[i] for i in range(*row.indices(self.__size))]
+        if row < 0:
+            row += self.__size
+        if not 0 <= row < self.__size:
+            raise IndexError(row)
+        return tuple(col[row] for col in self.__columns)
+
+    def __iter__(self):
+        return zip(*self.__columns)
+
+
 class ResultSet:
+    # postgres types stored in typed arrays by a columnar ResultSet: int2, int4, int8, float4, float8
+    __arrayTypes = {21: 'q', 23: 'q', 20: 'q', 700: 'd', 701: 'd'}
+
     # constructor
-    def __init__(self, description=None, results=None):
+    # columnar - keep the results column-wise (numeric columns in arrays) and build rows only on access
+    def __init__(self, description=None, results=None, columnar=False):
         self.rows = []
         self.cols_header = []
         self.cols = ResultSetDict()
-        self.__fromQuery(description, results)
+        self.columns = ResultSetDict()
+        if columnar:
+            self.__fromQueryColumnar(description, results)
+        else:
+            self.__fromQuery(description, results)
 
     def __getitem__(self, row):
         return self.__getRow(row)
@@ -44,6 +82,23 @@ class ResultSet:
     def isEmpty(self):
         return self.size() == 0
 
+    # values of a column by name, without copying when the ResultSet is columnar
+    def column(self, name: str):
+        if name.lower() in self.columns:
+            return self.columns[name]
+        if name.lower() not in self.cols:
+            return []
+        index = self.cols[name]
+        return [row[index] for row in self.rows]
+
+    # the column as a NumPy array, sharing memory with typed array columns (needs NumPy installed)
+    def columnAsNumpy(self, name: str):
+        import numpy
+        values = self.column(name)
+        if isinstance(values, array.array):
+            return numpy.frombuffer(values, dtype=numpy.int64 if values.typecode == 'q' else numpy.float64)
+        return numpy.asarray(values)
+
     def __getRow(self, row: int):
         if len(self.rows) <= row:
             print('Invalid row ' + str(row))
@@ -57,33 +112,184 @@ class ResultSet:
         if results is None or len(results) == 0:  # no results
             self.cols = ResultSetDict()
         else:
-            self.rows = results.copy()
+            # results is the list fetchall() built for us, no need to copy it
+            self.rows = results
             self.cols_header = [d.name for d in description]
             self.cols = ResultSetDict()
             for col, index in zip(self.cols_header, range(len(results[0]))):
                 self.cols[col] = index
 
+    def __fromQueryColumnar(self, description, results: list):
+        if results is None or len(results) == 0:  # no results
+            return
+        self.cols_header = [d.name for d in description]
+        values = list(zip(*results))
+        # drop the row tuples before building the columns, so both never live at the same time
+        results.clear()
+        columns = []
+        for index, (d, col) in enumerate(zip(description, values)):
+            typecode = ResultSet.__arrayTypes.get(d.type_code)
+            if typecode is not None and None not in col:
+                col = array.array(typecode, col)
+            else:
+                col = list(col)
+            values[index] = None
+            columns.append(col)
+            self.cols[d.name] = index
+            self.columns[d.name] = col
+        self.rows = ResultSetRows(columns)
+
+
+class CopyStream:
+    # file-like object feeding rows to COPY ... FROM STDIN (text format) without building the whole payload
+    def __init__(self, rows):
+        self.__lines = (CopyStream.__line(row) for row in rows)
+        self.__buffer = ''
+
+    def read(self, size=-1):
+        chunks, length = [self.__buffer], len(self.__buffer)
+        while size < 0 or length < size:
+            line = next(self.__lines, None)
+            if line is None:
+                break
+            chunks.append(line)
+            length += len(line)
+        data = ''.join(chunks)
+        if size < 0:
+            self.__buffer = ''
+            return data
+        self.__buffer = data[size:]
+        return data[:size]
+
+    readline = read
+
+    @staticmethod
+    def __line(row) -> str:
+        return '\t'.join(CopyStream.__value(val) for val in row) + '\n'
+
+    @staticmethod
+    def __value(val) -> str:
+        if val is None:
+            return '\\N'
+        return str(val).replace('\\', '\\\\').replace('\t', '\\t').replace('\n', '\\n').replace('\r', '\\r')
+
 
 class DBConnector:
+    # process-wide pool every DBConnector borrows its connection from
+    __pool = None
+    # ConnectionPool or a subclass of it, see usePoolClass
+    __poolClass = ConnectionPool
+    __poolLock = threading.Lock()
+    __poolOptions = {}
+    # parsed database.ini, see __config
+    __configCache = None
+    __configLock = threading.Lock()
+    __watchConfig = False
+    # DB_HOST, DB_DATABASE, ... override database.ini, DB_DATABASE and DB_USER alone skip the file entirely
+    __envPrefix = 'DB_'
+    __configKeys = ('host', 'database', 'user', 'password', 'port')
+    __requiredKeys = ('database', 'user')
+    # named query templates, see prepare
+    __statements = {}
+    # names handed out to server-side cursors, see executeStream
+    __streams = 0
+    # QueryHook instances told about every statement, see addHook
+    __hooks = ()
+
     # constructor
     def __init__(self):
+        self.connection = None
+        self.cursor = None
+        self.pool = None
+        # open transaction() scopes, the statements are not committed one by one while it is above 0
+        self.__savepoints = 0
+        # seconds spent waiting for the pooled connection, reported to the hooks
+        self.waitSeconds = 0.0
         try:
-            # Obtain the configuration parameters
-            params = DBConnector.__config()
-            self.connection = psycopg2.connect(**params)
-            self.connection.autocommit = False
+            self.pool = DBConnector.getPool()
+            start = time.perf_counter()
+            self.connection = self.pool.acquire()
+            self.waitSeconds = time.perf_counter() - start
             self.cursor = self.connection.cursor()
         except Exception as e:
-            self.connection = None
-            self.cursor = None
+            self.close()
             raise DatabaseException.ConnectionInvalid("Could not connect to database")
 
-    # close connection
+    # close connection, the underlying connection goes back to the pool
     def close(self):
         if self.cursor is not None:
-            self.cursor.close()
+            try:
+                self.cursor.close()
+            except Exception:
+                pass
+            self.cursor = None
         if self.connection is not None:
-            self.connection.close()
+            self.pool.release(self.connection)
+            self.connection = None
+        self.__savepoints = 0
+
+    # the shared connection pool, created on first use
+    @staticmethod
+    def getPool() -> ConnectionPool:
+        if DBConnector.__watchConfig and DBConnector.__pool is not None \
+                and DBConnector.__pool.params != DBConnector.__config():
+            DBConnector.closePool()
+        if DBConnector.__pool is None:
+            with DBConnector.__poolLock:
+                if DBConnector.__pool is None:
+                    DBConnector.__pool = DBConnector.__poolClass(DBConnector.__config(),
+                                                                 **DBConnector.__poolOptions)
+        return DBConnector.__pool
+
+    # set the pool limits (minSize, maxSize, maxIdle, pingAfter, timeout), replacing the current pool
+    @staticmethod
+    def configurePool(**options):
+        with DBConnector.__poolLock:
+            DBConnector.__poolOptions = options
+            pool, DBConnector.__pool = DBConnector.__pool, None
+        if pool is not None:
+            pool.close()
+
+    # build the pool as an instance of poolClass from now on, replacing the current pool, e.g. for tests
+    @staticmethod
+    def usePoolClass(poolClass):
+        with DBConnector.__poolLock:
+            DBConnector.__poolClass = poolClass
+            pool, DBConnector.__pool = DBConnector.__pool, None
+        if pool is not None:
+            pool.close()
+
+    # close every pooled connection, e.g. before the process exits
+    @staticmethod
+    def closePool():
+        with DBConnector.__poolLock:
+            pool, DBConnector.__pool = DBConnector.__pool, None
+        if pool is not None:
+            pool.close()
+
+    # register a QueryHook, it is told about every statement run by execute, executePrepared and copy
+    @staticmethod
+    def addHook(hook: QueryHook):
+        DBConnector.__hooks = DBConnector.__hooks + (hook,)
+
+    @staticmethod
+    def removeHook(hook: QueryHook):
+        DBConnector.__hooks = tuple(other for other in DBConnector.__hooks if other is not hook)
+
+    # log the statements slower than thresholdMs with their plan to a rotating file, see SlowQueryLog
+    # stop it with removeHook followed by close
+    @staticmethod
+    def logSlowQueries(path: str, thresholdMs=100.0, **options) -> SlowQueryLog:
+        log = SlowQueryLog(path, DBConnector.__config(), thresholdMs, **options)
+        DBConnector.addHook(log)
+        return log
+
+    # start a background thread LISTENing on channel with a connection of its own, see ChangeListener
+    @staticmethod
+    def listen(channel: str, callback, reconnectDelay=1.0) -> ChangeListener:
+        listener = ChangeListener(channel, callback, DBConnector.__config(), reconnectDelay)
+        listener.start()
+        return listener
 
     # commit connection's changes
     def commit(self):
@@ -101,29 +307,86 @@ class DBConnector:
             except Exception:
                 raise DatabaseException.ConnectionInvalid("Could not rollback changes")
 
+    # with conn.transaction(): runs every statement of the block in one transaction, committed once at
+    # the end and rolled back if the block raises; nested scopes become savepoints
+    @contextmanager
+    def transaction(self):
+        if self.connection is None:
+            raise DatabaseException.ConnectionInvalid("Connection Invalid")
+        if self.__savepoints == 0:
+            self.__savepoints = 1
+            try:
+                yield self
+            except BaseException:
+                self.__savepoints = 0
+                self.rollback()
+                raise
+            self.__savepoints = 0
+            self.commit()
+            return
+
+        savepoint = sql.Identifier("savepoint_" + str(self.__savepoints))
+        self.cursor.execute(sql.SQL("SAVEPOINT {}").format(savepoint))
+        self.__savepoints += 1
+        try:
+            yield self
+        except BaseException:
+            self.__savepoints -= 1
+            self.cursor.execute(sql.SQL("ROLLBACK TO SAVEPOINT {}").format(savepoint))
+            raise
+        self.__savepoints -= 1
+        self.cursor.execute(sql.SQL("RELEASE SAVEPOINT {}").format(savepoint))
+
+    # is a transaction() scope open?
+    def inTransaction(self) -> bool:
+        return self.__savepoints > 0
+
+    def __autoCommit(self):
+        if self.__savepoints == 0:
+            self.commit()
+
     # executes the query, if it is SELECT you may ask to print the results with printSchema
     # returns the number of rows effected and a ResultSet (for SELECT)
-    def execute(self, query: Union[str, sql.Composed], printSchema=False) -> (int, ResultSet):
+    # params are bound to %s placeholders in the query, columnar asks for a columnar ResultSet
+    def execute(self, query: Union[str, sql.Composed], printSchema=False, params=None,
+                columnar=False) -> (int, ResultSet):
+        return self.__execute(query, printSchema, params, columnar, None)
+
+    def __execute(self, query, printSchema, params, columnar, name) -> (int, ResultSet):
         if self.connection is None:
             raise DatabaseException.ConnectionInvalid("Connection Invalid")
+        event = self.__beginEvent(name, query, params)
 
         # try execute the query
         try:
-            self.cursor.execute(query)
-            row_effected = max(self.cursor.rowcount, 0)
-            self.commit()
-        except errors.lookup("23502"):
-            raise DatabaseException.NOT_NULL_VIOLATION("NOT_NULL_VIOLATION")
-        except errors.lookup("23503"):
-            raise DatabaseException.FOREIGN_KEY_VIOLATION("FOREIGN_KEY_VIOLATION")
-        except errors.lookup("23505"):
-            raise DatabaseException.UNIQUE_VIOLATION("UNIQUE_VIOLATION")
-        except errors.lookup("23514"):
-            raise DatabaseException.CHECK_VIOLATION("CHECK_VIOLATION")
+            try:
+                start = time.perf_counter()
+                self.cursor.execute(query, params)
+                row_effected = max(self.cursor.rowcount, 0)
+                executed = time.perf_counter()
+                self.__autoCommit()
+            except errors.lookup("23502"):
+                raise DatabaseException.NOT_NULL_VIOLATION("NOT_NULL_VIOLATION")
+            except errors.lookup("23503"):
+                raise DatabaseException.FOREIGN_KEY_VIOLATION("FOREIGN_KEY_VIOLATION")
+            except errors.lookup("23505"):
+                raise DatabaseException.UNIQUE_VIOLATION("UNIQUE_VIOLATION")
+            except errors.lookup("23514"):
+                raise DatabaseException.CHECK_VIOLATION("CHECK_VIOLATION")
+        except Exception as e:
+            if event is not None:
+                event.executeSeconds = time.perf_counter() - start
+                DBConnector.__endEvent(event, e)
+            raise
+        if event is not None:
+            event.rowsAffected = row_effected
+            event.executeSeconds = executed - start
+            event.commitSeconds = time.perf_counter() - executed
+            DBConnector.__endEvent(event)
 
         # get entries in case of SELECT
         if self.cursor.description is not None:
-            entries = ResultSet(self.cursor.description, self.cursor.fetchall())
+            entries = ResultSet(self.cursor.description, self.cursor.fetchall(), columnar)
         else:
             entries = ResultSet()
 
@@ -133,25 +396,279 @@ class DBConnector:
 
         return row_effected, entries
 
-    # grant credentials
-    @staticmethod
-    def __config(filename=os.path.join(os.path.join(os.getcwd(), "Utility"), 'database.ini'),
-                 section='postgresql'):
-        # create a parser
-        parser = ConfigParser()
-        # read config file
-        parser.read(filename)
-
-        # get section
-        db = {}
-        if parser.has_section(section):
-            params = parser.items(section)
-            for param in params:
-                db[param[0]] = param[1]
+    # executes a SELECT on a named server-side cursor and yields its rows as they arrive,
+    # batchSize rows per round trip, or whole lists of up to batchSize rows when batches is set
+    # the read transaction ends once the generator is exhausted or closed
+    # database errors are raised as DatabaseException classes, like execute, also while iterating
+    # the hooks see one event per stream, ended with the generator, timing only the database round trips;
+    # name labels it, the template registered under that name (if any) standing in for the query
+    def executeStream(self, query: Union[str, sql.Composed], batchSize=1000, params=None, batches=False,
+                      name=None):
+        if self.connection is None:
+            raise DatabaseException.ConnectionInvalid("Connection Invalid")
+        DBConnector.__streams += 1
+        cursor = self.connection.cursor(name="stream_" + str(os.getpid()) + "_" + str(DBConnector.__streams))
+        cursor.itersize = batchSize
+        completed = False
+        event = self.__beginEvent(name, query, params)
+        streamed, busy, start = 0, 0.0, None
+        try:
+            try:
+                start = time.perf_counter()
+                cursor.execute(query, params)
+                while True:
+                    rows = cursor.fetchmany(batchSize)
+                    busy, start = busy + time.perf_counter() - start, None
+                    if len(rows) == 0:
+                        break
+                    streamed += len(rows)
+                    if batches:
+                        yield rows
+                    else:
+                        yield from rows
+                    start = time.perf_counter()
+                completed = True
+            except errors.lookup("23502"):
+                raise DatabaseException.NOT_NULL_VIOLATION("NOT_NULL_VIOLATION")
+            except errors.lookup("23503"):
+                raise DatabaseException.FOREIGN_KEY_VIOLATION("FOREIGN_KEY_VIOLATION")
+            except errors.lookup("23505"):
+                raise DatabaseException.UNIQUE_VIOLATION("UNIQUE_VIOLATION")
+            except errors.lookup("23514"):
+                raise DatabaseException.CHECK_VIOLATION("CHECK_VIOLATION")
+            except psycopg2.Error as e:
+                # anything else, raised midway through the caller's iteration
+                raise DatabaseException.UNKNOWN_ERROR(str(e).strip())
+        except Exception as e:
+            if event is not None:
+                event.rowsAffected = streamed
+                event.executeSeconds = busy + (0.0 if start is None else time.perf_counter() - start)
+                DBConnector.__endEvent(event, e)
+                event = None
+            raise
+        finally:
+            try:
+                cursor.close()
+            except Exception:
+                pass
+            ending = time.perf_counter()
+            if completed:
+                self.__autoCommit()
+            elif self.__savepoints == 0:
+                self.rollback()
+            # exhausted or closed early, the rows streamed so far are reported
+            if event is not None:
+                event.rowsAffected = streamed
+                event.executeSeconds = busy
+                event.commitSeconds = time.perf_counter() - ending if completed else 0.0
+                DBConnector.__endEvent(event)
+
+    # streams rows (tuples ordered like columns) into table with COPY ... FROM STDIN
+    # returns the number of rows copied
+    def copy(self, table: str, columns: list, rows) -> int:
+        if self.connection is None:
+            raise DatabaseException.ConnectionInvalid("Connection Invalid")
+        # unquoted names in the schema are folded to lower case
+        query = sql.SQL("COPY {} ({}) FROM STDIN").format(
+            sql.Identifier(table.lower()), sql.SQL(", ").join(sql.Identifier(col.lower()) for col in columns))
+        event = self.__beginEvent("COPY " + table, query, None)
+        try:
+            try:
+                start = time.perf_counter()
+                self.cursor.copy_expert(query, CopyStream(rows))
+                row_effected = max(self.cursor.rowcount, 0)
+                executed = time.perf_counter()
+                self.__autoCommit()
+            except errors.lookup("23502"):
+                raise DatabaseException.NOT_NULL_VIOLATION("NOT_NULL_VIOLATION")
+            except errors.lookup("23503"):
+                raise DatabaseException.FOREIGN_KEY_VIOLATION("FOREIGN_KEY_VIOLATION")
+            except errors.lookup("23505"):
+                raise DatabaseException.UNIQUE_VIOLATION("UNIQUE_VIOLATION")
+            except errors.lookup("23514"):
+                raise DatabaseException.CHECK_VIOLATION("CHECK_VIOLATION")
+        except Exception as e:
+            if event is not None:
+                event.executeSeconds = time.perf_counter() - start
+                DBConnector.__endEvent(event, e)
+            raise
+        if event is not None:
+            event.rowsAffected = row_effected
+            event.executeSeconds = executed - start
+            event.commitSeconds = time.perf_counter() - executed
+            DBConnector.__endEvent(event)
+        return row_effected
+
+    # register a named query template, using $1, $2, ... for its parameters
+    # the template is PREPAREd lazily, once per pooled connection
+    @staticmethod
+    def prepare(name: str, template: str):
+        DBConnector.__statements[name] = template
+
+    # the template registered under name, None if there is none
+    @staticmethod
+    def statement(name: str):
+        return DBConnector.__statements.get(name)
+
+    # executes the named template with bound params, same return value and errors as execute
+    def executePrepared(self, name: str, params=(), printSchema=False, columnar=False) -> (int, ResultSet):
+        if self.connection is None:
+            raise DatabaseException.ConnectionInvalid("Connection Invalid")
+        if name not in DBConnector.__statements:
+            raise DatabaseException.UNKNOWN_ERROR("Unknown statement " + name)
+
+        query = DBConnector.__executeQuery(name, params)
+        try:
+            self.__ensurePrepared(name)
+            return self.__execute(query, printSchema, tuple(params), columnar, name)
+        except (errors.InvalidSqlStatementName, errors.FeatureNotSupported):
+            # the session lost the statement (DISCARD, reconnect) or its cached plan is stale
+            # after a schema change, prepare it again and retry once
+            if self.__savepoints > 0:
+                # the enclosing transaction is aborted, the retry is left to its owner; the name stays in
+                # prepared so the next call fails the same way outside the transaction and takes the retry
+                # below, PREPAREing it again now would clash with a stale statement the session still holds
+                raise DatabaseException.UNKNOWN_ERROR("Prepared statement " + name + " is stale")
+            self.rollback()
+            self.__deallocate(name)
+            self.__ensurePrepared(name)
+            return self.__execute(query, printSchema, tuple(params), columnar, name)
+
+    # the plan of the named template for params, as EXPLAIN (options) reports it in JSON
+    def explainPrepared(self, name: str, params=(), options="FORMAT JSON"):
+        if self.connection is None:
+            raise DatabaseException.ConnectionInvalid("Connection Invalid")
+        if name not in DBConnector.__statements:
+            raise DatabaseException.UNKNOWN_ERROR("Unknown statement " + name)
+        self.__ensurePrepared(name)
+        query = sql.SQL("EXPLAIN (" + options + ") ") + DBConnector.__executeQuery(name, params)
+        _, result = self.execute(query, params=tuple(params))
+        return result.rows[0][0]
+
+    # the event of a statement about to run, None when no hook is registered
+    def __beginEvent(self, name, query, params):
+        hooks = DBConnector.__hooks
+        if not hooks:
+            return None
+        template = name is not None and name in DBConnector.__statements
+        if template:
+            text = DBConnector.__statements[name]
+        elif isinstance(query, sql.Composable):
+            text = query.as_string(self.connection)
         else:
-            # file not found
-            db = DBConnector.__config(
-                filename=os.path.join(os.path.join(os.path.dirname(os.getcwd()), 'Utility'), 'database.ini'))
-            if db is None:
-                raise DatabaseException.database_ini_ERROR("Please modify database.ini file under Utility")
-        return db
+            text = query
+        event = QueryEvent(name, text, params, self.waitSeconds, template)
+        for hook in hooks:
+            try:
+                hook.beforeExecute(event)
+            except Exception:
+                pass
+        return event
+
+    @staticmethod
+    def __endEvent(event: QueryEvent, error=None):
+        event.error = error
+        for hook in DBConnector.__hooks:
+            try:
+                if error is None:
+                    hook.afterExecute(event)
+                else:
+                    hook.onError(event)
+            except Exception:
+                pass
+
+    @staticmethod
+    def __executeQuery(name: str, params) -> sql.Composed:
+        query = sql.SQL("EXECUTE {}").format(sql.Identifier(name))
+        if len(params) > 0:
+            query += sql.SQL("(" + ", ".join(["%s"] * len(params)) + ")")
+        return query
+
+    def __ensurePrepared(self, name: str):
+        prepared = self.connection.prepared
+        if name in prepared:
+            return
+        try:
+            self.cursor.execute(sql.SQL("PREPARE {} AS ").format(sql.Identifier(name)) +
+                                sql.SQL(DBConnector.__statements[name]))
+        except psycopg2.Error as e:
+            # e.g. a table of the template does not exist (yet), raised like the errors of execute
+            raise DatabaseException.UNKNOWN_ERROR(str(e).strip())
+        prepared.add(name)
+
+    def __deallocate(self, name: str):
+        self.connection.prepared.discard(name)
+        try:
+            self.cursor.execute(sql.SQL("DEALLOCATE {}").format(sql.Identifier(name)))
+            self.commit()
+        except errors.InvalidSqlStatementName:
+            self.rollback()
+
+    # grant credentials, parsed once per process and cached
+    @staticmethod
+    def __config() -> dict:
+        cached = DBConnector.__configCache
+        if cached is not None and DBConnector.__watchConfig and DBConnector.__configChanged(cached):
+            cached = None
+        if cached is None:
+            with DBConnector.__configLock:
+                cached = DBConnector.__configCache
+                if cached is None or (DBConnector.__watchConfig and DBConnector.__configChanged(cached)):
+                    cached = DBConnector.__configCache = DBConnector.__loadConfig()
+        return dict(cached[0])
+
+    # the cached connection parameters
+    @staticmethod
+    def config() -> dict:
+        return DBConnector.__config()
+
+    # drop the cached configuration and the pool built from it, the next connection reads it again
+    @staticmethod
+    def reloadConfig() -> dict:
+        with DBConnector.__configLock:
+            DBConnector.__configCache = None
+        DBConnector.closePool()
+        return DBConnector.__config()
+
+    # when enabled, database.ini is re-read (and the pool rebuilt) as soon as its mtime changes
+    @staticmethod
+    def watchConfig(enabled=True):
+        DBConnector.__watchConfig = enabled
+
+    # (params, filename, mtime), filename is None when the environment supplied everything
+    @staticmethod
+    def __loadConfig(section='postgresql'):
+        overrides = {}
+        for key in DBConnector.__configKeys:
+            value = os.environ.get(DBConnector.__envPrefix + key.upper())
+            if value is not None:
+                overrides[key] = value
+        if all(key in overrides for key in DBConnector.__requiredKeys):
+            return overrides, None, None
+
+        for filename in DBConnector.__configCandidates():
+            # create a parser
+            parser = ConfigParser()
+            # read config file
+            if not parser.read(filename) or not parser.has_section(section):
+                continue
+            db = dict(parser.items(section))
+            db.update(overrides)
+            return db, filename, os.path.getmtime(filename)
+        raise DatabaseException.database_ini_ERROR("Please modify database.ini file under Utility")
+
+    @staticmethod
+    def __configCandidates():
+        yield os.path.join(os.getcwd(), 'Utility', 'database.ini')
+        yield os.path.join(os.path.dirname(os.getcwd()), 'Utility', 'database.ini')
+        yield os.path.join(os.path.dirname(os.path.abspath(__file__)), 'database.ini')
+
+    @staticmethod
+    def __configChanged(cached) -> bool:
+        _, filename, mtime = cached
+        if filename is None:
+            return False
+        try:
+            return os.path.getmtime(filename) != mtime
+        except OSError:
+            return True
@@ -0,0 +1,86 @@
+import collections
+import threading
+import time
+
+
+class LRUCache:
+    # constructor
+    # maxSize - entries kept, the least recently used one is evicted beyond that
+    # ttl - seconds an entry stays valid, None keeps it until it is evicted or invalidated
+    def __init__(self, maxSize=4096, ttl=None):
+        if maxSize < 1:
+            raise ValueError("Invalid cache size: " + str(maxSize))
+        self.maxSize = maxSize
+        self.ttl = ttl
+        self.__entries = collections.OrderedDict()  # key -> (value, time it was stored), most recently used last
+        self.__lock = threading.Lock()
+        self.__generation = 0  # bumped by every invalidation, see stamp
+        self.__hits = 0
+        self.__misses = 0
+        self.__evictions = 0
+        self.__expirations = 0
+
+    # the cached value of key, None on a miss
+    def get(self, key):
+        with self.__lock:
+            entry = self.__entries.get(key)
+            if entry is None:
+                self.__misses += 1
+                return None
+            value, storedAt = entry
+            if self.ttl is not None and time.monotonic() - storedAt > self.ttl:
+                del self.__entries[key]
+                self.__expirations += 1
+                self.__misses += 1
+                return None
+            self.__entries.move_to_end(key)
+            self.__hits += 1
+            return value
+
+    # take a stamp before reading a value from the database and pass it to put, the value is dropped if the
+    # cache was invalidated meanwhile, so a read racing a delete never stores the deleted row
+    def stamp(self) -> int:
+        with self.__lock:
+            return self.__generation
+
+    # store value under key, evicting the least recently used entries beyond maxSize
+    def put(self, key, value, stamp=None):
+        with self.__lock:
+            if stamp is not None and stamp != self.__generation:
+                return
+            self.__entries[key] = (value, time.monotonic())
+            self.__entries.move_to_end(key)
+            while len(self.__entries) > self.maxSize:
+                self.__entries.popitem(last=False)
+                self.__evictions += 1
+
+    def invalidate(self, key):
+        with self.__lock:
+            self.__generation += 1
+            self.__entries.pop(key, None)
+
+    # invalidate every entry whose value matches predicate, e.g. the rows a cascading delete removed
+    def invalidateWhere(self, predicate):
+        with self.__lock:
+            self.__generation += 1
+            for key in [key for key, (value, _) in self.__entries.items() if predicate(value)]:
+                del self.__entries[key]
+
+    def clear(self):
+        with self.__lock:
+            self.__generation += 1
+            self.__entries.clear()
+
+    # hit, miss, eviction and expiration counters since the cache was made or resetStats, and its current size
+    def stats(self) -> dict:
+        with self.__lock:
+            return {"hits": self.__hits, "misses": self.__misses, "evictions": self.__evictions,
+                    "expirations": self.__expirations, "size": len(self.__entries), "maxSize": self.maxSize}
+
+    def resetStats(self):
+        with self.__lock:
+            self.__hits = self.__misses = self.__evictions = self.__expirations = 0
+
+    def __len__(self):
+        with self.__lock:
+            return len(self.__entries)
@@ -0,0 +1,150 @@
+import bisect
+import json
+import threading
+import time
+
+
+class QueryEvent:
+    # one statement run by DBConnector, handed to every hook
+    # name - the template name for executePrepared, "COPY <table>" for copy, None for a plain query
+    # query - the SQL text, the template itself for executePrepared
+    # template - whether query is a template registered with DBConnector.prepare, using $1, $2, ...
+    # params - the bound parameters, None for a statement without any
+    # paramCount - number of bound parameters
+    # rowsAffected - rows effected, None until the statement finished
+    # executeSeconds, commitSeconds - time spent running the statement and committing it (0 inside a transaction)
+    # waitSeconds - time the DBConnector waited for its pooled connection
+    # error - the exception the statement raised, None if it didn't
+    def __init__(self, name, query: str, params, waitSeconds: float, template=False):
+        self.name = name
+        self.query = query
+        self.template = template
+        self.params = params
+        self.paramCount = 0 if params is None else len(params)
+        self.waitSeconds = waitSeconds
+        self.rowsAffected = None
+        self.executeSeconds = 0.0
+        self.commitSeconds = 0.0
+        self.error = None
+        self.startedAt = time.time()
+
+    # the template name, or the first words of a plain query, for grouping events
+    def label(self) -> str:
+        if self.name is not None:
+            return self.name
+        return " ".join(self.query.split()[:2]).upper()
+
+    def asDict(self) -> dict:
+        return {"time": self.startedAt, "name": self.name, "label": self.label(), "params": self.paramCount,
+                "rows": self.rowsAffected, "execute_ms": 1000 * self.executeSeconds,
+                "commit_ms": 1000 * self.commitSeconds, "wait_ms": 1000 * self.waitSeconds,
+                "error": None if self.error is None else type(self.error).__name__}
+
+
+class QueryHook:
+    # base class of the hooks registered with DBConnector.addHook, every method is optional
+    # an exception raised by a hook is ignored, it never fails the query
+
+    # called before the statement is sent
+    def beforeExecute(self, event: QueryEvent):
+        pass
+
+    # called once the statement ran and was committed
+    def afterExecute(self, event: QueryEvent):
+        pass
+
+    # called instead of afterExecute when the statement or its commit failed, event.error is set
+    def onError(self, event: QueryEvent):
+        pass
+
+
+class HistogramCollector(QueryHook):
+    # upper bounds of the latency buckets in milliseconds, the last bucket has no bound
+    BOUNDS = (0.1, 0.25, 0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+    # in-memory latency histogram (execute + commit time) of every label, see QueryEvent.label
+    def __init__(self):
+        self.__lock = threading.Lock()
+        self.__stats = {}
+
+    def afterExecute(self, event: QueryEvent):
+        self.__record(event)
+
+    def onError(self, event: QueryEvent):
+        self.__record(event)
+
+    def __record(self, event: QueryEvent):
+        elapsed = 1000 * (event.executeSeconds + event.commitSeconds)
+        with self.__lock:
+            stats = self.__stats.get(event.label())
+            if stats is None:
+                stats = {"count": 0, "errors": 0, "rows": 0, "total_ms": 0.0, "max_ms": 0.0, "wait_ms": 0.0,
+                         "commit_ms": 0.0, "buckets": [0] * (len(HistogramCollector.BOUNDS) + 1)}
+                self.__stats[event.label()] = stats
+            stats["count"] += 1
+            stats["errors"] += event.error is not None
+            stats["rows"] += event.rowsAffected or 0
+            stats["total_ms"] += elapsed
+            stats["max_ms"] = max(stats["max_ms"], elapsed)
+            stats["wait_ms"] += 1000 * event.waitSeconds
+            stats["commit_ms"] += 1000 * event.commitSeconds
+            stats["buckets"][bisect.bisect_left(HistogramCollector.BOUNDS, elapsed)] += 1
+
+    # per label: count, errors, rows, mean/max and estimated p50/p95/p99 latency in milliseconds, time spent
+    # committing and waiting for connections, and the raw bucket counts
+    def summary(self) -> dict:
+        with self.__lock:
+            stats = {label: dict(values, buckets=list(values["buckets"])) for label, values in self.__stats.items()}
+        for values in stats.values():
+            values["mean_ms"] = values["total_ms"] / values["count"]
+            for name, fraction in (("p50_ms", 0.50), ("p95_ms", 0.95), ("p99_ms", 0.99)):
+                values[name] = HistogramCollector.__quantile(values["buckets"], values["count"], fraction,
+                                                             values["max_ms"])
+        return stats
+
+    def reset(self):
+        with self.__lock:
+            self.__stats = {}
+
+    # the upper bound of the bucket holding the quantile, capped by the largest latency seen
+    @staticmethod
+    def __quantile(buckets: list, count: int, fraction: float, maximum: float) -> float:
+        seen = 0
+        for index, bucketCount in enumerate(buckets):
+            seen += bucketCount
+            if seen >= fraction * count:
+                if index < len(HistogramCollector.BOUNDS):
+                    return min(HistogramCollector.BOUNDS[index], maximum)
+                return maximum
+        return maximum
+
+
+class JsonLinesExporter(QueryHook):
+    # appends one JSON object per statement to path, see QueryEvent.asDict, for offline analysis
+    # withQuery also writes the SQL text of every statement
+    def __init__(self, path: str, withQuery=False):
+        self.path = path
+        self.withQuery = withQuery
+        self.__lock = threading.Lock()
+        self.__file = open(path, "a")
+
+    def afterExecute(self, event: QueryEvent):
+        self.__write(event)
+
+    def onError(self, event: QueryEvent):
+        self.__write(event)
+
+    def close(self):
+        with self.__lock:
+            if not self.__file.closed:
+                self.__file.close()
+
+    def __write(self, event: QueryEvent):
+        record = event.asDict()
+        if self.withQuery:
+            record["query"] = event.query
+        line = json.dumps(record, sort_keys=True)
+        with self.__lock:
+            if not self.__file.closed:
+                self.__file.write(line + "\n")
+                self.__file.flush()
@@ -0,0 +1,188 @@
+import json
+import logging
+import logging.handlers
+import queue
+import random
+import re
+import threading
+import time
+import psycopg2
+from psycopg2 import sql
+from Utility.QueryHooks import QueryEvent, QueryHook
+
+
+class SlowQueryLog(QueryHook):
+    # EXPLAIN ANALYZE runs the statement a second time, so it is only used for the templates registered with
+    # DBConnector.prepare that read (and for writes with explainWrites); any other SELECT may call a function with
+    # side effects, e.g. pg_advisory_xact_lock, and only gets a plain EXPLAIN, which plans it without running it
+    READS = ("SELECT", "WITH", "VALUES", "TABLE")
+    WRITES = ("INSERT", "UPDATE", "DELETE")
+    __modifies = re.compile(r"\b(INSERT|UPDATE|DELETE|MERGE)\b", re.IGNORECASE)
+
+    # constructor
+    # path - the log file, one JSON object per slow statement, rotated beyond maxBytes keeping backupCount files
+    # params - connection parameters of the side connection the plans are captured on, see DBConnector.config
+    # thresholdMs - statements whose execute + commit time reaches it are slow
+    # sampleRate - fraction of the slow statements whose plan is captured, the others are logged without one
+    # minInterval - seconds between two captures, labelInterval - seconds between two captures of the same label
+    # explainWrites - also capture INSERT/UPDATE/DELETE plans with ANALYZE, always rolled back but they still take
+    #                 locks and fire triggers
+    # timeoutMs - statement_timeout of the side connection
+    def __init__(self, path: str, params: dict, thresholdMs=100.0, sampleRate=1.0, minInterval=1.0,
+                 labelInterval=60.0, explainWrites=False, timeoutMs=30000, maxBytes=10 * 1024 * 1024,
+                 backupCount=5, queueSize=16):
+        self.path = path
+        self.params = dict(params)
+        self.thresholdMs = thresholdMs
+        self.sampleRate = sampleRate
+        self.minInterval = minInterval
+        self.labelInterval = labelInterval
+        self.explainWrites = explainWrites
+        self.timeoutMs = timeoutMs
+        self.__handler = logging.handlers.RotatingFileHandler(path, maxBytes=maxBytes, backupCount=backupCount)
+        self.__handler.setFormatter(logging.Formatter("%(message)s"))
+        self.__logger = logging.getLogger("SlowQueryLog." + path)
+        self.__logger.setLevel(logging.INFO)
+        self.__logger.propagate = False
+        self.__logger.addHandler(self.__handler)
+        self.__lock = threading.Lock()
+        self.__lastCapture = None
+        self.__lastCaptureOf = {}  # label -> time of its last capture
+        self.__captured = 0
+        self.__skipped = 0
+        # plans are captured on a worker thread, the slow statement's caller never waits for them
+        self.__queue = queue.Queue(queueSize)
+        self.__connection = None
+        self.__prepared = set()
+        self.__thread = threading.Thread(target=self.__run, name="SlowQueryLog", daemon=True)
+        self.__thread.start()
+
+    def afterExecute(self, event: QueryEvent):
+        elapsed = 1000 * (event.executeSeconds + event.commitSeconds)
+        if elapsed < self.thresholdMs:
+            return
+        analyze = self.__analyze(event)
+        if analyze is not None and self.__sample(event.label()):
+            try:
+                self.__queue.put_nowait((event, analyze))
+                return
+            except queue.Full:
+                with self.__lock:
+                    self.__skipped += 1
+        self.__write(event, None, None)
+
+    # failed statements are logged without a plan, a statement_timeout is the slowest query of all
+    def onError(self, event: QueryEvent):
+        self.afterExecute(event)
+
+    # blocks until every queued plan was captured and logged
+    def flush(self):
+        self.__queue.join()
+
+    # stops the worker and closes the side connection and the log file
+    def close(self):
+        self.__queue.put(None)
+        self.__thread.join()
+        self.__logger.removeHandler(self.__handler)
+        self.__handler.close()
+
+    # captured plans and slow statements logged without one because of the rate limit or a full queue
+    def stats(self) -> dict:
+        with self.__lock:
+            return {"captured": self.__captured, "skipped": self.__skipped}
+
+    # True to capture the plan of event with EXPLAIN ANALYZE, False with a plain EXPLAIN, None for no plan
+    def __analyze(self, event: QueryEvent):
+        if event.error is not None or (event.name is not None and event.name.startswith("COPY ")):
+            return None
+        verb = event.query.lstrip("( \n\t").split(None, 1)[0].upper() if event.query.strip() else ""
+        if verb in SlowQueryLog.READS:
+            # a WITH may hide a data-modifying statement
+            return event.template and SlowQueryLog.__modifies.search(event.query) is None
+        if verb in SlowQueryLog.WRITES and self.explainWrites:
+            return True
+        return None
+
+    # sampled and rate limited, skipped statements are counted
+    def __sample(self, label: str) -> bool:
+        now = time.monotonic()
+        with self.__lock:
+            last = self.__lastCaptureOf.get(label)
+            if random.random() >= self.sampleRate \
+                    or (self.__lastCapture is not None and now - self.__lastCapture < self.minInterval) \
+                    or (last is not None and now - last < self.labelInterval):
+                self.__skipped += 1
+                return False
+            self.__lastCapture = self.__lastCaptureOf[label] = now
+            return True
+
+    def __run(self):
+        while True:
+            item = self.__queue.get()
+            try:
+                if item is None:
+                    self.__disconnect()
+                    return
+                event, analyze = item
+                plan, error = None, None
+                try:
+                    plan = self.__explain(event, analyze)
+                except Exception as e:
+                    # the schema may have changed under the prepared statements, start over next time
+                    self.__disconnect()
+                    error = str(e).strip()
+                self.__write(event, plan, error, analyze)
+            finally:
+                self.__queue.task_done()
+
+    # EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) of the statement with the same parameters, rolled back, or
+    # EXPLAIN (FORMAT JSON) without analyze
+    def __explain(self, event: QueryEvent, analyze: bool):
+        if self.__connection is None:
+            self.__connection = psycopg2.connect(**self.params)
+            with self.__connection.cursor() as cursor:
+                cursor.execute("SET statement_timeout = %s", (int(self.timeoutMs),))
+            self.__connection.commit()
+        explain = sql.SQL("EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) " if analyze else "EXPLAIN (FORMAT JSON) ")
+        try:
+            with self.__connection.cursor() as cursor:
+                if event.template:
+                    # a prepared template, planned the same way as on the pooled connection
+                    name = sql.Identifier(event.name)
+                    if event.name not in self.__prepared:
+                        cursor.execute(sql.SQL("PREPARE {} AS ").format(name) + sql.SQL(event.query))
+                        self.__prepared.add(event.name)
+                    arguments = sql.SQL(", ").join(sql.Placeholder() * event.paramCount)
+                    query = explain + sql.SQL("EXECUTE {}").format(name)
+                    if event.paramCount:
+                        query += sql.SQL("(") + arguments + sql.SQL(")")
+                else:
+                    query = explain + sql.SQL(event.query)
+                cursor.execute(query, event.params)
+                return cursor.fetchone()[0]
+        finally:
+            self.__connection.rollback()
+
+    def __disconnect(self):
+        if self.__connection is not None:
+            try:
+                self.__connection.close()
+            except Exception:
+                pass
+        self.__connection = None
+        self.__prepared = set()
+
+    def __write(self, event: QueryEvent, plan, error, analyze=False):
+        record = event.asDict()
+        record["query"] = event.query
+        record["values"] = None if event.params is None else list(event.params)
+        if plan is not None:
+            record["plan"] = plan
+            record["analyzed"] = analyze
+            record["planning_ms"] = plan[0].get("Planning Time")
+            record["explained_ms"] = plan[0].get("Execution Time")
+            with self.__lock:
+                self.__captured += 1
+        if error is not None:
+            record["explain_error"] = error
+        self.__logger.info(json.dumps(record, sort_keys=True, default=str))